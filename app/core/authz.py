@@ -0,0 +1,42 @@
+import uuid
+from app.core.config import settings
+from app.core.errors import PermissionDenied
+from app.core.metrics import registry
+from app.infrastructure.cache.memory import TTLCache
+from app.infrastructure.db.uow import SqlAlchemyUoW
+
+# (workspace_id, user_id) -> role. Only positive lookups are cached so a user
+# added to a workspace is never rejected because of a stale entry.
+membership_cache = TTLCache(maxsize=settings.AUTHZ_CACHE_MAXSIZE, ttl=settings.AUTHZ_CACHE_TTL_SECONDS)
+
+
+async def get_workspace_role(uow: SqlAlchemyUoW, workspace_id: uuid.UUID, user_id: uuid.UUID) -> str | None:
+    key = (workspace_id, user_id)
+    role = membership_cache.get(key)
+    if role is not None:
+        return role
+    role = await uow.workspace_members.get_role(workspace_id, user_id)
+    if role is not None:
+        membership_cache.set(key, role)
+    return role
+
+
+async def require_workspace_role(uow: SqlAlchemyUoW, workspace_id: uuid.UUID, user_id: uuid.UUID) -> str:
+    role = await get_workspace_role(uow, workspace_id, user_id)
+    if role is None:
+        raise PermissionDenied("User is not a member of this workspace")
+    return role
+
+
+def invalidate_membership(workspace_id: uuid.UUID, user_id: uuid.UUID | None = None) -> None:
+    if user_id is not None:
+        membership_cache.pop((workspace_id, user_id))
+    else:
+        membership_cache.pop_where(lambda key: key[0] == workspace_id)
+
+
+def membership_cache_stats() -> dict[str, float]:
+    return membership_cache.stats()
+
+
+registry.stats_collector("cache", "cache").add("membership", membership_cache_stats)
@@ -1,13 +1,23 @@
 
-from fastapi import Depends, Header, HTTPException
+import hmac
 import uuid
+from fastapi import Depends, Header, HTTPException, Request
+from app.infrastructure.db.routing import ReplicaRouter
 from app.infrastructure.db.uow import SqlAlchemyUoW
 from app.infrastructure.security.auth import decode_access_token
-from app.core.errors import AuthenticationError, PermissionDenied
+from app.core.config import settings
+from app.core.errors import AuthenticationError, NotFoundError
+from app.core.authz import require_workspace_role
 
 
-async def get_uow():
-    async with SqlAlchemyUoW() as uow:
+async def get_uow(request: Request):
+    async with SqlAlchemyUoW(client_key=ReplicaRouter.client_key(request.headers.get("authorization"))) as uow:
+        yield uow
+
+
+async def get_read_uow(request: Request):
+    # May be served by a replica; clients that wrote within REPLICA_STICKY_SECONDS stay on the primary.
+    async with SqlAlchemyUoW(read_only=True, client_key=ReplicaRouter.client_key(request.headers.get("authorization"))) as uow:
         yield uow
 
 
@@ -22,7 +32,14 @@ async def get_current_user_id(authorization: str | None = Header(default=None))
 
 
 async def ensure_workspace_member(workspace_id: uuid.UUID, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)) -> uuid.UUID:
-    memberships = await uow.workspace_members.list_for_user(user_id)
-    if not any(m.workspace_id == workspace_id for m in memberships):
-        raise PermissionDenied("User is not a member of this workspace")
+    await require_workspace_role(uow, workspace_id, user_id)
     return user_id
+
+
+async def require_internal_access(x_internal_token: str | None = Header(default=None)) -> None:
+    # /internal exposes other users' request paths and SQL: off unless enabled, and behind
+    # INTERNAL_TOKEN (sent as X-Internal-Token) whenever one is configured.
+    if not settings.INTERNAL_ENDPOINTS_ENABLED:
+        raise NotFoundError("Not found")
+    if settings.INTERNAL_TOKEN and not hmac.compare_digest((x_internal_token or "").encode(), settings.INTERNAL_TOKEN.encode()):
+        raise AuthenticationError("Invalid internal token")
@@ -33,4 +33,21 @@ class ValidationError(DomainError):
     code = "validation_error"
 
 
-ERROR_CLASSES = (DomainError, NotFoundError, PermissionDenied, AuthenticationError, ValidationError)
+class ConflictError(DomainError):
+    status_code = status.HTTP_409_CONFLICT
+    code = "conflict"
+
+    def __init__(self, message: str, current_version: int | None = None):
+        self.current_version = current_version
+        super().__init__(message)
+
+    def to_dict(self):
+        return {**super().to_dict(), "current_version": self.current_version}
+
+
+class ServiceUnavailableError(DomainError):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    code = "service_unavailable"
+
+
+ERROR_CLASSES = (DomainError, NotFoundError, PermissionDenied, AuthenticationError, ValidationError, ConflictError, ServiceUnavailableError)
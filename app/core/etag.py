@@ -0,0 +1,33 @@
+import hashlib
+from typing import Any
+from fastapi import Response
+
+# Conditional GET helpers. ETags are opaque: a short hash of whatever identifies
+# the representation (a version counter, the row values, or an aggregate).
+
+def make_etag(*parts: Any, weak: bool = False) -> str:
+    digest = hashlib.sha1("\x1f".join(str(p) for p in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match uses the weak comparison function (RFC 9110 13.1.2).
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in if_none_match.split(","))
+
+
+def if_match_satisfied(if_match: str | None, etag: str) -> bool:
+    # If-Match uses the strong comparison function: weak tags never match (RFC 9110 13.1.1).
+    if not if_match or if_match.strip() == "*":
+        return True
+    if etag.startswith("W/"):
+        return False
+    return any(tag.strip() == etag for tag in if_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
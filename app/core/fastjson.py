@@ -0,0 +1,42 @@
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Iterable, Sequence
+from fastapi import Response
+
+try:  # optional: pip install notion-local-api[fast]
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+# Fast path for list endpoints: payloads are built straight from trusted DB row
+# tuples and encoded in one call, skipping per-item response_model validation.
+# Keep the response_model on the route for the OpenAPI schema.
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def rows_to_items(rows: Iterable[Sequence[Any]], fields: Sequence[str]) -> list[dict]:
+    """Row tuples (in ``fields`` order) to plain dicts."""
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def json_list_response(items: Sequence[Any], headers: dict[str, str] | None = None) -> Response:
+    """JSON array response. Lists are page-bounded (PAGE_LIST_MAX_LIMIT), so one encode is enough."""
+    return Response(dumps(items), media_type="application/json", headers=headers)
@@ -0,0 +1,67 @@
+import time
+from contextvars import ContextVar
+from app.core.metrics import QUERY_COUNT_BUCKETS, registry
+
+# Request instrumentation: a pure ASGI middleware (no BaseHTTPMiddleware overhead)
+# plus a per-request RequestStats that the SQLAlchemy hooks add query timings to.
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+REQUESTS = registry.counter("http_requests_total", "HTTP requests by route and status code.", ("method", "route", "status"))
+LATENCY = registry.histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+IN_FLIGHT = registry.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+REQUEST_QUERIES = registry.histogram("http_request_db_queries", "Database queries per HTTP request.", ("route",), QUERY_COUNT_BUCKETS)
+REQUEST_DB_TIME = registry.histogram("http_request_db_seconds", "Database time per HTTP request.", ("route",))
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> RequestStats | None:
+    return _request_stats.get()
+
+
+def route_label(scope) -> str:
+    # The route template, not the raw path, keeps label cardinality bounded.
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+        started = time.perf_counter()
+        IN_FLIGHT.inc()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            _request_stats.reset(token)
+            route = route_label(scope)
+            REQUESTS.inc(scope["method"], route, str(status))
+            LATENCY.observe(elapsed, scope["method"], route)
+            REQUEST_QUERIES.observe(stats.queries, route)
+            REQUEST_DB_TIME.observe(stats.db_seconds, route)
@@ -0,0 +1,204 @@
+import bisect
+from threading import Lock
+from typing import Callable
+
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics) for latencies in seconds."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative, running = {}, 0
+            for bound, n in zip(self.buckets, self._counts):
+                running += n
+                cumulative[str(bound)] = running
+            cumulative["+Inf"] = self.count
+            return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def render_histogram(name: str, snapshot: dict, labelnames: tuple[str, ...] = (), labels: tuple = ()) -> list[str]:
+    lines = []
+    for le, n in snapshot["buckets"].items():
+        le_label = f'le="{le}"'
+        lines.append(f"{name}_bucket{format_labels(labelnames, labels, le_label)} {n}")
+    lines.append(f"{name}_sum{format_labels(labelnames, labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{format_labels(labelnames, labels)} {snapshot['count']}")
+    return lines
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [f"{self.name}{format_labels(self.labelnames, k)} {v}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, *labels) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class HistogramFamily(_Metric):
+    """Histogram per label combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+        self._children: dict[tuple, Histogram] = {}
+
+    def labels(self, *labels) -> Histogram:
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, Histogram(self.buckets))
+        return child
+
+    def observe(self, value: float, *labels) -> None:
+        self.labels(*labels).observe(value)
+
+    def render(self) -> list[str]:
+        lines = self.header()
+        for labels, child in list(self._children.items()):
+            lines += render_histogram(self.name, child.snapshot(), self.labelnames, labels)
+        return lines
+
+
+class StatsCollector:
+    """Collector exposing components' ``stats()`` dicts, one family per key: numbers become
+    gauges ``<prefix>_<key>{<label>="<source>"}`` and histogram snapshots histograms."""
+
+    def __init__(self, prefix: str, label: str):
+        self.prefix = prefix
+        self.label = label
+        self._sources: dict[str, Callable[[], dict]] = {}
+
+    def add(self, source: str, stats: Callable[[], dict]) -> None:
+        self._sources[source] = stats
+
+    def __call__(self) -> list[str]:
+        snapshots = [(source, stats()) for source, stats in list(self._sources.items())]
+        families: dict[str, list[tuple[str, object]]] = {}
+        for source, snapshot in snapshots:
+            for key, value in snapshot.items():
+                if isinstance(value, (int, float)) or (isinstance(value, dict) and "buckets" in value):
+                    families.setdefault(key, []).append((source, value))
+        lines = []
+        for key, values in families.items():
+            name = f"{self.prefix}_{key}"
+            if isinstance(values[0][1], dict):
+                lines.append(f"# TYPE {name} histogram")
+                for source, value in values:
+                    if isinstance(value, dict):
+                        lines += render_histogram(name, value, (self.label,), (source,))
+                continue
+            lines.append(f"# TYPE {name} gauge")
+            lines += [f"{name}{format_labels((self.label,), (source,))} {float(value)}" for source, value in values if not isinstance(value, dict)]
+        return lines
+
+
+class Registry:
+    """Metrics rendered in the Prometheus text exposition format (0.0.4)."""
+
+    def __init__(self):
+        self._metrics: list[_Metric] = []
+        self._collectors: list[Callable[[], list[str]]] = []
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> HistogramFamily:
+        return self._register(HistogramFamily(name, help, labelnames, buckets))
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], list[str]]) -> None:
+        """``collector`` returns ready-made exposition lines at scrape time (e.g. pool gauges)."""
+        self._collectors.append(collector)
+
+    def stats_collector(self, prefix: str, label: str) -> StatsCollector:
+        """The StatsCollector for ``prefix``, registered on first use; components add themselves as sources."""
+        for collector in self._collectors:
+            if isinstance(collector, StatsCollector) and collector.prefix == prefix:
+                return collector
+        collector = StatsCollector(prefix, label)
+        self.add_collector(collector)
+        return collector
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines += metric.render()
+        for collector in self._collectors:
+            lines += collector()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
@@ -0,0 +1,32 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable
+from app.core.errors import ValidationError
+
+# Keyset cursors are opaque to clients: the sort key of the last row returned,
+# JSON encoded and base64url'd. Decoding takes the parsers for each key part.
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*parts: Any) -> str:
+    raw = json.dumps([_dump(p) for p in parts], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *parsers: Callable[[Any], Any]) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(parts, list) or len(parts) != len(parsers):
+            raise ValueError("cursor arity")
+        return tuple(parse(p) for parse, p in zip(parsers, parts))
+    except (ValueError, TypeError):
+        raise ValidationError("Invalid cursor")
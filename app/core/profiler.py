@@ -0,0 +1,208 @@
+import cProfile
+import pstats
+import random
+import re
+import sys
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator
+import greenlet
+from starlette.datastructures import MutableHeaders
+from app.core.config import settings
+from app.infrastructure.cache.memory import TTLCache
+
+# Opt-in per-request query profiler. While a QueryProfile is active in the current
+# context the SQLAlchemy hooks (app.infrastructure.db.instrumentation) record every
+# statement with its timing and the app call-site that issued it. Repeated statement
+# shapes above PROFILER_N_PLUS_ONE_THRESHOLD are reported as N+1 candidates.
+
+PROFILE_HEADER = "x-profile"  # "1" / "queries" or "cpu"
+
+_APP_ROOT = str(Path(__file__).resolve().parent.parent)
+_SKIP = (str(Path(_APP_ROOT, "core", "profiler.py")), str(Path(_APP_ROOT, "infrastructure", "db")))
+_IN_LIST = re.compile(r"\(\s*(\?|%\(\w+\)s|%s|\$\d+)(\s*,\s*(\?|%\(\w+\)s|%s|\$\d+))*\s*\)")
+_WS = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with expanded IN lists collapsed; bound values are never part of it."""
+    return _IN_LIST.sub("(...)", _WS.sub(" ", statement).strip())
+
+
+def _app_frames(limit: int = 3) -> str:
+    """Innermost app frames that issued the statement. The hook runs in SQLAlchemy's worker
+    greenlet, so the awaiting coroutine chain is found through the parent greenlet's frame."""
+    sites = []
+    frame = sys._getframe(2)
+    parent = greenlet.getcurrent().parent
+    while len(sites) < limit:
+        if frame is None:
+            if parent is None:
+                break
+            frame, parent = parent.gr_frame, None
+            continue
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_ROOT) and not filename.startswith(_SKIP):
+            sites.append(f"{Path(filename).relative_to(Path(_APP_ROOT).parent)}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return " <- ".join(sites)
+
+
+class QueryProfile:
+    def __init__(self):
+        self.id = uuid.uuid4().hex[:16]
+        self.started = time.time()
+        self.queries: list[dict] = []
+        self.cpu: list[dict] | str | None = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries.append({"statement": statement, "seconds": seconds, "call_site": _app_frames()})
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(q["seconds"] for q in self.queries)
+
+    def repeated(self, threshold: int | None = None) -> list[dict]:
+        """Statement shapes issued at least ``threshold`` times (N+1 candidates), worst first."""
+        threshold = threshold or settings.PROFILER_N_PLUS_ONE_THRESHOLD
+        groups: dict[str, list[dict]] = defaultdict(list)
+        for q in self.queries:
+            groups[statement_shape(q["statement"])].append(q)
+        flagged = [
+            {
+                "shape": shape,
+                "count": len(qs),
+                "total_ms": round(sum(q["seconds"] for q in qs) * 1000, 3),
+                "call_sites": sorted({q["call_site"] for q in qs})[:3],
+            }
+            for shape, qs in groups.items()
+            if len(qs) >= threshold
+        ]
+        return sorted(flagged, key=lambda g: g["count"], reverse=True)
+
+    def report(self, path: str | None = None) -> dict:
+        return {
+            "id": self.id,
+            "path": path,
+            "query_count": self.count,
+            "query_ms": round(self.total_seconds * 1000, 3),
+            "n_plus_one": self.repeated(),
+            "queries": [{"statement": q["statement"], "ms": round(q["seconds"] * 1000, 3), "call_site": q["call_site"]} for q in self.queries],
+            "cpu": self.cpu,
+        }
+
+
+_profile: ContextVar[QueryProfile | None] = ContextVar("query_profile", default=None)
+
+# Recent reports for GET /internal/profiles/{id}.
+profiles = TTLCache(maxsize=settings.PROFILER_KEEP, ttl=600.0)
+
+
+def current_profile() -> QueryProfile | None:
+    return _profile.get()
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryProfile]:
+    """Profile every statement issued in the current context (in-process requests included)."""
+    profile = QueryProfile()
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryProfile]:
+    """Test helper: fail if the block issues more than ``limit`` statements."""
+    with capture_queries() as profile:
+        yield profile
+    if profile.count > limit:
+        listing = "\n".join(f"  {q['call_site']}: {statement_shape(q['statement'])}" for q in profile.queries)
+        raise AssertionError(f"{profile.count} queries, expected at most {limit}:\n{listing}")
+
+
+_cpu_busy = False
+
+
+def _top_functions(prof: cProfile.Profile, limit: int = 25) -> list[dict]:
+    stats = pstats.Stats(prof).stats
+    rows = sorted(stats.items(), key=lambda kv: kv[1][3], reverse=True)[:limit]
+    return [
+        {"function": f"{file}:{line}({name})", "calls": nc, "tottime_ms": round(tt * 1000, 3), "cumtime_ms": round(ct * 1000, 3)}
+        for (file, line, name), (_, nc, tt, ct, _) in rows
+    ]
+
+
+class ProfilerMiddleware:
+    """Profiles requests carrying ``X-Profile`` (when PROFILER_HEADER_ENABLED) or every request
+    (PROFILER_ENABLED). Adds X-Query-Count, X-Query-Time-Ms, X-N-Plus-One and X-Profile-Id
+    response headers; the full report is kept for GET /internal/profiles/{id}.
+
+    The CPU profile is cProfile over the handler's wall time, so it also sees other requests
+    running on the loop meanwhile; only one runs at a time and the rest are skipped.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _mode(self, scope) -> str | None:
+        requested = None
+        if settings.PROFILER_HEADER_ENABLED:
+            for key, value in scope["headers"]:
+                if key == PROFILE_HEADER.encode():
+                    requested = value.decode().strip().lower()
+        if requested == "cpu":
+            return "cpu"
+        if requested or settings.PROFILER_ENABLED:
+            return "cpu" if random.random() < settings.PROFILER_CPU_SAMPLE_RATE else "queries"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        mode = self._mode(scope) if scope["type"] == "http" else None
+        if mode is None:
+            return await self.app(scope, receive, send)
+        global _cpu_busy
+        profile = QueryProfile()
+        token = _profile.set(profile)
+        prof = None
+        if mode == "cpu":
+            if _cpu_busy:
+                profile.cpu = "skipped: another CPU profile is running"
+            else:
+                _cpu_busy, prof = True, cProfile.Profile()
+                prof.enable()
+
+        def stop_cpu():
+            global _cpu_busy
+            nonlocal prof
+            if prof is not None:
+                prof.disable()
+                profile.cpu = _top_functions(prof)
+                prof, _cpu_busy = None, False
+
+        async def send_with_summary(message):
+            if message["type"] == "http.response.start":
+                stop_cpu()
+                headers = MutableHeaders(scope=message)
+                headers["X-Profile-Id"] = profile.id
+                headers["X-Query-Count"] = str(profile.count)
+                headers["X-Query-Time-Ms"] = f"{profile.total_seconds * 1000:.3f}"
+                headers["X-N-Plus-One"] = str(len(profile.repeated()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_summary)
+        finally:
+            stop_cpu()
+            _profile.reset(token)
+            profiles.set(profile.id, profile.report(scope.get("path")))
@@ -0,0 +1,56 @@
+import importlib
+from typing import Protocol, runtime_checkable
+
+from app.infrastructure.cache.memory import TTLCache
+
+
+@runtime_checkable
+class CacheBackend(Protocol):
+	"""Byte-oriented async key/value store used by read-model caches.
+
+	Values are already serialized so an out-of-process implementation (shared by
+	several workers) can store them as-is. Implementations must tolerate concurrent
+	access and may drop entries at any time.
+	"""
+
+	async def get(self, key: str) -> bytes | None: ...
+
+	async def set(self, key: str, value: bytes, ttl: float | None = None) -> None: ...
+
+	async def delete(self, *keys: str) -> None: ...
+
+	def stats(self) -> dict[str, float]: ...
+
+
+class MemoryCacheBackend:
+	"""In-process LRU backend with size and TTL limits (one copy per worker)."""
+
+	def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+		self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+	async def get(self, key: str) -> bytes | None:
+		return self._cache.get(key)
+
+	async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+		self._cache.set(key, value, ttl)
+
+	async def delete(self, *keys: str) -> None:
+		for key in keys:
+			self._cache.pop(key)
+
+	def stats(self) -> dict[str, float]:
+		return self._cache.stats()
+
+
+def build_backend(spec: str, maxsize: int, ttl: float) -> CacheBackend | None:
+	"""``"memory"``, ``"none"`` or a ``"package.module:Class"`` path taking (maxsize, ttl)."""
+	if spec in ("", "none"):
+		return None
+	if spec == "memory":
+		return MemoryCacheBackend(maxsize=maxsize, ttl=ttl)
+	module_name, _, attr = spec.partition(":")
+	backend_cls = getattr(importlib.import_module(module_name), attr)
+	return backend_cls(maxsize=maxsize, ttl=ttl)
+
+
+__all__ = ["CacheBackend", "MemoryCacheBackend", "build_backend"]
@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+
+_MISSING = object()
+
+
+class TTLCache:
+	"""Bounded LRU mapping whose entries also expire after ``ttl`` seconds."""
+
+	def __init__(self, maxsize: int = 1024, ttl: float = 60.0, clock: Callable[[], float] = time.monotonic):
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self._clock = clock
+		self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+		self._lock = Lock()
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def get(self, key: Hashable, default: Any = None) -> Any:
+		with self._lock:
+			item = self._data.get(key, _MISSING)
+			if item is _MISSING:
+				self.misses += 1
+				return default
+			expires_at, value = item
+			if expires_at <= self._clock():
+				del self._data[key]
+				self.misses += 1
+				return default
+			self._data.move_to_end(key)
+			self.hits += 1
+			return value
+
+	def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+		expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+		with self._lock:
+			self._data[key] = (expires_at, value)
+			self._data.move_to_end(key)
+			while len(self._data) > self.maxsize:
+				self._data.popitem(last=False)
+				self.evictions += 1
+
+	def pop(self, key: Hashable) -> None:
+		with self._lock:
+			self._data.pop(key, None)
+
+	def pop_where(self, predicate: Callable[[Hashable], bool]) -> int:
+		with self._lock:
+			keys = [k for k in self._data if predicate(k)]
+			for k in keys:
+				del self._data[k]
+			return len(keys)
+
+	def values(self) -> list[Any]:
+		"""Unexpired values, oldest first (does not touch LRU order or counters)."""
+		now = self._clock()
+		with self._lock:
+			return [value for expires_at, value in self._data.values() if expires_at > now]
+
+	def clear(self) -> None:
+		with self._lock:
+			self._data.clear()
+
+	def __len__(self) -> int:
+		return len(self._data)
+
+	def stats(self) -> dict[str, float]:
+		lookups = self.hits + self.misses
+		return {
+			"size": len(self._data),
+			"maxsize": self.maxsize,
+			"hits": self.hits,
+			"misses": self.misses,
+			"evictions": self.evictions,
+			"hit_rate": (self.hits / lookups) if lookups else 0.0,
+		}
+
+
+__all__ = ["TTLCache"]
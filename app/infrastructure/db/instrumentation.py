@@ -0,0 +1,73 @@
+import time
+
+from sqlalchemy import event
+
+from app.core.instrumentation import current_request_stats
+from app.core.profiler import current_profile
+from app.core.metrics import registry, render_histogram
+from app.infrastructure.db.pool import pool_snapshot
+
+# SQLAlchemy cursor hooks feeding the global query metrics, the current request's
+# RequestStats and, when one is active, the request's QueryProfile.
+
+DB_QUERIES = registry.counter("db_queries_total", "Statements executed.", ("engine",))
+DB_QUERY_TIME = registry.histogram("db_query_duration_seconds", "Statement execution time.", ("engine",))
+
+_engines: dict[str, object] = {}
+
+
+def instrument_engine(engine, name: str = "primary") -> None:
+	"""Attach timing hooks to an AsyncEngine (idempotent per name)."""
+	if name in _engines:
+		return
+	_engines[name] = engine
+	sync_engine = engine.sync_engine
+
+	@event.listens_for(sync_engine, "before_cursor_execute")
+	def _before(conn, cursor, statement, parameters, context, executemany):
+		conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+	@event.listens_for(sync_engine, "after_cursor_execute")
+	def _after(conn, cursor, statement, parameters, context, executemany):
+		elapsed = time.perf_counter() - conn.info["query_start"].pop()
+		DB_QUERIES.inc(name)
+		DB_QUERY_TIME.observe(elapsed, name)
+		stats = current_request_stats()
+		if stats is not None:
+			stats.queries += 1
+			stats.db_seconds += elapsed
+		profile = current_profile()
+		if profile is not None:
+			profile.record(statement, elapsed)
+
+	@event.listens_for(sync_engine, "handle_error")
+	def _error(ctx):
+		# A failed statement never reaches after_cursor_execute; drop its start time so the
+		# stack on a pooled connection does not grow and misalign later timings.
+		if ctx.connection is not None and ctx.statement is not None:
+			starts = ctx.connection.info.get("query_start")
+			if starts:
+				starts.pop()
+
+
+_POOL_GAUGES = ("size", "checked_out", "checked_in", "overflow", "max_overflow")
+_POOL_COUNTERS = ("checkouts", "overflow_events", "timeouts")
+
+
+def pool_metrics() -> list[str]:
+	lines = []
+	snapshots = [(name, pool_snapshot(engine)) for name, engine in _engines.items()]
+	for key in _POOL_GAUGES:
+		lines += [f"# TYPE db_pool_{key} gauge"] + [f'db_pool_{key}{{engine="{n}"}} {s[key]}' for n, s in snapshots if key in s]
+	for key in _POOL_COUNTERS:
+		lines += [f"# TYPE db_pool_{key}_total counter"] + [f'db_pool_{key}_total{{engine="{n}"}} {s[key]}' for n, s in snapshots if key in s]
+	lines.append("# TYPE db_pool_wait_seconds histogram")
+	for n, s in snapshots:
+		if "wait_seconds" in s:
+			lines += render_histogram("db_pool_wait_seconds", s["wait_seconds"], ("engine",), (n,))
+	return lines
+
+
+registry.add_collector(pool_metrics)
+
+__all__ = ["instrument_engine", "pool_metrics"]
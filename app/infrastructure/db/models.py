@@ -1,6 +1,7 @@
 import uuid
+from datetime import datetime
 from sqlalchemy import (
-	String, Boolean, ForeignKey, Text, UniqueConstraint, JSON
+	String, Boolean, ForeignKey, Text, UniqueConstraint, JSON, Index, Integer, DateTime, func
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -49,7 +50,10 @@ class Workspace(Base, TimestampMixin):
 
 class WorkspaceMember(Base):
 	__tablename__ = "workspace_members"
-	__table_args__ = (UniqueConstraint("workspace_id", "user_id", name="uq_workspace_user"),)
+	__table_args__ = (
+		UniqueConstraint("workspace_id", "user_id", name="uq_workspace_user"),
+		Index("ix_workspace_members_user_workspace", "user_id", "workspace_id"),
+	)
 
 	id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 	workspace_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False)
@@ -62,15 +66,27 @@ class WorkspaceMember(Base):
 
 class Page(Base, TimestampMixin):
 	__tablename__ = "pages"
+	__table_args__ = (
+		# Sibling listings are index range scans already in display order.
+		Index("ix_pages_workspace_parent_position", "workspace_id", "parent_page_id", "position"),
+		Index("ix_pages_workspace_updated", "workspace_id", "updated_at", "id"),
+		Index("ix_pages_archived_at", "archived_at"),
+	)
 
 	id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 	workspace_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("workspaces.id", ondelete="CASCADE"), nullable=False)
 	parent_page_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), ForeignKey("pages.id", ondelete="SET NULL"))
 	title: Mapped[str] = mapped_column(String, nullable=False)
+	# Fractional order key among siblings (app/pages/ordering.py); byte-wise order, hence "C" on PostgreSQL.
+	position: Mapped[str] = mapped_column(String().with_variant(String(collation="C"), "postgresql"), nullable=False)
 	type: Mapped[str] = mapped_column(String, default=PageType.page.value, nullable=False)
 	icon: Mapped[str | None] = mapped_column(String)
 	cover_url: Mapped[str | None] = mapped_column(String)
 	is_archived: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+	# Set on every page of a subtree archived together; the trash and restore group pages by it.
+	archived_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+	# Optimistic concurrency: every ORM UPDATE is emitted as ... WHERE version = :loaded.
+	version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
 	created_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 	updated_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
@@ -79,6 +95,8 @@ class Page(Base, TimestampMixin):
 	content: Mapped["PageContent | None"] = relationship(back_populates="page", uselist=False)
 	parent: Mapped["Page | None"] = relationship(remote_side=[id])
 
+	__mapper_args__ = {"version_id_col": version}
+
 
 class PageContent(Base):
 	__tablename__ = "page_content"
@@ -87,10 +105,35 @@ class PageContent(Base):
 	page_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("pages.id", ondelete="CASCADE"), unique=True, nullable=False)
 	content: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
 	meta: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+	# Bumped on every write (ORM version counter); drives the content ETag without reading the document.
+	version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+	# sha256 of the document in the blob store when it is too large to keep inline (content is then {}).
+	blob_ref: Mapped[str | None] = mapped_column(String(64))
 	updated_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
 	page: Mapped[Page] = relationship(back_populates="content")
 
+	__mapper_args__ = {"version_id_col": version}
+
+
+class PageRevision(Base):
+	"""Content history: a full snapshot every REVISION_SNAPSHOT_INTERVAL revisions, block deltas in between."""
+	__tablename__ = "page_revisions"
+	__table_args__ = (UniqueConstraint("page_id", "version", name="uq_page_revisions_page_version"),)
+
+	id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+	page_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("pages.id", ondelete="CASCADE"), nullable=False)
+	# page_content.version this revision captures.
+	version: Mapped[int] = mapped_column(Integer, nullable=False)
+	kind: Mapped[str] = mapped_column(String(8), nullable=False)  # "snapshot" | "delta"
+	# Deltas since the previous snapshot (0 for a snapshot).
+	depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+	# Full document (snapshot, {} when stored as a blob) or {"blocks": {...}, "deleted_blocks": [...]} (delta).
+	data: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+	blob_ref: Mapped[str | None] = mapped_column(String(64))
+	created_by: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+	created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
 
 __all__ = [
 	"User",
@@ -98,6 +141,7 @@ __all__ = [
 	"WorkspaceMember",
 	"Page",
 	"PageContent",
+	"PageRevision",
 	"RoleName",
 	"PageType",
 ]
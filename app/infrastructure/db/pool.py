@@ -0,0 +1,60 @@
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram
+
+
+class PoolStats:
+	def __init__(self):
+		self.wait = Histogram()
+		self.checkouts = 0
+		self.overflow_events = 0
+		self.timeouts = 0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+	"""AsyncAdaptedQueuePool that records checkout wait time, overflow growth and timeouts."""
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.stats = PoolStats()
+
+	def _do_get(self):
+		overflow_before = self._overflow
+		start = time.perf_counter()
+		try:
+			conn = super()._do_get()
+		except exc.TimeoutError:
+			self.stats.timeouts += 1
+			raise
+		finally:
+			self.stats.wait.observe(time.perf_counter() - start)
+		self.stats.checkouts += 1
+		if self._overflow > overflow_before and self._overflow > 0:
+			self.stats.overflow_events += 1
+		return conn
+
+	def snapshot(self) -> dict:
+		return {
+			"size": self.size(),
+			"checked_out": self.checkedout(),
+			"checked_in": self.checkedin(),
+			"overflow": max(0, self.overflow()),
+			"max_overflow": self._max_overflow,
+			"timeout_seconds": self.timeout(),
+			"checkouts": self.stats.checkouts,
+			"overflow_events": self.stats.overflow_events,
+			"timeouts": self.stats.timeouts,
+			"wait_seconds": self.stats.wait.snapshot(),
+		}
+
+
+def pool_snapshot(engine) -> dict:
+	pool = engine.pool
+	if isinstance(pool, InstrumentedQueuePool):
+		return pool.snapshot()
+	return {"status": pool.status()}
+
+
+__all__ = ["InstrumentedQueuePool", "pool_snapshot"]
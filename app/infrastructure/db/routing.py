@@ -0,0 +1,90 @@
+import hashlib
+import itertools
+import time
+from typing import Callable
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.infrastructure.cache.memory import TTLCache
+from app.infrastructure.db.base import async_session_maker, build_engine
+
+
+class ReplicaTarget:
+	def __init__(self, engine: AsyncEngine):
+		self.engine = engine
+		self.name = make_url(str(engine.url)).render_as_string(hide_password=True)
+		self.session_factory = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+		self.ejected_until = 0.0
+		self.reads = 0
+		self.failures = 0
+
+
+class ReplicaRouter:
+	"""Chooses where a read-only unit of work runs.
+
+	Reads go round-robin over healthy replicas. A replica that fails with a
+	connection-level error is ejected for ``eject_seconds`` and re-admitted
+	afterwards (a further failure ejects it again). Clients that wrote recently
+	(``sticky_seconds``) keep reading from the primary so they see their own writes.
+	With no replicas configured everything stays on the primary.
+	"""
+
+	def __init__(
+		self,
+		primary: Callable[[], AsyncSession],
+		replicas: list[AsyncEngine] | None = None,
+		eject_seconds: float = 30.0,
+		sticky_seconds: float = 5.0,
+		clock: Callable[[], float] = time.monotonic,
+	):
+		self.primary = primary
+		self.replicas = [ReplicaTarget(e) for e in replicas or []]
+		self.eject_seconds = eject_seconds
+		self._clock = clock
+		self._rr = itertools.count()
+		self._recent_writers = TTLCache(maxsize=100_000, ttl=sticky_seconds, clock=clock)
+		self.primary_reads = 0
+
+	@staticmethod
+	def client_key(authorization: str | None) -> str | None:
+		return hashlib.sha256(authorization.encode()).hexdigest() if authorization else None
+
+	def note_write(self, client_key: str | None) -> None:
+		if client_key and self.replicas:
+			self._recent_writers.set(client_key, True)
+
+	def read_factory(self, client_key: str | None = None) -> tuple[Callable[[], AsyncSession], ReplicaTarget | None]:
+		if self.replicas and not (client_key and self._recent_writers.get(client_key)):
+			now = self._clock()
+			healthy = [r for r in self.replicas if r.ejected_until <= now]
+			if healthy:
+				target = healthy[next(self._rr) % len(healthy)]
+				target.reads += 1
+				return target.session_factory, target
+		self.primary_reads += 1
+		return self.primary, None
+
+	def mark_failed(self, target: ReplicaTarget) -> None:
+		target.failures += 1
+		target.ejected_until = self._clock() + self.eject_seconds
+
+	def stats(self) -> dict:
+		now = self._clock()
+		return {
+			"primary_reads": self.primary_reads,
+			"replicas": [
+				{"url": r.name, "healthy": r.ejected_until <= now, "reads": r.reads, "failures": r.failures}
+				for r in self.replicas
+			],
+		}
+
+
+replica_router = ReplicaRouter(
+	async_session_maker,
+	[build_engine(url) for url in settings.replica_urls_list],
+	eject_seconds=settings.REPLICA_EJECT_SECONDS,
+	sticky_seconds=settings.REPLICA_STICKY_SECONDS,
+)
+
+__all__ = ["ReplicaRouter", "ReplicaTarget", "replica_router"]
@@ -1,40 +1,103 @@
 from contextlib import asynccontextmanager
+from functools import cached_property
+from sqlalchemy import event
+from sqlalchemy.exc import InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.db.base import async_session_maker
+from app.core.config import settings
+from app.infrastructure.db.routing import ReplicaRouter, ReplicaTarget, replica_router
 from app.users.repository import UserRepository
 from app.workspaces.repository import WorkspaceRepository, WorkspaceMemberRepository
-from app.pages.repository import PageRepository, PageContentRepository
+from app.pages.repository import PageRepository, PageContentRepository, PageRevisionRepository
+
+
+def _set_transaction_read_only(session, transaction, connection):
+	if connection.dialect.name == "postgresql":
+		connection.exec_driver_sql("SET TRANSACTION READ ONLY")
 
 
 class SqlAlchemyUoW:
-	def __init__(self, session_factory=async_session_maker):
+	"""Unit of work over one AsyncSession.
+
+	The session (and with it a pooled connection) is only created on first use, and
+	repositories are built on first access. ``read_only`` units never commit: they are
+	meant for GET endpoints and just release their connection on exit, optionally
+	inside a READ ONLY transaction (DB_READ_ONLY_TRANSACTIONS). Unless an explicit
+	``session_factory`` is given, read-only units are routed by ``router`` (replicas)
+	and write units use the primary.
+	"""
+
+	def __init__(self, session_factory=None, read_only: bool = False, router: ReplicaRouter | None = None, client_key: str | None = None):
 		self._session_factory = session_factory
-		self.session: AsyncSession | None = None
-		# repositories
-		self.users: UserRepository
-		self.workspaces: WorkspaceRepository
-		self.workspace_members: WorkspaceMemberRepository
-		self.pages: PageRepository
-		self.page_contents: PageContentRepository
+		self._session: AsyncSession | None = None
+		self._router = router or replica_router
+		self._target: ReplicaTarget | None = None
+		self.read_only = read_only
+		self.client_key = client_key
+
+	@property
+	def session(self) -> AsyncSession:
+		if self._session is None:
+			factory = self._session_factory
+			if factory is None and self.read_only:
+				factory, self._target = self._router.read_factory(self.client_key)
+			elif factory is None:
+				factory = self._router.primary
+			self._session = factory()
+			if self.read_only and settings.DB_READ_ONLY_TRANSACTIONS:
+				event.listen(self._session.sync_session, "after_begin", _set_transaction_read_only)
+		return self._session
+
+	@property
+	def on_replica(self) -> bool:
+		# Only known once the session exists, i.e. after the first query.
+		return self._target is not None
+
+	# repositories
+	@cached_property
+	def users(self) -> UserRepository:
+		return UserRepository(self.session)
+
+	@cached_property
+	def workspaces(self) -> WorkspaceRepository:
+		return WorkspaceRepository(self.session)
+
+	@cached_property
+	def workspace_members(self) -> WorkspaceMemberRepository:
+		return WorkspaceMemberRepository(self.session)
+
+	@cached_property
+	def pages(self) -> PageRepository:
+		return PageRepository(self.session)
+
+	@cached_property
+	def page_contents(self) -> PageContentRepository:
+		return PageContentRepository(self.session)
+
+	@cached_property
+	def page_revisions(self) -> PageRevisionRepository:
+		return PageRevisionRepository(self.session)
 
 	async def __aenter__(self):
-		self.session = self._session_factory()
-		self.users = UserRepository(self.session)
-		self.workspaces = WorkspaceRepository(self.session)
-		self.workspace_members = WorkspaceMemberRepository(self.session)
-		self.pages = PageRepository(self.session)
-		self.page_contents = PageContentRepository(self.session)
 		return self
 
 	async def __aexit__(self, exc_type, exc, tb):
-		if exc:
-			await self.session.rollback()  
-		else:
-			await self.session.commit() 
-		await self.session.close()  
+		if self._session is None:
+			return
+		if self._target is not None and isinstance(exc, (OperationalError, InterfaceError)):
+			self._router.mark_failed(self._target)
+		try:
+			if exc or self.read_only:
+				await self._session.rollback()
+			else:
+				await self._session.commit()
+				self._router.note_write(self.client_key)
+		finally:
+			await self._session.close()
 
 	async def commit(self):
+		if self.read_only:
+			raise RuntimeError("commit() on a read-only unit of work")
 		await self.session.commit()
 
 	async def rollback(self):
@@ -42,6 +105,6 @@ class SqlAlchemyUoW:
 
 
 @asynccontextmanager
-async def uow_context():
-	async with SqlAlchemyUoW() as uow:
+async def uow_context(read_only: bool = False):
+	async with SqlAlchemyUoW(read_only=read_only) as uow:
 		yield uow
@@ -1 +1,91 @@
 # Local file storage
+import hashlib
+import mmap
+import os
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Iterator
+
+
+class LocalBlobStore:
+	"""Content-addressed, zlib-compressed blob store on the local filesystem.
+
+	A blob is addressed by the sha256 of its *uncompressed* bytes and stored at
+	``root/ab/cd/<digest>.z``, so identical content written by any page is stored
+	once. Writes go through a temp file + rename and are therefore atomic.
+	"""
+
+	SUFFIX = ".z"
+
+	def __init__(self, root: str | os.PathLike, compress_level: int = 6, chunk_size: int = 64 * 1024):
+		self.root = Path(root)
+		self.compress_level = compress_level
+		self.chunk_size = chunk_size
+
+	def _path(self, digest: str) -> Path:
+		if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+			raise ValueError(f"invalid blob digest {digest!r}")
+		return self.root / digest[:2] / digest[2:4] / f"{digest}{self.SUFFIX}"
+
+	def exists(self, digest: str) -> bool:
+		return self._path(digest).exists()
+
+	def put(self, data: bytes) -> str:
+		digest = hashlib.sha256(data).hexdigest()
+		path = self._path(digest)
+		if path.exists():
+			path.touch()  # refresh mtime so a concurrent GC grace period covers the new reference
+			return digest
+		path.parent.mkdir(parents=True, exist_ok=True)
+		fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+		try:
+			with os.fdopen(fd, "wb") as f:
+				f.write(zlib.compress(data, self.compress_level))
+			os.replace(tmp, path)
+		except BaseException:
+			Path(tmp).unlink(missing_ok=True)
+			raise
+		return digest
+
+	def iter_chunks(self, digest: str) -> Iterator[bytes]:
+		"""Decompressed content in chunks, reading the compressed file through mmap."""
+		path = self._path(digest)
+		with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+			decompressor = zlib.decompressobj()
+			for offset in range(0, len(mapped), self.chunk_size):
+				out = decompressor.decompress(mapped[offset:offset + self.chunk_size])
+				if out:
+					yield out
+			tail = decompressor.flush()
+			if tail:
+				yield tail
+
+	def get(self, digest: str) -> bytes:
+		return b"".join(self.iter_chunks(digest))
+
+	def delete(self, digest: str) -> None:
+		self._path(digest).unlink(missing_ok=True)
+
+	def iter_digests(self) -> Iterator[tuple[str, float]]:
+		if not self.root.exists():
+			return
+		for path in self.root.glob(f"*/*/*{self.SUFFIX}"):
+			yield path.name[: -len(self.SUFFIX)], path.stat().st_mtime
+
+	def collect_garbage(self, referenced: set[str], grace_seconds: float = 3600.0) -> int:
+		"""Delete blobs not in ``referenced`` and older than the grace period. Returns the count removed.
+
+		The grace period protects blobs written by transactions that have not committed yet.
+		"""
+		cutoff = time.time() - grace_seconds
+		removed = 0
+		for digest, mtime in list(self.iter_digests()):
+			if digest not in referenced and mtime < cutoff:
+				self.delete(digest)
+				removed += 1
+		return removed
+
+
+__all__ = ["LocalBlobStore"]
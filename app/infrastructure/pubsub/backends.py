@@ -0,0 +1,49 @@
+import importlib
+from typing import Callable, Protocol, runtime_checkable
+
+Deliver = Callable[[str, str], None]
+
+
+@runtime_checkable
+class PubSubBackend(Protocol):
+	"""Transport between brokers. Every message published by any worker must reach
+	the ``deliver`` callback of every started broker (including the publisher's own).
+
+	An out-of-process implementation (e.g. Redis pub/sub) gives multi-worker fan-out;
+	messages are already-encoded strings so they can be forwarded as-is.
+	"""
+
+	async def start(self, deliver: Deliver) -> None: ...
+
+	async def publish(self, channel: str, message: str) -> None: ...
+
+	async def close(self) -> None: ...
+
+
+class MemoryPubSubBackend:
+	"""Single-process backend. Several brokers may share one instance, which is how
+	tests stand in for several workers behind a shared bus."""
+
+	def __init__(self):
+		self._receivers: list[Deliver] = []
+
+	async def start(self, deliver: Deliver) -> None:
+		self._receivers.append(deliver)
+
+	async def publish(self, channel: str, message: str) -> None:
+		for deliver in list(self._receivers):
+			deliver(channel, message)
+
+	async def close(self) -> None:
+		self._receivers.clear()
+
+
+def build_backend(spec: str) -> PubSubBackend:
+	"""``"memory"`` or a ``"package.module:Class"`` path to a no-argument class."""
+	if spec in ("", "memory"):
+		return MemoryPubSubBackend()
+	module_name, _, attr = spec.partition(":")
+	return getattr(importlib.import_module(module_name), attr)()
+
+
+__all__ = ["PubSubBackend", "MemoryPubSubBackend", "build_backend"]
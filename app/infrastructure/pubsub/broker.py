@@ -0,0 +1,106 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.infrastructure.pubsub.backends import PubSubBackend
+
+
+class Subscription:
+	"""One consumer of a channel with a bounded queue.
+
+	A consumer that falls ``maxsize`` messages behind is dropped instead of
+	buffering without limit: its backlog is discarded and iteration ends, so the
+	client reconnects and resyncs.
+	"""
+
+	def __init__(self, channel: str, maxsize: int):
+		self.channel = channel
+		self.queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=maxsize + 1)
+		self.maxsize = maxsize
+		self.dropped = False
+
+	def offer(self, message: str) -> bool:
+		if self.dropped:
+			return False
+		if self.queue.qsize() >= self.maxsize:
+			self.dropped = True
+			while not self.queue.empty():
+				self.queue.get_nowait()
+			self.queue.put_nowait(None)
+			return False
+		self.queue.put_nowait(message)
+		return True
+
+	def __aiter__(self) -> AsyncIterator[str]:
+		return self
+
+	async def __anext__(self) -> str:
+		message = await self.queue.get()
+		if message is None:
+			raise StopAsyncIteration
+		return message
+
+
+class Broker:
+	"""Channel fan-out to local subscribers. Publishing goes through the backend, which
+	calls back into every broker (one per worker) to deliver locally."""
+
+	def __init__(self, backend: PubSubBackend, queue_size: int = 256):
+		self.backend = backend
+		self.queue_size = queue_size
+		self._channels: dict[str, set[Subscription]] = {}
+		self._started = False
+		self.published = 0
+		self.delivered = 0
+		self.dropped = 0
+
+	async def _ensure_started(self) -> None:
+		if not self._started:
+			self._started = True
+			await self.backend.start(self._deliver)
+
+	def _deliver(self, channel: str, message: str) -> None:
+		for sub in list(self._channels.get(channel, ())):
+			if sub.offer(message):
+				self.delivered += 1
+			elif sub.dropped:
+				self.dropped += 1
+				self._remove(sub)
+
+	def _remove(self, sub: Subscription) -> None:
+		subs = self._channels.get(sub.channel)
+		if subs is not None:
+			subs.discard(sub)
+			if not subs:
+				del self._channels[sub.channel]
+
+	async def publish(self, channel: str, message: str) -> None:
+		await self._ensure_started()
+		self.published += 1
+		await self.backend.publish(channel, message)
+
+	@asynccontextmanager
+	async def subscribe(self, channel: str) -> AsyncIterator[Subscription]:
+		await self._ensure_started()
+		sub = Subscription(channel, self.queue_size)
+		self._channels.setdefault(channel, set()).add(sub)
+		try:
+			yield sub
+		finally:
+			self._remove(sub)
+
+	async def close(self) -> None:
+		await self.backend.close()
+		self._started = False
+
+	def stats(self) -> dict[str, int]:
+		return {
+			"channels": len(self._channels),
+			"subscribers": sum(len(s) for s in self._channels.values()),
+			"published": self.published,
+			"delivered": self.delivered,
+			"dropped_subscribers": self.dropped,
+		}
+
+
+__all__ = ["Broker", "Subscription"]
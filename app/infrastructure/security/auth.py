@@ -1,13 +1,27 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.metrics import registry
+from app.infrastructure.cache.memory import TTLCache
+from app.infrastructure.security.hashing_pool import PasswordHashPool
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 8
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max to the configured cost makes needs_update() flag hashes made with
+# any other cost, so changing BCRYPT_ROUNDS rehashes users transparently on login.
+pwd_context = CryptContext(
+	schemes=["bcrypt"],
+	deprecated="auto",
+	bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+	bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+	bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+password_pool = PasswordHashPool(workers=settings.PASSWORD_HASH_WORKERS, max_queue=settings.PASSWORD_HASH_MAX_QUEUE)
 
 
 def hash_password(password: str) -> str:
@@ -18,6 +32,15 @@ def verify_password(password: str, hashed: str) -> bool:
 	return pwd_context.verify(password, hashed)
 
 
+async def hash_password_async(password: str) -> str:
+	return await password_pool.run(pwd_context.hash, password)
+
+
+async def verify_and_update_password(password: str, hashed: str) -> tuple[bool, str | None]:
+	"""(valid, new_hash). new_hash is set when the stored hash uses an outdated cost."""
+	return await password_pool.run(pwd_context.verify_and_update, password, hashed)
+
+
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
 	if expires_delta is None:
 		expires_delta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -26,9 +49,41 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
 	return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
 
 
-def decode_access_token(token: str) -> str | None:
+# sha256(token) -> (sub, exp). Only successfully verified tokens are stored, and an
+# entry never outlives the token's own exp claim.
+_token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS)
+
+
+def _verify_access_token(token: str) -> tuple[str | None, float | None] | None:
 	try:
 		payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
-		return payload.get("sub")
 	except JWTError:
 		return None
+	exp = payload.get("exp")
+	return payload.get("sub"), float(exp) if exp is not None else None
+
+
+def decode_access_token(token: str) -> str | None:
+	key = hashlib.sha256(token.encode()).digest()
+	cached = _token_cache.get(key)
+	now = time.time()
+	if cached is not None:
+		sub, exp = cached
+		if exp > now:
+			return sub
+		_token_cache.pop(key)
+	verified = _verify_access_token(token)
+	if verified is None:
+		return None
+	sub, exp = verified
+	if sub and exp is not None:
+		_token_cache.set(key, verified, ttl=min(settings.TOKEN_CACHE_TTL_SECONDS, exp - now))
+	return sub
+
+
+def token_cache_stats() -> dict[str, float]:
+	return _token_cache.stats()
+
+
+registry.stats_collector("cache", "cache").add("tokens", token_cache_stats)
+registry.stats_collector("password_hash_pool", "pool").add("password", password_pool.stats)
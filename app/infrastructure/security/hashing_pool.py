@@ -0,0 +1,78 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable
+
+from app.core.errors import ServiceUnavailableError
+from app.core.metrics import Histogram
+
+
+class PasswordHashPool:
+	"""Runs CPU-heavy password hashing off the event loop on a small, bounded pool.
+
+	bcrypt releases the GIL, so threads give real parallelism. At most
+	``workers + max_queue`` calls may be in flight; beyond that callers are
+	rejected immediately instead of piling up behind a login burst.
+	"""
+
+	def __init__(self, workers: int, max_queue: int):
+		self.workers = workers
+		self.max_queue = max_queue
+		self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwhash")
+		self._lock = Lock()
+		self.in_flight = 0
+		self.completed = 0
+		self.rejected = 0
+		self.wait_total = 0.0
+		self.wait_max = 0.0
+		self.queue_wait = Histogram()
+		# Queue wait plus hashing, as seen by the caller.
+		self.latency = Histogram()
+
+	def _acquire(self) -> None:
+		with self._lock:
+			if self.in_flight >= self.workers + self.max_queue:
+				self.rejected += 1
+				raise ServiceUnavailableError("Authentication is busy, retry shortly")
+			self.in_flight += 1
+
+	def _timed(self, fn: Callable[..., Any], submitted: float, *args: Any) -> Any:
+		waited = time.perf_counter() - submitted
+		with self._lock:
+			self.wait_total += waited
+			self.wait_max = max(self.wait_max, waited)
+		self.queue_wait.observe(waited)
+		return fn(*args)
+
+	async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+		self._acquire()
+		submitted = time.perf_counter()
+		try:
+			loop = asyncio.get_running_loop()
+			return await loop.run_in_executor(self._executor, self._timed, fn, submitted, *args)
+		finally:
+			self.latency.observe(time.perf_counter() - submitted)
+			with self._lock:
+				self.in_flight -= 1
+				self.completed += 1
+
+	def stats(self) -> dict:
+		return {
+			"workers": self.workers,
+			"max_queue": self.max_queue,
+			"in_flight": self.in_flight,
+			"queued": max(0, self.in_flight - self.workers),
+			"completed": self.completed,
+			"rejected": self.rejected,
+			"queue_wait_avg_seconds": (self.wait_total / self.completed) if self.completed else 0.0,
+			"queue_wait_max_seconds": self.wait_max,
+			"queue_wait_seconds": self.queue_wait.snapshot(),
+			"latency_seconds": self.latency.snapshot(),
+		}
+
+	def shutdown(self) -> None:
+		self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = ["PasswordHashPool"]
@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends
+from app.core.authz import membership_cache_stats
+from app.core.deps import require_internal_access
+from app.core.errors import NotFoundError
+from app.core.profiler import profiles
+from app.infrastructure.db.base import engine
+from app.infrastructure.db.pool import pool_snapshot
+from app.infrastructure.db.routing import replica_router
+from app.infrastructure.security.auth import password_pool, token_cache_stats
+from app.pages.cache import page_cache
+from app.pages.services import autosave_buffer, revision_recorder
+from app.realtime.events import broker
+
+router = APIRouter(prefix="/internal", tags=["internal"], dependencies=[Depends(require_internal_access)])
+
+@router.get("/db/pool")
+async def db_pool_stats():
+    return {
+        "primary": pool_snapshot(engine),
+        "replicas": {r.name: pool_snapshot(r.engine) for r in replica_router.replicas},
+        "routing": replica_router.stats(),
+    }
+
+@router.get("/caches")
+async def cache_stats():
+    return {"pages": page_cache.stats(), "membership": membership_cache_stats(), "tokens": token_cache_stats()}
+
+@router.get("/password-pool")
+async def password_pool_stats():
+    return password_pool.stats()
+
+@router.get("/autosave")
+async def autosave_stats():
+    return autosave_buffer.stats()
+
+@router.get("/profiles")
+async def list_profiles():
+    return [
+        {k: report[k] for k in ("id", "path", "query_count", "query_ms")} | {"n_plus_one": len(report["n_plus_one"])}
+        for report in profiles.values()
+    ]
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    report = profiles.get(profile_id)
+    if report is None:
+        raise NotFoundError("Profile not found")
+    return report
+
+@router.get("/revisions")
+async def revision_stats():
+    return revision_recorder.stats()
+
+@router.get("/realtime")
+async def realtime_stats():
+    return broker.stats()
@@ -1,12 +1,22 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from app.core.errors import ERROR_CLASSES
 from app.core.config import settings
+from app.core.instrumentation import MetricsMiddleware
+from app.core.profiler import ProfilerMiddleware
+from app.core.metrics import registry
+from app.infrastructure.db.base import engine
+from app.infrastructure.db.instrumentation import instrument_engine
+from app.infrastructure.db.routing import replica_router
 from app.users.router import router as users_router
 from app.workspaces.router import router as workspaces_router
 from app.pages.router import router as pages_router
+from app.internal.router import router as internal_router
+from app.realtime.router import router as realtime_router
+from app.pages.services import autosave_buffer, revision_recorder
+from app.realtime.events import broker
 
 app = FastAPI(title="Wiki Backend")
 
@@ -17,11 +27,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Browsers hide non-safelisted response headers from scripts unless they are exposed.
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 app.include_router(users_router)
 app.include_router(workspaces_router)
 app.include_router(pages_router)
+app.include_router(realtime_router)
+# Gated per request by require_internal_access (INTERNAL_ENDPOINTS_ENABLED / INTERNAL_TOKEN).
+app.include_router(internal_router)
 
 @app.get("/")
 async def root():
@@ -44,6 +59,12 @@ async def run_startup_migrations_if_enabled():
         except Exception:
             logging.getLogger(__name__).error("Startup migration failed; continuing without blocking app.\n%s", traceback.format_exc())
 
+@app.on_event("shutdown")
+async def flush_autosave_buffer():
+    await autosave_buffer.stop()
+    await revision_recorder.stop()
+    await broker.close()
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
@@ -55,6 +76,18 @@ async def domain_error_middleware(request: Request, call_next):
     except ERROR_CLASSES as e:  # type: ignore
         return JSONResponse(e.to_dict(), status_code=e.status_code)
 
+instrument_engine(engine)
+for replica in replica_router.replicas:
+    instrument_engine(replica.engine, replica.name)
+# Added last so they wrap domain_error_middleware and see the final status code.
+app.add_middleware(ProfilerMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     return JSONResponse(
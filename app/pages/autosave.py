@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+from app.core.metrics import Histogram
+from app.pages import delta, schemas
+
+# Autosave write coalescing. Content patches are acknowledged as soon as they are
+# merged into the pending entry of their page; a background task writes every
+# pending page in one transaction per interval (or earlier when too many pages are
+# pending). Entries live only in process memory: stop() flushes on shutdown and
+# reads of a pending page flush it first. JSON Patch ops are dry-run against the
+# document they will apply to before they are acknowledged, and entries whose write
+# fails stay queued for the next flush.
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingSave:
+    workspace_id: uuid.UUID
+    user_id: uuid.UUID
+    title: str | None = None
+    # Content patches still to apply, in order (title stripped). Adjacent block deltas are merged.
+    steps: list[schemas.PageContentPatch] = field(default_factory=list)
+    submitted: int = 0
+    # The document once steps are applied; only tracked after a JSON Patch needed it.
+    preview: Any = None
+    attempts: int = 0
+
+
+def replay(doc: Any, steps: list[schemas.PageContentPatch]) -> Any:
+    for step in steps:
+        if step.content is not None:
+            doc = step.content
+        elif step.is_delta:
+            ops = [op.model_dump() for op in step.ops] if step.ops else None
+            doc = delta.apply_delta(doc, ops, step.blocks, step.deleted_blocks)
+    return doc
+
+
+def merge_step(steps: list[schemas.PageContentPatch], patch: schemas.PageContentPatch) -> None:
+    if patch.content is not None:
+        steps[:] = [patch]
+        return
+    if not patch.is_delta:
+        return
+    last = steps[-1] if steps else None
+    if last is not None and last.content is not None:
+        ops = [op.model_dump() for op in patch.ops] if patch.ops else None
+        steps[-1] = schemas.PageContentPatch(content=delta.apply_delta(last.content, ops, patch.blocks, patch.deleted_blocks))
+    elif last is not None and not last.ops and not patch.ops:
+        # Two block deltas (upserts applied before deletes) collapse into one.
+        new_blocks = patch.blocks or {}
+        old_deleted = set(last.deleted_blocks or ())
+        blocks = {k: v for k, v in (last.blocks or {}).items() if k not in old_deleted} | new_blocks
+        deleted = [k for k in old_deleted if k not in new_blocks] + list(patch.deleted_blocks or ())
+        steps[-1] = schemas.PageContentPatch(blocks=blocks or None, deleted_blocks=deleted or None)
+    else:
+        steps.append(patch)
+
+
+class AutosaveBuffer:
+    def __init__(
+        self,
+        writer: Callable[[dict[uuid.UUID, PendingSave]], Awaitable[None]],
+        enabled: bool = False,
+        interval: float = 1.0,
+        max_pending: int = 500,
+    ):
+        self.writer = writer
+        self.enabled = enabled
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: dict[uuid.UUID, PendingSave] = {}
+        self._lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.submitted = 0
+        self.pages_written = 0
+        self.patches_written = 0
+        self.flushes = 0
+        self.failures = 0
+        self.flush_latency = Histogram()
+
+    def is_pending(self, page_id: uuid.UUID) -> bool:
+        return page_id in self._pending
+
+    async def submit(
+        self,
+        workspace_id: uuid.UUID,
+        page_id: uuid.UUID,
+        user_id: uuid.UUID,
+        patch: schemas.PageContentPatch,
+        load_document: Callable[[], Awaitable[Any]] | None = None,
+    ) -> None:
+        """Queue a patch. Raises ValidationError (nothing queued) when its JSON Patch ops do not
+        apply to the page's document as it will be by then; ``load_document`` reads the stored one."""
+        step = patch.model_copy(update={"title": None})
+        entry = self._pending.get(page_id)
+        preview = entry.preview if entry is not None else None
+        if step.ops and preview is None:
+            # Under the flush lock so the stored document and the pending steps line up.
+            async with self._lock:
+                entry = self._pending.get(page_id)
+                base = await load_document() if load_document is not None else {}
+                preview = replay(base, entry.steps if entry is not None else [])
+        if preview is not None:
+            preview = replay(preview, [step])
+        steps = list(entry.steps) if entry is not None else []
+        merge_step(steps, step)
+        if entry is None:
+            entry = self._pending[page_id] = PendingSave(workspace_id, user_id)
+        entry.user_id = user_id
+        if patch.title is not None:
+            entry.title = patch.title
+        entry.steps, entry.preview = steps, preview
+        entry.submitted += 1
+        self.submitted += 1
+        self.start()
+        if len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write everything pending. Returns the number of pages written."""
+        async with self._lock:
+            batch, self._pending = self._pending, {}
+            return await self._write(batch)
+
+    async def flush_page(self, page_id: uuid.UUID) -> None:
+        async with self._lock:
+            entry = self._pending.pop(page_id, None)
+            if entry is not None:
+                await self._write({page_id: entry})
+
+    async def _write(self, batch: dict[uuid.UUID, PendingSave]) -> int:
+        if not batch:
+            return 0
+        started = time.perf_counter()
+        try:
+            await self.writer(batch)
+            written = len(batch)
+            self.patches_written += sum(e.submitted for e in batch.values())
+        except Exception:
+            # One bad page must not sink the whole batch: retry page by page.
+            logger.warning("Autosave batch of %d pages failed; retrying individually", len(batch), exc_info=True)
+            written = 0
+            for page_id, entry in batch.items():
+                try:
+                    await self.writer({page_id: entry})
+                    written += 1
+                    self.patches_written += entry.submitted
+                except Exception:
+                    self.failures += 1
+                    entry.attempts += 1
+                    logger.exception("Autosave of page %s failed (attempt %d); keeping %d patches queued", page_id, entry.attempts, entry.submitted)
+                    self._requeue(page_id, entry)
+        self.flush_latency.observe(time.perf_counter() - started)
+        self.flushes += 1
+        self.pages_written += written
+        return written
+
+    def _requeue(self, page_id: uuid.UUID, entry: PendingSave) -> None:
+        # Patches acknowledged while the write was running go after the failed ones.
+        newer = self._pending.get(page_id)
+        if newer is not None:
+            for step in newer.steps:
+                merge_step(entry.steps, step)
+            if newer.title is not None:
+                entry.title = newer.title
+            entry.user_id = newer.user_id
+            entry.submitted += newer.submitted
+            entry.preview = replay(entry.preview, newer.steps) if entry.preview is not None else None
+        self._pending[page_id] = entry
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Autosave flush failed")
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            # (Re)bind to the running loop; only differs when an embedding test client runs its own loop.
+            self._wakeup, self._lock = asyncio.Event(), asyncio.Lock()
+            self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Shutdown hook: stop the flusher and write whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending_pages": len(self._pending),
+            "submitted": self.submitted,
+            "pages_written": self.pages_written,
+            # Patches acknowledged per page write.
+            "coalescing_ratio": round(self.patches_written / self.pages_written, 2) if self.pages_written else None,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "retrying_pages": sum(1 for e in self._pending.values() if e.attempts),
+            "flush_latency_seconds": self.flush_latency.snapshot(),
+        }
+
+
+__all__ = ["AutosaveBuffer", "PendingSave", "merge_step", "replay"]
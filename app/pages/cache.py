@@ -0,0 +1,89 @@
+import uuid
+from typing import Any
+from app.core.config import settings
+from app.core.fastjson import dumps, loads
+from app.core.metrics import registry
+from app.infrastructure.cache.backends import CacheBackend, build_backend
+
+# Read-model cache for page rows and page listings.
+#
+# Keys embed a generation token (per workspace for listings, per page for rows).
+# Writers invalidate by replacing the token instead of enumerating keys, and
+# readers take the token *before* querying, so a read racing with a write can only
+# populate a key that is already orphaned. That only holds for reads served by the
+# primary: a replica may still return the pre-write row after the token was replaced,
+# so results read from a replica are never stored.
+
+
+class PageCache:
+    def __init__(self, backend: CacheBackend | None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def _generation(self, scope: str) -> str:
+        key = f"pages:gen:{scope}"
+        gen = await self.backend.get(key)
+        if gen is None:
+            gen = uuid.uuid4().hex.encode()
+            await self.backend.set(key, gen)
+        return gen.decode()
+
+    async def listing_key(self, workspace_id: uuid.UUID, query: str) -> str | None:
+        if not self.enabled:
+            return None
+        return f"pages:list:{workspace_id}:{await self._generation(f'ws:{workspace_id}')}:{query}"
+
+    async def row_key(self, page_id: uuid.UUID) -> str | None:
+        if not self.enabled:
+            return None
+        return f"pages:row:{page_id}:{await self._generation(f'page:{page_id}')}"
+
+    async def get(self, key: str | None) -> Any:
+        if key is None:
+            return None
+        raw = await self.backend.get(key)
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return loads(raw)
+
+    async def set(self, key: str | None, value: Any) -> None:
+        if key is not None:
+            await self.backend.set(key, dumps(value))
+
+    async def invalidate(self, workspace_id: uuid.UUID, page_id: uuid.UUID | None = None) -> None:
+        if not self.enabled:
+            return
+        self.invalidations += 1
+        scopes = [f"ws:{workspace_id}"] + ([f"page:{page_id}"] if page_id else [])
+        await self.backend.delete(*(f"pages:gen:{scope}" for scope in scopes))
+
+    async def invalidate_pages(self, workspace_id: uuid.UUID, page_ids: list[uuid.UUID]) -> None:
+        """Like invalidate() for a batch of pages of one workspace (e.g. a subtree)."""
+        if not self.enabled:
+            return
+        self.invalidations += 1
+        scopes = [f"ws:{workspace_id}"] + [f"page:{page_id}" for page_id in page_ids]
+        await self.backend.delete(*(f"pages:gen:{scope}" for scope in scopes))
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            **({f"backend_{k}": v for k, v in self.backend.stats().items()} if self.enabled else {}),
+        }
+
+
+page_cache = PageCache(build_backend(settings.PAGE_CACHE_BACKEND, settings.PAGE_CACHE_MAXSIZE, settings.PAGE_CACHE_TTL_SECONDS))
+registry.stats_collector("cache", "cache").add("pages", page_cache.stats)
@@ -0,0 +1,34 @@
+import json
+from typing import Any
+import anyio
+from app.core.config import settings
+from app.infrastructure.files.local import LocalBlobStore
+
+# Large documents live in the blob store; page_content keeps {} plus blob_ref.
+# Blob I/O is blocking file work, so it runs in a worker thread.
+
+blob_store = LocalBlobStore(settings.BLOB_STORAGE_DIR)
+
+
+def encode(doc: Any) -> bytes:
+    return json.dumps(doc, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def should_externalize(size: int) -> bool:
+    return bool(settings.CONTENT_BLOB_THRESHOLD_BYTES) and size >= settings.CONTENT_BLOB_THRESHOLD_BYTES
+
+
+async def store(doc: Any) -> tuple[Any, str | None]:
+    """Returns the (content, blob_ref) pair to persist for ``doc``."""
+    if not settings.CONTENT_BLOB_THRESHOLD_BYTES:
+        return doc, None
+    raw = encode(doc)
+    if not should_externalize(len(raw)):
+        return doc, None
+    return {}, await anyio.to_thread.run_sync(blob_store.put, raw)
+
+
+async def load(content: Any, blob_ref: str | None) -> Any:
+    if blob_ref is None:
+        return content
+    return json.loads(await anyio.to_thread.run_sync(blob_store.get, blob_ref))
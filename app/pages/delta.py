@@ -0,0 +1,117 @@
+import copy
+from typing import Any
+from app.core.errors import ValidationError
+
+# Incremental content edits. Two forms are accepted on PATCH /pages/{id}/content:
+#   * block deltas: Yoopta documents are objects keyed by block id, so an edit is
+#     a set of whole-block upserts plus a list of deleted block ids;
+#   * JSON Patch (RFC 6902) add/replace/remove operations for finer edits.
+# On PostgreSQL both are applied in SQL (see PageContentRepository.apply_delta);
+# the functions below are the equivalent in-Python semantics used elsewhere.
+
+
+def parse_pointer(path: str) -> list[str]:
+    if path == "":
+        return []
+    if not path.startswith("/"):
+        raise ValidationError(f"Invalid JSON pointer: {path!r}")
+    return [p.replace("~1", "/").replace("~0", "~") for p in path[1:].split("/")]
+
+
+def array_index(token: str, size: int, op: str, path: str) -> int:
+    """The position ``token`` addresses in an array of ``size`` items: an existing element,
+    or for ``add`` also ``size`` ("-" or the index one past the end)."""
+    if op == "add" and token == "-":
+        return size
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise ValidationError(f"Invalid array index in {path}")
+    index = int(token)
+    if index > size or (index == size and op != "add"):
+        raise ValidationError(f"Array index out of range: {path}")
+    return index
+
+
+def check_target(op: str, path: str, parent_type: str | None, size: int | None) -> int | None:
+    """Validate an op against the type of the container holding its target (``jsonb_typeof``
+    names). Returns the array position for array parents, None for objects."""
+    tokens = parse_pointer(path)
+    if parent_type == "array":
+        return array_index(tokens[-1], size, op, path)
+    if parent_type != "object":
+        raise ValidationError(f"Path not found: {path}")
+    return None
+
+
+def ops_interdependent(ops: list[dict], upserts: dict[str, Any] | None = None, deletes: list[str] | None = None) -> bool:
+    """True when an op's container is changed by an earlier edit of the same patch, so its
+    target cannot be checked against the stored document alone."""
+    touched = set(upserts or ()) | set(deletes or ())
+    seen: list[list[str]] = []
+    for op in ops:
+        tokens = parse_pointer(op["path"])
+        parent = tokens[:-1]
+        if tokens and tokens[0] in touched:
+            return True
+        if any(prev == parent[:len(prev)] or prev[:-1] == parent for prev in seen):
+            return True
+        seen.append(tokens)
+    return False
+
+
+def _walk(doc: Any, tokens: list[str]) -> Any:
+    for i, token in enumerate(tokens):
+        path = "/" + "/".join(tokens[:i + 1])
+        if isinstance(doc, list):
+            doc = doc[array_index(token, len(doc), "replace", path)]
+        elif isinstance(doc, dict) and token in doc:
+            doc = doc[token]
+        else:
+            raise ValidationError(f"Path not found: {path}")
+    return doc
+
+
+def apply_json_patch(doc: Any, ops: list[dict]) -> Any:
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        tokens = parse_pointer(op["path"])
+        if not tokens:
+            if op["op"] == "remove":
+                raise ValidationError("Cannot remove the document root")
+            doc = copy.deepcopy(op.get("value"))
+            continue
+        parent = _walk(doc, tokens[:-1])
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = array_index(last, len(parent), op["op"], op["path"])
+            if op["op"] == "add":
+                parent.insert(index, op.get("value"))
+            elif op["op"] == "replace":
+                parent[index] = op.get("value")
+            else:
+                del parent[index]
+        elif isinstance(parent, dict):
+            if op["op"] == "remove":
+                parent.pop(last, None)
+            elif op["op"] == "replace" and last not in parent:
+                continue  # mirrors jsonb_set(create_missing => false)
+            else:
+                parent[last] = op.get("value")
+        else:
+            raise ValidationError(f"Path not found: {op['path']}")
+    return doc
+
+
+def apply_block_delta(doc: Any, upserts: dict[str, Any] | None, deletes: list[str] | None) -> dict:
+    doc = dict(doc) if isinstance(doc, dict) else {}
+    doc.update(upserts or {})
+    for block_id in deletes or ():
+        doc.pop(block_id, None)
+    return doc
+
+
+def apply_delta(doc: Any, ops: list[dict] | None, upserts: dict[str, Any] | None, deletes: list[str] | None) -> Any:
+    if upserts or deletes:
+        doc = apply_block_delta(doc, upserts, deletes)
+    if ops:
+        doc = apply_json_patch(doc, ops)
+    return doc
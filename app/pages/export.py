@@ -0,0 +1,63 @@
+import io
+import json
+import zipfile
+from typing import AsyncIterator, Iterable
+
+# Streaming encoders for workspace exports. Both consume batches of records built
+# from PageRepository.stream_export rows and yield bytes as soon as a batch is encoded, so
+# memory is bounded by the batch size and the first bytes leave before the query ends.
+
+EXPORT_COLUMNS = ("id", "parent_page_id", "title", "type", "icon", "created_at", "updated_at", "version", "content", "blob_ref")
+
+
+def record(row) -> dict:
+    record = {c: row._mapping[c] for c in EXPORT_COLUMNS}
+    record["content"] = record["content"] if record["content"] is not None else {}
+    record["version"] = record["version"] or 0
+    return record
+
+
+def _dumps(record: dict) -> bytes:
+    return json.dumps(record, default=str, separators=(",", ":")).encode()
+
+
+async def ndjson_chunks(batches: AsyncIterator[Iterable[dict]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(_dumps(rec) + b"\n" for rec in batch)
+
+
+class _ChunkWriter(io.RawIOBase):
+    """Unseekable sink for ZipFile; zipfile then writes data descriptors instead of seeking back."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def zip_chunks(batches: AsyncIterator[Iterable[dict]]) -> AsyncIterator[bytes]:
+    sink = _ChunkWriter()
+    count = 0
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        async for batch in batches:
+            for rec in batch:
+                archive.writestr(f"pages/{rec['id']}.json", _dumps(rec))
+                count += 1
+            yield sink.drain()
+        archive.writestr("manifest.json", _dumps({"format": "pages/<id>.json", "pages": count}))
+    yield sink.drain()
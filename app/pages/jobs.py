@@ -0,0 +1,89 @@
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+import anyio
+from sqlalchemy import select
+from app.core.config import settings
+from app.infrastructure.db.models import PageContent
+from app.infrastructure.db.uow import SqlAlchemyUoW
+from app.pages import content_store
+from app.pages.cache import page_cache
+from app.pages.revisions import compact_revisions
+
+# Maintenance jobs for the pages slice. Run from cron / a worker:
+#   python -m app.pages.jobs gc-blobs
+#   python -m app.pages.jobs compact-revisions [--days N]
+#   python -m app.pages.jobs purge-trash [--days N]
+#   python -m app.pages.jobs rebalance-positions
+
+
+async def collect_content_blobs(grace_seconds: float | None = None) -> int:
+    """Delete blobs no page_content or page_revisions row references. Returns how many were removed.
+
+    Blobs younger than the grace period are kept so a write that stored its blob but
+    has not committed the row yet is never collected.
+    """
+    async with SqlAlchemyUoW(read_only=True) as uow:
+        res = await uow.session.execute(select(PageContent.blob_ref).where(PageContent.blob_ref.is_not(None)).distinct())
+        referenced = set(res.scalars()) | await uow.page_revisions.blob_refs()
+    grace = settings.BLOB_GC_GRACE_SECONDS if grace_seconds is None else grace_seconds
+    return await anyio.to_thread.run_sync(content_store.blob_store.collect_garbage, referenced, grace)
+
+
+async def purge_trash(retention_days: int | None = None, batch_size: int | None = None) -> int:
+    """Hard-delete pages archived longer than the retention window. Each batch is its own short
+    transaction, so row locks on ``pages`` are never held for more than ``batch_size`` rows.
+    Batches take leaves only, so it runs until one finds nothing: deleting a level of an archived
+    subtree turns its parents into leaves. Returns the number of pages deleted."""
+    days = settings.TRASH_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.TRASH_PURGE_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    deleted = 0
+    while True:
+        async with SqlAlchemyUoW() as uow:
+            removed = await uow.pages.purge_archived(cutoff, batch_size)
+        deleted += removed
+        if not removed:
+            return deleted
+
+
+async def rebalance_positions(max_length: int | None = None, batch_size: int = 100) -> int:
+    """Respace sibling groups whose position keys grew past ``max_length`` (or collided).
+    One transaction per group. Returns the number of groups rewritten."""
+    max_length = settings.PAGE_POSITION_MAX_LENGTH if max_length is None else max_length
+    done = 0
+    while True:
+        async with SqlAlchemyUoW() as uow:
+            groups = await uow.pages.sibling_groups_to_rebalance(max_length, batch_size)
+        for group in groups:
+            async with SqlAlchemyUoW() as uow:
+                respaced = await uow.pages.respace_positions(group.workspace_id, group.parent_page_id)
+            # Cached rows and listings carry the old keys.
+            await page_cache.invalidate_pages(group.workspace_id, respaced)
+        done += len(groups)
+        if len(groups) < batch_size:
+            return done
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.pages.jobs")
+    sub = parser.add_subparsers(dest="job", required=True)
+    sub.add_parser("gc-blobs", help="delete unreferenced content blobs")
+    compact = sub.add_parser("compact-revisions", help="drop revisions past the retention window")
+    compact.add_argument("--days", type=int, default=None)
+    purge = sub.add_parser("purge-trash", help="hard-delete pages archived past the retention window")
+    purge.add_argument("--days", type=int, default=None)
+    sub.add_parser("rebalance-positions", help="respace sibling order keys that grew too long")
+    args = parser.parse_args(argv)
+    if args.job == "gc-blobs":
+        print(f"removed {asyncio.run(collect_content_blobs())} blobs")
+    elif args.job == "compact-revisions":
+        print(f"removed {asyncio.run(compact_revisions(args.days))} revisions")
+    elif args.job == "purge-trash":
+        print(f"removed {asyncio.run(purge_trash(args.days))} pages")
+    elif args.job == "rebalance-positions":
+        print(f"rebalanced {asyncio.run(rebalance_positions())} sibling groups")
+
+
+if __name__ == "__main__":
+    main()
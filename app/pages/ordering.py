@@ -0,0 +1,61 @@
+# Sibling order keys (fractional indexing). A key is a base-62 fraction written
+# without the leading "0.", so plain byte-wise string comparison orders them and a
+# new key always fits between any two others: a move rewrites one row. Keys never
+# end in "0" (that would equal the shorter key). Repeated inserts at the same spot
+# make keys longer; `python -m app.pages.jobs rebalance-positions` respaces those
+# sibling groups. The column uses the "C" collation on PostgreSQL for this order.
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+_VALUE = {d: i for i, d in enumerate(DIGITS)}
+
+
+def _midpoint(a: str, b: str | None) -> str:
+    # a < b as fractions; "" is 0 and None is 1.
+    if b is not None:
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    da = _VALUE[a[0]] if a else 0
+    db = _VALUE[b[0]] if b is not None else BASE
+    if db - da > 1:
+        return DIGITS[(da + db) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[da] + _midpoint(a[1:], None)
+
+
+def _check(key: str) -> None:
+    if not key or key.endswith("0") or any(c not in _VALUE for c in key):
+        raise ValueError(f"Invalid position key: {key!r}")
+
+
+def key_between(a: str | None, b: str | None) -> str:
+    """A key strictly between ``a`` and ``b``; None means the start / end of the list."""
+    for key in (a, b):
+        if key is not None:
+            _check(key)
+    if a is not None and b is not None and a >= b:
+        raise ValueError(f"Position keys out of order: {a!r} >= {b!r}")
+    # Appending/prepending steps the last digit instead of halving toward the end, so
+    # keys grow one character per ~BASE/2 such inserts rather than per ~6.
+    if b is None and a is not None and _VALUE[a[-1]] < BASE - 1:
+        return a[:-1] + DIGITS[_VALUE[a[-1]] + 1]
+    if a is None and b is not None and _VALUE[b[-1]] > 1:
+        return b[:-1] + DIGITS[_VALUE[b[-1]] - 1]
+    return _midpoint(a or "", b)
+
+
+def keys_between(a: str | None, b: str | None, n: int) -> list[str]:
+    """``n`` ascending keys between ``a`` and ``b``, bisecting so they stay short."""
+    key_between(a, b)  # validates the bounds
+    return _bisect(a, b, n)
+
+
+def _bisect(a: str | None, b: str | None, n: int) -> list[str]:
+    if n <= 0:
+        return []
+    mid = _midpoint(a or "", b)
+    return _bisect(a, mid, n // 2) + [mid] + _bisect(mid, b, n - n // 2 - 1)
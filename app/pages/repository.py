@@ -1,7 +1,26 @@
+import json
 import uuid
-from sqlalchemy import select
+from datetime import datetime
+from typing import Any, AsyncIterator
+from sqlalchemy import Text, bindparam, case, cast, delete, exists, func, insert, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, array
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.infrastructure.db.models import Page, PageContent
+from sqlalchemy.orm import aliased
+from app.core.errors import ValidationError
+from app.infrastructure.db.models import Page, PageContent, PageRevision
+from app.pages import delta, ordering
+
+
+def _first_visits(rows, skip: set[uuid.UUID] = frozenset()) -> list[Row]:
+    # A parent_page_id cycle (legacy data) makes the depth-bounded walks revisit pages;
+    # keep each id once, at its first (nearest) visit.
+    seen, out = set(skip), []
+    for row in rows:
+        if row.id not in seen:
+            seen.add(row.id)
+            out.append(row)
+    return out
 
 
 class PageRepository:
@@ -15,6 +34,327 @@ class PageRepository:
         res = await self.session.execute(select(Page).where(Page.id == page_id))
         return res.scalar_one_or_none()
 
+    async def get_version(self, page_id: uuid.UUID) -> int | None:
+        res = await self.session.execute(select(Page.version).where(Page.id == page_id))
+        return res.scalar_one_or_none()
+
+    async def bulk_insert(self, rows: list[dict], batch_size: int) -> None:
+        # executemany over insert() is sent as multi-row INSERT ... VALUES batches.
+        for start in range(0, len(rows), batch_size):
+            await self.session.execute(insert(Page), rows[start:start + batch_size])
+
+    async def existing_ids(self, workspace_id: uuid.UUID, page_ids: set[uuid.UUID]) -> set[uuid.UUID]:
+        if not page_ids:
+            return set()
+        res = await self.session.execute(select(Page.id).where(Page.workspace_id == workspace_id, Page.id.in_(page_ids)))
+        return set(res.scalars().all())
+
+    async def list_for_workspace(
+        self,
+        workspace_id: uuid.UUID,
+        columns: list[str],
+        limit: int,
+        parent_page_id: uuid.UUID | None = None,
+        type: str | None = None,
+        after: tuple[datetime, uuid.UUID] | None = None,
+    ) -> list[Row]:
+        """Unarchived pages, newest first, keyset-paginated on (updated_at, id).
+
+        Only ``columns`` (plus the sort key) are selected; no ORM entities are built.
+        """
+        cols = [getattr(Page, c) for c in columns if c not in ("id", "updated_at")]
+        stmt = (
+            select(Page.id, Page.updated_at, *cols)
+            .where(Page.workspace_id == workspace_id, Page.is_archived.is_(False))
+            .order_by(Page.updated_at.desc(), Page.id.desc())
+            .limit(limit)
+        )
+        if parent_page_id is not None:
+            stmt = stmt.where(Page.parent_page_id == parent_page_id)
+        if type is not None:
+            stmt = stmt.where(Page.type == type)
+        if after is not None:
+            stmt = stmt.where(tuple_(Page.updated_at, Page.id) < tuple_(*after))
+        res = await self.session.execute(stmt)
+        return list(res.all())
+
+    async def listing_fingerprint(self, workspace_id: uuid.UUID) -> Row:
+        """(count, max(updated_at)) of the unarchived pages; changes whenever a listing would."""
+        stmt = select(func.count(), func.max(Page.updated_at)).where(
+            Page.workspace_id == workspace_id, Page.is_archived.is_(False)
+        )
+        res = await self.session.execute(stmt)
+        return res.one()
+
+    async def stream_export(self, workspace_id: uuid.UUID, batch_size: int) -> AsyncIterator[list[Row]]:
+        """Unarchived pages with their content, streamed through a server-side cursor in batches."""
+        stmt = (
+            select(
+                Page.id, Page.parent_page_id, Page.title, Page.type, Page.icon, Page.created_at, Page.updated_at,
+                PageContent.version, PageContent.content, PageContent.blob_ref,
+            )
+            .outerjoin(PageContent, PageContent.page_id == Page.id)
+            .where(Page.workspace_id == workspace_id, Page.is_archived.is_(False))
+            .order_by(Page.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for batch in result.partitions(batch_size):
+            yield batch
+
+    # Tree queries walk parent_page_id with recursive CTEs. Every recursive step
+    # filters on (workspace_id, parent_page_id) so it is served by ix_pages_workspace_parent_position,
+    # which also returns siblings already in ``position`` order.
+
+    @staticmethod
+    def _has_children(workspace_id: uuid.UUID, parent_id_col):
+        child = aliased(Page)
+        return exists().where(
+            child.workspace_id == workspace_id,
+            child.parent_page_id == parent_id_col,
+            child.is_archived.is_(False),
+        ).label("has_children")
+
+    async def subtree(self, workspace_id: uuid.UUID, root_id: uuid.UUID, max_depth: int) -> list[Row]:
+        """Unarchived pages under ``root_id`` (inclusive, depth 0) down to ``max_depth``."""
+        tree = (
+            select(Page.id, Page.title, Page.parent_page_id, Page.type, Page.position, literal(0).label("depth"))
+            .where(Page.id == root_id, Page.workspace_id == workspace_id, Page.is_archived.is_(False))
+            .cte("subtree", recursive=True)
+        )
+        child = aliased(Page)
+        tree = tree.union_all(
+            select(child.id, child.title, child.parent_page_id, child.type, child.position, tree.c.depth + 1).where(
+                child.workspace_id == workspace_id,
+                child.parent_page_id == tree.c.id,
+                child.is_archived.is_(False),
+                tree.c.depth < max_depth,
+            )
+        )
+        stmt = select(tree, self._has_children(workspace_id, tree.c.id)).order_by(tree.c.depth, tree.c.position, tree.c.id)
+        res = await self.session.execute(stmt)
+        return _first_visits(res.all())
+
+    async def ancestors(self, page_id: uuid.UUID, max_depth: int) -> list[Row]:
+        """Ancestors of ``page_id`` ordered root first, excluding the page itself."""
+        chain = (
+            select(Page.id, Page.workspace_id, Page.parent_page_id, literal(0).label("depth"))
+            .where(Page.id == page_id)
+            .cte("ancestors", recursive=True)
+        )
+        parent = aliased(Page)
+        chain = chain.union_all(
+            select(parent.id, parent.workspace_id, parent.parent_page_id, chain.c.depth + 1).where(
+                parent.id == chain.c.parent_page_id,
+                parent.workspace_id == chain.c.workspace_id,
+                chain.c.depth < max_depth,
+            )
+        )
+        stmt = (
+            select(Page.id, Page.title, Page.parent_page_id, Page.type)
+            .join(chain, chain.c.id == Page.id)
+            .where(chain.c.depth > 0)
+            .order_by(chain.c.depth.desc())
+        )
+        res = await self.session.execute(stmt)
+        # Nearest first for the de-duplication, then back to root first.
+        return [row for row in _first_visits(reversed(res.all()), skip={page_id})][::-1]
+
+    async def children(self, workspace_id: uuid.UUID, parent_page_id: uuid.UUID | None) -> list[Row]:
+        """Direct unarchived children of a page (or the workspace root) with a has_children flag."""
+        parent_filter = Page.parent_page_id.is_(None) if parent_page_id is None else Page.parent_page_id == parent_page_id
+        stmt = (
+            select(Page.id, Page.title, Page.parent_page_id, Page.type, Page.position, self._has_children(workspace_id, Page.id))
+            .where(Page.workspace_id == workspace_id, parent_filter, Page.is_archived.is_(False))
+            .order_by(Page.position, Page.id)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.all())
+
+    # Sibling positions. Archived siblings are included: their keys stay reserved for a restore.
+
+    @staticmethod
+    def _siblings(workspace_id: uuid.UUID, parent_page_id: uuid.UUID | None):
+        parent_filter = Page.parent_page_id.is_(None) if parent_page_id is None else Page.parent_page_id == parent_page_id
+        return select(Page.position).where(Page.workspace_id == workspace_id, parent_filter)
+
+    async def last_position(self, workspace_id: uuid.UUID, parent_page_id: uuid.UUID | None) -> str | None:
+        stmt = self._siblings(workspace_id, parent_page_id).order_by(Page.position.desc()).limit(1)
+        return await self.session.scalar(stmt)
+
+    async def last_positions(self, workspace_id: uuid.UUID, parent_ids: set[uuid.UUID | None]) -> dict[uuid.UUID | None, str]:
+        """Largest sibling key under each of ``parent_ids`` (None is the top level); parents without children are absent."""
+        if not parent_ids:
+            return {}
+        ids = [p for p in parent_ids if p is not None]
+        conds = [Page.parent_page_id.in_(ids)] if ids else []
+        if None in parent_ids:
+            conds.append(Page.parent_page_id.is_(None))
+        stmt = (
+            select(Page.parent_page_id, func.max(Page.position))
+            .where(Page.workspace_id == workspace_id, or_(*conds))
+            .group_by(Page.parent_page_id)
+        )
+        res = await self.session.execute(stmt)
+        return {parent: position for parent, position in res.all()}
+
+    async def neighbor_position(
+        self, workspace_id: uuid.UUID, parent_page_id: uuid.UUID | None, position: str, after: bool, exclude_id: uuid.UUID,
+    ) -> str | None:
+        """The sibling key right after (or before) ``position``, ignoring ``exclude_id``."""
+        stmt = self._siblings(workspace_id, parent_page_id).where(Page.id != exclude_id)
+        if after:
+            stmt = stmt.where(Page.position > position).order_by(Page.position)
+        else:
+            stmt = stmt.where(Page.position < position).order_by(Page.position.desc())
+        return await self.session.scalar(stmt.limit(1))
+
+    async def sibling_groups_to_rebalance(self, max_length: int, limit: int) -> list[Row]:
+        """(workspace_id, parent_page_id) groups holding a key longer than ``max_length`` or a
+        duplicate key (two concurrent moves to the same gap)."""
+        stmt = (
+            select(Page.workspace_id, Page.parent_page_id)
+            .group_by(Page.workspace_id, Page.parent_page_id)
+            .having(or_(func.max(func.length(Page.position)) > max_length, func.count() > func.count(Page.position.distinct())))
+            .limit(limit)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.all())
+
+    async def respace_positions(self, workspace_id: uuid.UUID, parent_page_id: uuid.UUID | None) -> list[uuid.UUID]:
+        """Rewrite one sibling group with short, evenly spread keys in the current order.
+
+        The group's rows are locked (FOR UPDATE on PostgreSQL) for the rewrite. A move that read
+        its neighbours' old keys just before may land off by a few places; moving it again fixes
+        that. Only ``position`` changes: the page version (and its ETag) and ``updated_at`` are
+        left alone because the visible order does not change. Returns the ids of the rows rewritten.
+        """
+        parent_filter = Page.parent_page_id.is_(None) if parent_page_id is None else Page.parent_page_id == parent_page_id
+        stmt = (
+            select(Page.id, Page.position)
+            .where(Page.workspace_id == workspace_id, parent_filter)
+            .order_by(Page.position, Page.id)
+            .with_for_update()
+        )
+        rows = (await self.session.execute(stmt)).all()
+        changes = [
+            {"page_id": row.id, "new_position": key}
+            for row, key in zip(rows, ordering.keys_between(None, None, len(rows)))
+            if row.position != key
+        ]
+        if changes:
+            # Core executemany on the table: the ORM bulk path would insist on the version counter.
+            pages = Page.__table__
+            stmt = (
+                update(pages)
+                .where(pages.c.id == bindparam("page_id"))
+                # Pinned so the column's onupdate does not stamp every respaced page as edited.
+                .values(position=bindparam("new_position"), updated_at=pages.c.updated_at)
+            )
+            await self.session.execute(stmt, changes)
+        return [change["page_id"] for change in changes]
+
+    # Subtree archive/restore are one set-based UPDATE each: the recursive CTE collects the
+    # ids and the UPDATE bumps the version counter itself (synchronize_session=False, so
+    # ORM instances of these pages in the session are stale afterwards). UNION rather than
+    # UNION ALL so a parent cycle cannot make the walk loop.
+
+    async def archive_subtree(self, workspace_id: uuid.UUID, root_id: uuid.UUID, user_id: uuid.UUID, archived_at: datetime) -> list[Row]:
+        """Archive ``root_id`` and its unarchived descendants (already archived branches keep their
+        own archived_at and stay separate trash entries). Returns (id, version) of the updated rows."""
+        tree = (
+            select(Page.id)
+            .where(Page.id == root_id, Page.workspace_id == workspace_id, Page.is_archived.is_(False))
+            .cte("archived_tree", recursive=True)
+        )
+        child = aliased(Page)
+        tree = tree.union(
+            select(child.id).where(child.workspace_id == workspace_id, child.parent_page_id == tree.c.id, child.is_archived.is_(False))
+        )
+        stmt = (
+            update(Page)
+            .where(Page.id.in_(select(tree.c.id)))
+            .values(is_archived=True, archived_at=archived_at, updated_by=user_id, version=Page.version + 1)
+            .returning(Page.id, Page.version)
+            .execution_options(synchronize_session=False)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.all())
+
+    async def restore_subtree(
+        self, workspace_id: uuid.UUID, root_id: uuid.UUID, user_id: uuid.UUID, archived_at: datetime, detach_position: str | None = None,
+    ) -> list[Row]:
+        """Unarchive ``root_id`` and the descendants archived together with it (same archived_at).
+        With ``detach_position`` the root moves to the workspace top level at that key.
+        Returns (id, version) of the updated rows."""
+        tree = (
+            select(Page.id)
+            .where(Page.id == root_id, Page.workspace_id == workspace_id, Page.archived_at == archived_at)
+            .cte("restored_tree", recursive=True)
+        )
+        child = aliased(Page)
+        tree = tree.union(
+            select(child.id).where(child.workspace_id == workspace_id, child.parent_page_id == tree.c.id, child.archived_at == archived_at)
+        )
+        values = dict(is_archived=False, archived_at=None, updated_by=user_id, version=Page.version + 1)
+        if detach_position is not None:
+            values["parent_page_id"] = case((Page.id == root_id, None), else_=Page.parent_page_id)
+            values["position"] = case((Page.id == root_id, detach_position), else_=Page.position)
+        stmt = (
+            update(Page)
+            .where(Page.id.in_(select(tree.c.id)))
+            .values(**values)
+            .returning(Page.id, Page.version)
+            .execution_options(synchronize_session=False)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.all())
+
+    async def list_trash(self, workspace_id: uuid.UUID, limit: int, after: tuple[datetime, uuid.UUID] | None = None) -> list[Row]:
+        """Roots of archived subtrees (pages whose parent was not archived with them), newest first,
+        keyset-paginated on (archived_at, id)."""
+        parent = aliased(Page)
+        stmt = (
+            select(Page.id, Page.title, Page.parent_page_id, Page.type, Page.archived_at)
+            .outerjoin(parent, parent.id == Page.parent_page_id)
+            .where(
+                Page.workspace_id == workspace_id,
+                Page.is_archived.is_(True),
+                or_(parent.id.is_(None), parent.archived_at.is_(None), parent.archived_at != Page.archived_at),
+            )
+            .order_by(Page.archived_at.desc(), Page.id.desc())
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Page.archived_at, Page.id) < tuple_(*after))
+        res = await self.session.execute(stmt)
+        return list(res.all())
+
+    async def purge_archived(self, cutoff: datetime, limit: int) -> int:
+        """Hard-delete up to ``limit`` pages archived before ``cutoff`` together with their content and
+        revisions. Only leaves are taken, so a subtree goes leaf-first over successive calls and the
+        SET NULL foreign key never turns a child (live or still in the trash) into a top-level page.
+        Returns the number of pages deleted."""
+        child = aliased(Page)
+        stmt = (
+            select(Page.id)
+            .where(
+                Page.is_archived.is_(True),
+                Page.archived_at < cutoff,
+                ~exists().where(child.parent_page_id == Page.id),
+            )
+            .order_by(Page.archived_at)
+            .limit(limit)
+        )
+        ids = list((await self.session.execute(stmt)).scalars())
+        if not ids:
+            return 0
+        # Explicit child deletes keep this independent of ON DELETE CASCADE being enforced (SQLite).
+        await self.session.execute(delete(PageRevision).where(PageRevision.page_id.in_(ids)))
+        await self.session.execute(delete(PageContent).where(PageContent.page_id.in_(ids)))
+        await self.session.execute(delete(Page).where(Page.id.in_(ids)).execution_options(synchronize_session=False))
+        return len(ids)
+
 
 class PageContentRepository:
     def __init__(self, session: AsyncSession):
@@ -24,5 +364,194 @@ class PageContentRepository:
         self.session.add(content)
 
     async def get_by_page(self, page_id: uuid.UUID) -> PageContent | None:
-        res = await self.session.execute(select(PageContent).where(PageContent.page_id == page_id))
+        # populate_existing: the row may have been changed by a Core UPDATE (apply_delta) in this session.
+        stmt = select(PageContent).where(PageContent.page_id == page_id).execution_options(populate_existing=True)
+        res = await self.session.execute(stmt)
         return res.scalar_one_or_none()
+
+    async def bulk_insert(self, rows: list[dict], batch_size: int) -> None:
+        for start in range(0, len(rows), batch_size):
+            await self.session.execute(insert(PageContent), rows[start:start + batch_size])
+
+    async def get_state(self, page_id: uuid.UUID) -> Row | None:
+        """(workspace_id, is_archived, version) for a page without touching the content column.
+
+        version is None when the page has no content row yet.
+        """
+        stmt = (
+            select(Page.workspace_id, Page.is_archived, PageContent.version)
+            .outerjoin(PageContent, PageContent.page_id == Page.id)
+            .where(Page.id == page_id)
+        )
+        res = await self.session.execute(stmt)
+        return res.one_or_none()
+
+    async def apply_delta(
+        self,
+        page_id: uuid.UUID,
+        updated_by: uuid.UUID,
+        ops: list[dict] | None = None,
+        upserts: dict[str, Any] | None = None,
+        deletes: list[str] | None = None,
+        expected_version: int | None = None,
+    ) -> tuple[int, int] | None:
+        """Apply an incremental edit to an inline document; returns (new version, size in bytes).
+
+        Returns None (nothing written) when the page has no content row, its document
+        lives in the blob store, its version is not ``expected_version`` or a JSON Patch op
+        depends on an earlier edit of the same patch; the caller tells these apart by
+        loading the row and applies the edit in Python.
+
+        On PostgreSQL the edit is a single UPDATE built from ``||``, ``-``, ``jsonb_set``,
+        ``jsonb_insert`` and ``#-`` so only the delta travels over the wire and the
+        document is never loaded into Python. JSON Patch ops first read the type (and array
+        length) of each target's container so bad paths are a ValidationError rather than a
+        database error; the UPDATE is then pinned to the version that was inspected.
+        """
+        if self.session.bind.dialect.name != "postgresql":
+            existing = await self.get_by_page(page_id)
+            if existing is None or existing.blob_ref is not None:
+                return None
+            if expected_version is not None and existing.version != expected_version:
+                return None
+            existing.content = delta.apply_delta(existing.content, ops, upserts, deletes)
+            existing.updated_by = updated_by
+            await self.session.flush()  # conditional UPDATE via the mapper's version counter
+            return existing.version, len(json.dumps(existing.content, separators=(",", ":"), ensure_ascii=False).encode())
+        def jsonb(value: Any):
+            return cast(bindparam(None, value, type_=JSONB), JSONB)
+
+        def path(tokens: list[str]):
+            return cast(array(tokens), ARRAY(Text))
+
+        doc = cast(PageContent.content, JSONB)
+        parsed = [(op, delta.parse_pointer(op["path"])) for op in ops or ()]
+        if parsed:
+            if delta.ops_interdependent(ops, upserts, deletes):
+                return None
+            shape_cols = []
+            for op, tokens in parsed:
+                if not tokens:
+                    if op["op"] == "remove":
+                        raise ValidationError("Cannot remove the document root")
+                    continue
+                node = doc.op("#>")(path(tokens[:-1])) if len(tokens) > 1 else doc
+                kind = func.jsonb_typeof(node)
+                shape_cols += [kind, case((kind == "array", func.jsonb_array_length(node)))]
+            stmt = select(PageContent.version, PageContent.blob_ref, *shape_cols).where(PageContent.page_id == page_id)
+            state = (await self.session.execute(stmt)).one_or_none()
+            if state is None or state.blob_ref is not None:
+                return None
+            if expected_version is not None and state.version != expected_version:
+                return None
+            expected_version = state.version
+            shapes = iter(zip(state[2::2], state[3::2]))
+
+        expr = doc
+        if upserts:
+            expr = expr.op("||")(jsonb(upserts))
+        if deletes:
+            expr = expr.op("-")(cast(array(deletes), ARRAY(Text)))
+        for op, tokens in parsed:
+            value = jsonb(op.get("value"))
+            if not tokens:
+                expr = value
+                continue
+            parent_type, size = next(shapes)
+            index = delta.check_target(op["op"], op["path"], parent_type, size)
+            target = tokens if index is None else tokens[:-1] + [str(index)]
+            if op["op"] == "remove":
+                expr = expr.op("#-")(path(target))
+            elif op["op"] == "add" and index is not None:
+                # Past-the-end indexes append.
+                expr = func.jsonb_insert(expr, path(target), value, False)
+            else:
+                expr = func.jsonb_set(expr, path(target), value, op["op"] == "add")
+        stmt = (
+            update(PageContent)
+            .where(PageContent.page_id == page_id, PageContent.blob_ref.is_(None))
+            .values(content=expr, updated_by=updated_by, version=PageContent.version + 1)
+            .returning(PageContent.version, func.octet_length(cast(PageContent.content, Text)))
+            .execution_options(synchronize_session=False)
+        )
+        if expected_version is not None:
+            stmt = stmt.where(PageContent.version == expected_version)
+        res = await self.session.execute(stmt)
+        row = res.one_or_none()
+        return tuple(row) if row is not None else None
+
+
+class PageRevisionRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add(self, revision: PageRevision) -> None:
+        self.session.add(revision)
+
+    async def latest(self, page_id: uuid.UUID) -> Row | None:
+        """(version, depth) of the newest revision."""
+        stmt = (
+            select(PageRevision.version, PageRevision.depth)
+            .where(PageRevision.page_id == page_id)
+            .order_by(PageRevision.version.desc())
+            .limit(1)
+        )
+        res = await self.session.execute(stmt)
+        return res.one_or_none()
+
+    async def chain(self, page_id: uuid.UUID, version: int) -> list[Row]:
+        """Rows needed to rebuild ``version``: the closest snapshot at or below it and the deltas after it."""
+        base = (
+            select(func.max(PageRevision.version))
+            .where(PageRevision.page_id == page_id, PageRevision.kind == "snapshot", PageRevision.version <= version)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(PageRevision.version, PageRevision.kind, PageRevision.data, PageRevision.blob_ref)
+            .where(PageRevision.page_id == page_id, PageRevision.version >= base, PageRevision.version <= version)
+            .order_by(PageRevision.version)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.all())
+
+    async def list_for_page(self, page_id: uuid.UUID, before: int | None, limit: int) -> list[Row]:
+        stmt = select(PageRevision.version, PageRevision.kind, PageRevision.created_at, PageRevision.created_by).where(PageRevision.page_id == page_id)
+        if before is not None:
+            stmt = stmt.where(PageRevision.version < before)
+        res = await self.session.execute(stmt.order_by(PageRevision.version.desc()).limit(limit))
+        return list(res.all())
+
+    async def pages_with_revisions_before(self, cutoff: datetime, limit: int) -> list[uuid.UUID]:
+        """Pages with an expired revision that is not their newest one (the newest is always kept)."""
+        newer = aliased(PageRevision)
+        stmt = (
+            select(PageRevision.page_id)
+            .where(
+                PageRevision.created_at < cutoff,
+                exists().where(newer.page_id == PageRevision.page_id, newer.version > PageRevision.version),
+            )
+            .distinct()
+            .limit(limit)
+        )
+        res = await self.session.execute(stmt)
+        return list(res.scalars())
+
+    async def first_kept(self, page_id: uuid.UUID, cutoff: datetime) -> PageRevision | None:
+        """Oldest revision inside the retention window, or the newest one if all are older."""
+        for stmt in (
+            select(PageRevision).where(PageRevision.page_id == page_id, PageRevision.created_at >= cutoff).order_by(PageRevision.version),
+            select(PageRevision).where(PageRevision.page_id == page_id).order_by(PageRevision.version.desc()),
+        ):
+            res = await self.session.execute(stmt.limit(1))
+            revision = res.scalar_one_or_none()
+            if revision is not None:
+                return revision
+        return None
+
+    async def delete_before(self, page_id: uuid.UUID, version: int) -> int:
+        res = await self.session.execute(delete(PageRevision).where(PageRevision.page_id == page_id, PageRevision.version < version))
+        return res.rowcount
+
+    async def blob_refs(self) -> set[str]:
+        res = await self.session.execute(select(PageRevision.blob_ref).where(PageRevision.blob_ref.is_not(None)).distinct())
+        return set(res.scalars())
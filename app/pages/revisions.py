@@ -0,0 +1,171 @@
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from app.core.config import settings
+from app.infrastructure.cache.memory import TTLCache
+from app.infrastructure.db.models import PageRevision
+from app.infrastructure.db.uow import SqlAlchemyUoW
+from app.pages import content_store, delta
+
+# Page revision history. Revisions are captured by a background recorder after the
+# write has committed, never on the request path. Each revision is either a full
+# snapshot or a block delta against the previous revision; a snapshot is forced every
+# REVISION_SNAPSHOT_INTERVAL revisions, which bounds reconstruction to that many - 1
+# delta applications.
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT = "snapshot"
+DELTA = "delta"
+
+
+def _size(doc: Any) -> int:
+    return len(json.dumps(doc, separators=(",", ":"), ensure_ascii=False, default=str))
+
+
+def diff_documents(old: Any, new: Any) -> dict | None:
+    """Block delta turning ``old`` into ``new`` (see delta.apply_block_delta), or None when the
+    documents are not block maps or the delta would not be smaller than a snapshot."""
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return None
+    changes = {
+        "blocks": {k: v for k, v in new.items() if k not in old or old[k] != v},
+        "deleted_blocks": [k for k in old if k not in new],
+    }
+    if _size(changes) * 2 > _size(new):
+        return None
+    return changes
+
+
+async def reconstruct(uow: SqlAlchemyUoW, page_id: uuid.UUID, version: int) -> Any | None:
+    rows = await uow.page_revisions.chain(page_id, version)
+    if not rows or rows[-1].version != version:
+        return None
+    doc = None
+    for row in rows:
+        if row.kind == SNAPSHOT:
+            doc = await content_store.load(row.data, row.blob_ref)
+        else:
+            doc = delta.apply_block_delta(doc, row.data.get("blocks"), row.data.get("deleted_blocks"))
+    return doc
+
+
+class RevisionRecorder:
+    """Captures the current content of pages queued by enqueue() in a background task.
+
+    Several saves of one page before the task runs produce a single revision.
+    """
+
+    def __init__(self, snapshot_interval: int = 20, enabled: bool = True, doc_cache_size: int = 256):
+        self.snapshot_interval = max(snapshot_interval, 1)
+        self.enabled = enabled
+        self._pending: dict[uuid.UUID, uuid.UUID] = {}
+        # page_id -> (version, document) of the newest recorded revision, to diff without rebuilding it.
+        self._docs = TTLCache(maxsize=doc_cache_size, ttl=600.0)
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self.snapshots = 0
+        self.deltas = 0
+        self.failures = 0
+
+    def enqueue(self, page_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        if not self.enabled:
+            return
+        self._pending[page_id] = user_id
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            # (Re)bind to the running loop; only differs when an embedding test client runs its own loop.
+            self._wakeup, self._lock = asyncio.Event(), asyncio.Lock()
+            self._task = loop.create_task(self._run())
+        self._wakeup.set()
+
+    async def drain(self) -> None:
+        async with self._lock:
+            batch, self._pending = self._pending, {}
+            for page_id, user_id in batch.items():
+                try:
+                    await self.record(page_id, user_id)
+                except Exception:
+                    self.failures += 1
+                    logger.exception("Failed to record a revision of page %s", page_id)
+
+    async def record(self, page_id: uuid.UUID, user_id: uuid.UUID) -> PageRevision | None:
+        async with SqlAlchemyUoW() as uow:
+            current = await uow.page_contents.get_by_page(page_id)
+            if current is None:
+                return None
+            latest = await uow.page_revisions.latest(page_id)
+            if latest is not None and latest.version >= current.version:
+                return None
+            doc = await content_store.load(current.content, current.blob_ref)
+            changes = None
+            if latest is not None and latest.depth + 1 < self.snapshot_interval:
+                cached = self._docs.get(page_id)
+                previous = cached[1] if cached and cached[0] == latest.version else await reconstruct(uow, page_id, latest.version)
+                changes = diff_documents(previous, doc)
+            if changes is None:
+                data, blob_ref = await content_store.store(doc)
+                revision = PageRevision(page_id=page_id, version=current.version, kind=SNAPSHOT, depth=0, data=data, blob_ref=blob_ref, created_by=user_id)
+                self.snapshots += 1
+            else:
+                revision = PageRevision(page_id=page_id, version=current.version, kind=DELTA, depth=latest.depth + 1, data=changes, created_by=user_id)
+                self.deltas += 1
+            await uow.page_revisions.add(revision)
+        self._docs.set(page_id, (current.version, doc))
+        return revision
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self.drain()
+
+    async def stop(self) -> None:
+        """Shutdown hook: stop the task and record whatever is still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.drain()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "snapshots": self.snapshots,
+            "deltas": self.deltas,
+            "failures": self.failures,
+        }
+
+
+async def compact_revisions(retention_days: int | None = None, batch_size: int = 500) -> int:
+    """Delete revisions older than the retention window. The oldest kept revision of each page is
+    rewritten as a snapshot first, so every remaining revision can still be rebuilt.
+    Returns the number of revisions deleted."""
+    days = settings.REVISION_RETENTION_DAYS if retention_days is None else retention_days
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    deleted = 0
+    while True:
+        async with SqlAlchemyUoW() as uow:
+            page_ids = await uow.page_revisions.pages_with_revisions_before(cutoff, batch_size)
+            removed = 0
+            for page_id in page_ids:
+                keep = await uow.page_revisions.first_kept(page_id, cutoff)
+                if keep.kind == DELTA:
+                    doc = await reconstruct(uow, page_id, keep.version)
+                    keep.data, keep.blob_ref = await content_store.store(doc)
+                    keep.kind, keep.depth = SNAPSHOT, 0
+                removed += await uow.page_revisions.delete_before(page_id, keep.version)
+        deleted += removed
+        if len(page_ids) < batch_size or not removed:
+            return deleted
+
+
+revision_recorder = RevisionRecorder(settings.REVISION_SNAPSHOT_INTERVAL, enabled=settings.REVISIONS_ENABLED)
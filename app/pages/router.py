@@ -1,6 +1,13 @@
 import uuid
-from fastapi import APIRouter, Depends
-from app.core.deps import get_uow, get_current_user_id
+import pydantic
+from typing import Literal
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.core.config import settings
+from app.core.deps import ensure_workspace_member, get_read_uow, get_uow, get_current_user_id
+from app.core.fastjson import json_list_response
+from app.core.etag import etag_matches, not_modified
+from app.core.errors import ValidationError
 from app.infrastructure.db.uow import SqlAlchemyUoW
 from . import schemas, services
 
@@ -10,24 +17,155 @@ router = APIRouter(prefix="/pages", tags=["pages_v2"])
 async def create(dto: schemas.PageCreateIn, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
     return await services.create_page(uow, user_id, dto)
 
-@router.get("/workspace/{workspace_id}", response_model=list[schemas.PageRead])
-async def list_pages(workspace_id: uuid.UUID, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
-    return await services.get_pages(uow, workspace_id, user_id)
+@router.get("/workspace/{workspace_id}", response_model=list[schemas.PageListItem], response_model_exclude_unset=True)
+async def list_pages(
+    workspace_id: uuid.UUID,
+    response: Response,
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1),
+    parent_page_id: uuid.UUID | None = None,
+    type: str | None = None,
+    fields: str | None = Query(default=None, description="Comma separated subset of id,title,parent_page_id,type"),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    uow: SqlAlchemyUoW = Depends(get_read_uow),
+    if_none_match: str | None = Header(default=None),
+):
+    etag, items, next_cursor = await services.get_pages(uow, workspace_id, user_id, cursor, limit, parent_page_id, type, fields, if_none_match)
+    if items is None:
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if settings.FAST_JSON_LISTS:
+        # items hold exactly the requested columns, which is what exclude_unset would emit.
+        return json_list_response(items, headers=dict(response.headers))
+    return items
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson")
+
+def _parse_import_line(line: bytes, line_no: int) -> schemas.PageImportItem:
+    try:
+        return schemas.PageImportItem.model_validate_json(line)
+    except pydantic.ValidationError as e:
+        raise ValidationError(f"Invalid page on line {line_no}: {e.errors()[0]['msg']}")
+
+async def _read_import_items(request: Request) -> list[schemas.PageImportItem]:
+    if request.headers.get("content-type", "").split(";")[0].strip() not in NDJSON_TYPES:
+        try:
+            return schemas.PageImportIn.model_validate_json(await request.body()).pages
+        except pydantic.ValidationError as e:
+            raise ValidationError(f"Invalid import payload: {e.errors()[0]['msg']}")
+    items, buffer, line_no = [], b"", 0
+    async for chunk in request.stream():
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                items.append(_parse_import_line(line, line_no))
+    if buffer.strip():
+        items.append(_parse_import_line(buffer, line_no + 1))
+    return items
+
+@router.post("/workspace/{workspace_id}/import", response_model=schemas.PageImportResult)
+async def import_pages(workspace_id: uuid.UUID, request: Request, user_id: uuid.UUID = Depends(ensure_workspace_member), uow: SqlAlchemyUoW = Depends(get_uow)):
+    """Bulk import a page tree as JSON ({"pages": [...]}) or NDJSON (one page per line).
+    Parents are referenced by client-side ``temp_id`` (or ``parent_page_id`` for existing pages).
+    Membership is checked by the dependency, before the body is read."""
+    items = await _read_import_items(request)
+    return await services.import_pages(uow, workspace_id, user_id, items)
+
+@router.get("/workspace/{workspace_id}/export")
+async def export_workspace(workspace_id: uuid.UUID, format: Literal["ndjson", "zip"] = "ndjson", user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_read_uow)):
+    chunks = await services.export_workspace(uow, workspace_id, user_id, format)
+    media_type = "application/zip" if format == "zip" else "application/x-ndjson"
+    filename = f"workspace-{workspace_id}.{'zip' if format == 'zip' else 'ndjson'}"
+    return StreamingResponse(chunks, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+@router.get("/workspace/{workspace_id}/trash", response_model=list[schemas.PageTrashItem])
+async def list_trash(workspace_id: uuid.UUID, response: Response, cursor: str | None = None, limit: int | None = Query(default=None, ge=1), user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_read_uow)):
+    rows, next_cursor = await services.list_trash(uow, workspace_id, user_id, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
+
+@router.get("/workspace/{workspace_id}/children", response_model=list[schemas.PageChildRead])
+async def list_children(workspace_id: uuid.UUID, parent_page_id: uuid.UUID | None = None, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_read_uow)):
+    return await services.get_children(uow, workspace_id, parent_page_id, user_id)
+
+@router.get("/{page_id}/tree", response_model=schemas.PageTreeNode)
+async def get_tree(page_id: uuid.UUID, depth: int = Query(default=2, ge=0, le=32), user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_read_uow)):
+    return await services.get_subtree(uow, page_id, user_id, depth)
+
+@router.get("/{page_id}/ancestors", response_model=list[schemas.PageRead])
+async def get_ancestors(page_id: uuid.UUID, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_read_uow)):
+    return await services.get_ancestors(uow, page_id, user_id)
+
+@router.get("/{page_id}/content", response_model=schemas.PageContentRead)
+async def get_content(page_id: uuid.UUID, response: Response, if_none_match: str | None = Header(default=None), user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_read_uow)):
+    etag, content = await services.get_page_content(uow, page_id, user_id, if_none_match)
+    if content is None:
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return content
+
+@router.get("/{page_id}/revisions", response_model=list[schemas.PageRevisionRead])
+async def list_revisions(page_id: uuid.UUID, response: Response, cursor: str | None = None, limit: int | None = Query(default=None, ge=1), user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_read_uow)):
+    rows, next_cursor = await services.list_revisions(uow, page_id, user_id, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
+
+@router.get("/{page_id}/revisions/{version}", response_model=schemas.PageContentRead)
+async def get_revision(page_id: uuid.UUID, version: int, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_read_uow)):
+    return await services.get_revision(uow, page_id, version, user_id)
+
+@router.post("/{page_id}/revisions/{version}/restore", response_model=schemas.PageContentWriteResult)
+async def restore_revision(page_id: uuid.UUID, version: int, response: Response, if_match: str | None = Header(default=None), user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
+    new_version = await services.restore_revision(uow, page_id, version, user_id, if_match)
+    response.headers["ETag"] = services.content_etag(page_id, new_version)
+    return schemas.PageContentWriteResult(version=new_version)
 
 @router.get("/{page_id}", response_model=schemas.PageRead)
-async def get_page(page_id: uuid.UUID, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
-    return await services.get_page(uow, page_id, user_id)
+async def get_page(page_id: uuid.UUID, response: Response, if_none_match: str | None = Header(default=None), user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_read_uow)):
+    page = await services.get_page(uow, page_id, user_id)
+    etag = services.page_etag(page)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return page
 
 @router.put("/{page_id}", response_model=schemas.PageRead)
-async def update_page(page_id: uuid.UUID, dto: schemas.PageUpdateIn, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
-    return await services.update_page(uow, page_id, user_id, dto)
+async def update_page(page_id: uuid.UUID, dto: schemas.PageUpdateIn, response: Response, if_match: str | None = Header(default=None), user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
+    """Optimistic concurrency: send the page ETag as If-Match (or ``expected_version``); 409 on conflict."""
+    page = await services.update_page(uow, page_id, user_id, dto, if_match)
+    response.headers["ETag"] = services.page_etag(page)
+    return page
+
+@router.post("/{page_id}/move", response_model=schemas.PageRead)
+async def move_page(page_id: uuid.UUID, dto: schemas.PageMoveIn, response: Response, if_match: str | None = Header(default=None), user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
+    """Reparent and/or reorder: place the page between ``after_id`` and ``before_id`` under ``parent_page_id``.
+    Writes only this page's row; accepts If-Match / ``expected_version`` like PUT."""
+    page = await services.move_page(uow, page_id, user_id, dto, if_match)
+    response.headers["ETag"] = services.page_etag(page)
+    return page
 
-@router.patch("/{page_id}/content")
-async def patch_content(page_id: uuid.UUID, dto: schemas.PageContentPatch, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
-    await services.patch_page_content(uow, page_id, user_id, dto)
-    return {"status": "updated"}
+@router.patch("/{page_id}/content", response_model=schemas.PageContentWriteResult)
+async def patch_content(page_id: uuid.UUID, dto: schemas.PageContentPatch, response: Response, if_match: str | None = Header(default=None), user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
+    """Optimistic concurrency: send the content ETag as If-Match (or ``expected_version``); 409 on conflict."""
+    version = await services.patch_page_content(uow, page_id, user_id, dto, if_match)
+    if version is None:
+        response.status_code = 202
+        return schemas.PageContentWriteResult(status="queued")
+    response.headers["ETag"] = services.content_etag(page_id, version)
+    return schemas.PageContentWriteResult(version=version)
 
 @router.delete("/{page_id}")
 async def archive(page_id: uuid.UUID, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
-    await services.archive_page(uow, page_id, user_id)
-    return {"status": "archived"}
+    """Moves the page and its subtree to the trash (``GET /pages/workspace/{id}/trash``)."""
+    count = await services.archive_page(uow, page_id, user_id)
+    return {"status": "archived", "archived": count}
+
+@router.post("/{page_id}/restore")
+async def restore(page_id: uuid.UUID, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
+    count = await services.restore_page(uow, page_id, user_id)
+    return {"status": "restored", "restored": count}
@@ -1,6 +1,7 @@
 import uuid
-from typing import Any
-from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Literal
+from pydantic import BaseModel, Field
 
 class PageCreateIn(BaseModel):
     workspace_id: uuid.UUID
@@ -14,12 +15,108 @@ class PageRead(BaseModel):
     title: str
     parent_page_id: uuid.UUID | None = None
     type: str = "page"
+    # Set on single-page reads/writes; send it back as expected_version (or the ETag as If-Match).
+    version: int | None = None
     class Config:
         from_attributes = True
 
+class PageRow(PageRead):
+    # Cached page row: PageRead plus what authorization needs.
+    workspace_id: uuid.UUID
+    is_archived: bool = False
+
+PAGE_LIST_FIELDS = ("id", "title", "parent_page_id", "type")
+
+class PageListItem(BaseModel):
+    # Sparse variant of PageRead: only the requested fields are set (and serialized).
+    id: uuid.UUID
+    title: str | None = None
+    parent_page_id: uuid.UUID | None = None
+    type: str | None = None
+
 class PageUpdateIn(PageCreateIn):
     workspace_id: uuid.UUID
+    expected_version: int | None = None
+
+class PageContentRead(BaseModel):
+    page_id: uuid.UUID
+    version: int
+    content: Any
+    meta: dict = {}
+
+class JsonPatchOp(BaseModel):
+    op: Literal["add", "replace", "remove"]
+    path: str
+    value: Any | None = None
 
 class PageContentPatch(BaseModel):
     title: str | None = None
+    # Full document replacement...
+    content: Any | None = None
+    # ...or an incremental edit: block id keyed upserts/deletes and/or JSON Patch ops.
+    blocks: dict[str, Any] | None = None
+    deleted_blocks: list[str] | None = None
+    ops: list[JsonPatchOp] | None = Field(default=None, max_length=1000)
+    # Content version the edit was based on; a mismatch is answered with 409.
+    expected_version: int | None = None
+
+    @property
+    def is_delta(self) -> bool:
+        return bool(self.blocks or self.deleted_blocks or self.ops)
+
+class PageContentWriteResult(BaseModel):
+    status: Literal["updated", "queued"] = "updated"
+    # None when the patch was queued by the autosave buffer.
+    version: int | None = None
+
+class PageRevisionRead(BaseModel):
+    version: int
+    kind: Literal["snapshot", "delta"]
+    created_at: datetime | None = None
+    created_by: uuid.UUID
+    class Config:
+        from_attributes = True
+
+class PageTrashItem(BaseModel):
+    # Root of an archived subtree; restoring it brings back the pages archived with it.
+    id: uuid.UUID
+    title: str
+    parent_page_id: uuid.UUID | None = None
+    type: str = "page"
+    archived_at: datetime | None = None
+    class Config:
+        from_attributes = True
+
+class PageMoveIn(BaseModel):
+    # Target parent (None: workspace top level) and neighbours there; neither means "append".
+    parent_page_id: uuid.UUID | None = None
+    after_id: uuid.UUID | None = None
+    before_id: uuid.UUID | None = None
+    expected_version: int | None = None
+
+class PageChildRead(PageRead):
+    # Sibling order key; rows already come sorted by it.
+    position: str | None = None
+    has_children: bool = False
+
+class PageTreeNode(PageChildRead):
+    depth: int = 0
+    children: list["PageTreeNode"] = []
+
+class PageImportItem(BaseModel):
+    temp_id: str
+    parent_temp_id: str | None = None
+    parent_page_id: uuid.UUID | None = None
+    title: str
+    type: str = "page"
+    icon: str | None = None
     content: Any | None = None
+
+class PageImportIn(BaseModel):
+    pages: list[PageImportItem]
+
+class PageImportResult(BaseModel):
+    created: int
+    id_map: dict[str, uuid.UUID]
+    elapsed_ms: float
+    pages_per_second: float
@@ -1,10 +1,59 @@
+import time
 import uuid
-from sqlalchemy import select
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+from sqlalchemy.orm.exc import StaleDataError
 from app.infrastructure.db.uow import SqlAlchemyUoW
 from app.infrastructure.db.models import Page, PageContent
-from app.core.errors import NotFoundError, PermissionDenied
+from app.core.errors import ConflictError, NotFoundError, PermissionDenied, ValidationError
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.etag import etag_matches, if_match_satisfied, make_etag
 from app.core.deps import ensure_workspace_member
-from . import schemas
+from app.core.config import settings
+from app.realtime.events import publish_page_event, publish_workspace_event
+from . import content_store, delta, export, ordering, schemas
+from .autosave import AutosaveBuffer, PendingSave
+from .cache import page_cache
+from .revisions import reconstruct, revision_recorder
+
+async def write_content(
+    uow: SqlAlchemyUoW,
+    page: Page,
+    user_id: uuid.UUID,
+    doc,
+    existing: PageContent | None = None,
+    is_new: bool = False,
+) -> PageContent:
+    """Full-document write: inline or as a blob depending on size. The mapper bumps the version."""
+    content, blob_ref = await content_store.store(doc)
+    if existing is None and not is_new:
+        existing = await uow.page_contents.get_by_page(page.id)
+    if existing is None:
+        existing = PageContent(id=uuid.uuid4(), page=page, content=content, blob_ref=blob_ref, meta={}, updated_by=user_id)
+        await uow.page_contents.upsert(existing)
+        return existing
+    existing.content = content
+    existing.blob_ref = blob_ref
+    existing.updated_by = user_id
+    return existing
+
+CONFLICT_MESSAGE = "Page was modified by someone else"
+
+def check_version(current: int, expected_version: int | None = None, etag: str | None = None, if_match: str | None = None) -> None:
+    """Raises ConflictError unless the client's expected version / If-Match matches ``current``."""
+    if (expected_version is not None and expected_version != current) or (etag and not if_match_satisfied(if_match, etag)):
+        raise ConflictError(CONFLICT_MESSAGE, current_version=current)
+
+@asynccontextmanager
+async def versioned_write(uow: SqlAlchemyUoW, current_version: Callable[[], Awaitable[int | None]]):
+    """ORM updates of versioned rows are ``UPDATE ... WHERE version = :loaded``; when another
+    writer got there first the flush matches no row and the request gets a 409."""
+    try:
+        yield
+    except StaleDataError:
+        await uow.rollback()
+        raise ConflictError(CONFLICT_MESSAGE, current_version=await current_version())
 
 async def create_page(uow: SqlAlchemyUoW, user_id: uuid.UUID, data: schemas.PageCreateIn) -> Page:
     await ensure_workspace_member(data.workspace_id, user_id, uow)
@@ -13,6 +62,7 @@ async def create_page(uow: SqlAlchemyUoW, user_id: uuid.UUID, data: schemas.Page
         id=uuid.uuid4(),
         workspace_id=data.workspace_id,
         parent_page_id=data.parent_page_id,
+        position=ordering.key_between(await uow.pages.last_position(data.workspace_id, data.parent_page_id), None),
         title=data.title,
         type=data.type,  
         created_by=user_id,
@@ -20,68 +70,473 @@ async def create_page(uow: SqlAlchemyUoW, user_id: uuid.UUID, data: schemas.Page
     )
     await uow.pages.add(page)
     if data.content is not None:
-        content = PageContent(id=uuid.uuid4(), page=page, content=data.content, meta={}, updated_by=user_id)
-        await uow.page_contents.upsert(content)
+        await write_content(uow, page, user_id, data.content, is_new=True)
     await uow.commit()
+    await page_cache.invalidate(page.workspace_id)
+    await publish_page_event("page.created", page.workspace_id, page.id, **_event_fields(page))
+    if data.content is not None:
+        revision_recorder.enqueue(page.id, user_id)
     return page
 
-async def get_pages(uow: SqlAlchemyUoW, workspace_id: uuid.UUID, user_id: uuid.UUID) -> list[Page]:
+def _event_fields(page: Page) -> dict:
+    return {"title": page.title, "parent_page_id": page.parent_page_id, "type": page.type, "version": page.version}
+
+def parse_fields(fields: str | None) -> list[str]:
+    if not fields:
+        return list(schemas.PAGE_LIST_FIELDS)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = set(requested) - set(schemas.PAGE_LIST_FIELDS)
+    if unknown:
+        raise ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return ["id", *[f for f in requested if f != "id"]]
+
+async def get_pages(
+    uow: SqlAlchemyUoW,
+    workspace_id: uuid.UUID,
+    user_id: uuid.UUID,
+    cursor: str | None = None,
+    limit: int | None = None,
+    parent_page_id: uuid.UUID | None = None,
+    type: str | None = None,
+    fields: str | None = None,
+    if_none_match: str | None = None,
+) -> tuple[str, list[dict] | None, str | None]:
+    """Returns (etag, items, next_cursor). items is None when ``if_none_match`` already matches."""
     await ensure_workspace_member(workspace_id, user_id, uow)
-    res = await uow.session.execute(select(Page).where(Page.workspace_id == workspace_id, Page.is_archived == False))  # type: ignore
-    pages = list(res.scalars().all())
-    if pages:
-        print('[get_pages]', [(p.title, p.type, p.parent_page_id) for p in pages])
-    return pages
+    columns = parse_fields(fields)
+    limit = min(limit or settings.PAGE_LIST_DEFAULT_LIMIT, settings.PAGE_LIST_MAX_LIMIT)
+    query = f"{cursor}|{limit}|{parent_page_id}|{type}|{','.join(columns)}"
+    key = await page_cache.listing_key(workspace_id, query)
+    cached = await page_cache.get(key)
+    if cached is not None:
+        etag, items, next_cursor = cached
+    else:
+        count, last_updated = await uow.pages.listing_fingerprint(workspace_id)
+        etag = make_etag("pages", workspace_id, count, last_updated, query, weak=True)
+        if etag_matches(if_none_match, etag):
+            return etag, None, None
+        after = decode_cursor(cursor, datetime.fromisoformat, uuid.UUID) if cursor else None
+        rows = await uow.pages.list_for_workspace(workspace_id, columns, limit, parent_page_id=parent_page_id, type=type, after=after)
+        next_cursor = encode_cursor(rows[-1].updated_at, rows[-1].id) if len(rows) == limit else None
+        items = [{c: row._mapping[c] for c in columns} for row in rows]
+        if not uow.on_replica:
+            await page_cache.set(key, [etag, items, next_cursor])
+    if etag_matches(if_none_match, etag):
+        return etag, None, next_cursor
+    return etag, items, next_cursor
 
-async def get_page(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID) -> Page:
-    page = await uow.pages.get(page_id)
+def page_etag(page: Page | schemas.PageRow) -> str:
+    return make_etag("page", page.id, page.version)
+
+def content_etag(page_id: uuid.UUID, version: int) -> str:
+    return make_etag("content", page_id, version)
+
+async def _content_version(uow: SqlAlchemyUoW, page_id: uuid.UUID) -> int:
+    state = await uow.page_contents.get_state(page_id)
+    return (state.version if state else None) or 0
+
+async def get_page_content(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID, if_none_match: str | None = None) -> tuple[str, schemas.PageContentRead | None]:
+    """Returns (etag, content). content is None when ``if_none_match`` already matches,
+    in which case the JSON document is never read."""
+    await _settle_autosave(page_id)  # read-your-writes for buffered autosaves
+    state = await uow.page_contents.get_state(page_id)
+    if state is None or state.is_archived:
+        raise NotFoundError("Page not found")
+    await ensure_workspace_member(state.workspace_id, user_id, uow)
+    version = state.version or 0
+    etag = content_etag(page_id, version)
+    if etag_matches(if_none_match, etag):
+        return etag, None
+    existing = await uow.page_contents.get_by_page(page_id) if version else None
+    if existing is None:
+        return etag, schemas.PageContentRead(page_id=page_id, version=0, content={})
+    content = await content_store.load(existing.content, existing.blob_ref)
+    return etag, schemas.PageContentRead(page_id=page_id, version=existing.version, content=content, meta=existing.meta)
+
+async def get_page(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID) -> Page | schemas.PageRow:
+    key = await page_cache.row_key(page_id)
+    cached = await page_cache.get(key)
+    if cached is not None:
+        page = schemas.PageRow.model_validate(cached)
+    else:
+        page = await uow.pages.get(page_id)
+        if page and not page.is_archived and not uow.on_replica:
+            await page_cache.set(key, schemas.PageRow.model_validate(page).model_dump(mode="json"))
     if not page or page.is_archived:
         raise NotFoundError("Page not found")
     await ensure_workspace_member(page.workspace_id, user_id, uow)
     return page
 
-async def update_page(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID, data: schemas.PageUpdateIn) -> Page:
+async def _settle_autosave(page_id: uuid.UUID) -> None:
+    # Direct writes go after the page's buffered autosaves, never under them. Called before the
+    # page is loaded, since the flush bumps its version in another unit of work.
+    if autosave_buffer.is_pending(page_id):
+        await autosave_buffer.flush_page(page_id)
+
+async def update_page(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID, data: schemas.PageUpdateIn, if_match: str | None = None) -> Page:
+    await _settle_autosave(page_id)
     page = await uow.pages.get(page_id)
     if not page:
         raise NotFoundError("Page not found")
     if page.workspace_id != data.workspace_id:
         raise PermissionDenied("Cannot move page across workspaces")
     await ensure_workspace_member(page.workspace_id, user_id, uow)
-    page.title = data.title
-    page.parent_page_id = data.parent_page_id
+    check_version(page.version, data.expected_version, page_etag(page), if_match)
+    await _check_parent(uow, page, data.parent_page_id)
+    async with versioned_write(uow, lambda: uow.pages.get_version(page_id)):
+        page.title = data.title
+        if data.parent_page_id != page.parent_page_id:
+            page.position = ordering.key_between(await uow.pages.last_position(page.workspace_id, data.parent_page_id), None)
+        page.parent_page_id = data.parent_page_id
+        page.updated_by = user_id
+        written = await write_content(uow, page, user_id, data.content) if data.content is not None else None
+        await uow.commit()
+    await page_cache.invalidate(page.workspace_id, page.id)
+    await publish_page_event("page.updated", page.workspace_id, page.id, **_event_fields(page))
+    if written is not None:
+        await publish_page_event("content.updated", page.workspace_id, page.id, version=written.version)
+        revision_recorder.enqueue(page.id, user_id)
+    return page
+
+async def apply_content_patch(
+    uow: SqlAlchemyUoW,
+    page: Page,
+    user_id: uuid.UUID,
+    data: schemas.PageContentPatch,
+    expected: int | None = None,
+) -> int | None:
+    """Apply one patch (title + full content or delta) and flush. Returns the new content
+    version, or None when the patch did not touch the content."""
+    if data.title is not None:
+        page.title = data.title
     page.updated_by = user_id
-    if data.content is not None:
+    if data.is_delta:
+        ops = [op.model_dump() for op in data.ops] if data.ops else None
+        result = await uow.page_contents.apply_delta(page.id, user_id, ops, data.blocks, data.deleted_blocks, expected)
+        if result is not None and not content_store.should_externalize(result[1]):
+            await uow.session.flush()
+            return result[0]
+        # No row yet, blob-backed, stale, or grown past the blob threshold: apply in Python and rewrite.
         existing = await uow.page_contents.get_by_page(page.id)
-        if existing:
-            existing.content = data.content
-            existing.updated_by = user_id
-        else:
-            await uow.page_contents.upsert(PageContent(id=uuid.uuid4(), page=page, content=data.content, meta={}, updated_by=user_id))
-    await uow.commit()
-    return page
+        if result is None and expected is not None:
+            check_version(existing.version if existing else 0, expected)
+        base = await content_store.load(existing.content, existing.blob_ref) if existing else {}
+        doc = base if result is not None else delta.apply_delta(base, ops, data.blocks, data.deleted_blocks)
+    elif data.content is not None:
+        existing = await uow.page_contents.get_by_page(page.id)
+        if expected is not None:
+            check_version(existing.version if existing else 0, expected)
+        doc = data.content
+    else:
+        await uow.session.flush()
+        return None
+    written = await write_content(uow, page, user_id, doc, existing=existing)
+    await uow.session.flush()
+    return written.version
+
+async def patch_page_content(
+    uow: SqlAlchemyUoW,
+    page_id: uuid.UUID,
+    user_id: uuid.UUID,
+    data: schemas.PageContentPatch,
+    if_match: str | None = None,
+) -> int | None:
+    """Returns the new content version. Conflicts are checked against the content version.
 
-async def patch_page_content(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID, data: schemas.PageContentPatch) -> None:
+    With the autosave buffer enabled, unconditional patches are queued and None is returned;
+    their JSON Patch ops are checked before queueing, so a bad patch still gets a 422.
+    """
+    if data.is_delta and data.content is not None:
+        raise ValidationError("Send either content or a delta (blocks/deleted_blocks/ops), not both")
+    if autosave_buffer.enabled and data.expected_version is None and not if_match:
+        page = await get_page(uow, page_id, user_id)
+
+        async def stored_document():
+            existing = await uow.page_contents.get_by_page(page.id)
+            return await content_store.load(existing.content, existing.blob_ref) if existing else {}
+
+        await autosave_buffer.submit(page.workspace_id, page.id, user_id, data, stored_document)
+        return None
+    await _settle_autosave(page_id)
     page = await uow.pages.get(page_id)
     if not page:
         raise NotFoundError("Page not found")
     await ensure_workspace_member(page.workspace_id, user_id, uow)
-    if data.title is not None:
-        page.title = data.title
-    if data.content is not None:
-        existing = await uow.page_contents.get_by_page(page.id)
-        if existing:
-            existing.content = data.content
-            existing.updated_by = user_id
-        else:
-            await uow.page_contents.upsert(PageContent(id=uuid.uuid4(), page=page, content=data.content, meta={}, updated_by=user_id))
-    page.updated_by = user_id
+    expected = data.expected_version
+    if if_match:
+        current = await _content_version(uow, page.id)
+        check_version(current, expected, content_etag(page.id, current), if_match)
+        expected = current
+    page_version = page.version
+    async with versioned_write(uow, lambda: _content_version(uow, page_id)):
+        version = await apply_content_patch(uow, page, user_id, data, expected)
+        await uow.commit()
+    if page.version != page_version:
+        # Content-only saves by the same editor leave the page row (and therefore listings) untouched.
+        await page_cache.invalidate(page.workspace_id, page.id)
+        await publish_page_event("page.updated", page.workspace_id, page.id, **_event_fields(page))
+    if data.is_delta:
+        ops = [op.model_dump() for op in data.ops] if data.ops else None
+        await publish_page_event(
+            "content.delta", page.workspace_id, page.id,
+            version=version, blocks=data.blocks, deleted_blocks=data.deleted_blocks, ops=ops,
+        )
+    elif data.content is not None:
+        await publish_page_event("content.updated", page.workspace_id, page.id, version=version)
+    if version is not None:
+        revision_recorder.enqueue(page.id, user_id)
+    return version if version is not None else await _content_version(uow, page.id)
+
+async def flush_autosaves(batch: dict[uuid.UUID, PendingSave]) -> None:
+    """Autosave buffer writer: every pending page in one transaction, last writer wins."""
+    written = []
+    async with SqlAlchemyUoW() as uow:
+        for page_id, entry in batch.items():
+            page = await uow.pages.get(page_id)
+            if page is None:
+                continue  # purged
+            # Archived pages are still written: a descendant archived with its parent keeps its
+            # acknowledged edits for when it is restored.
+            page_version, content_version = page.version, None
+            steps = entry.steps or [schemas.PageContentPatch()]
+            for i, step in enumerate(steps):
+                title = entry.title if i == 0 else None
+                content_version = await apply_content_patch(uow, page, entry.user_id, step.model_copy(update={"title": title})) or content_version
+            written.append((page, entry.user_id, page.version != page_version, content_version))
+    for page, user_id, page_changed, content_version in written:
+        if page_changed:
+            await page_cache.invalidate(page.workspace_id, page.id)
+            await publish_page_event("page.updated", page.workspace_id, page.id, **_event_fields(page))
+        if content_version is not None:
+            await publish_page_event("content.updated", page.workspace_id, page.id, version=content_version)
+            revision_recorder.enqueue(page.id, user_id)
+
+autosave_buffer = AutosaveBuffer(
+    flush_autosaves,
+    enabled=settings.AUTOSAVE_BUFFER_ENABLED,
+    interval=settings.AUTOSAVE_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.AUTOSAVE_MAX_PENDING_PAGES,
+)
+
+async def list_revisions(
+    uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID, cursor: str | None = None, limit: int | None = None,
+) -> tuple[list, str | None]:
+    """Newest first. Returns (rows, next_cursor)."""
+    page = await get_page(uow, page_id, user_id)
+    limit = min(limit or settings.PAGE_LIST_DEFAULT_LIMIT, settings.PAGE_LIST_MAX_LIMIT)
+    before = decode_cursor(cursor, int)[0] if cursor else None
+    rows = await uow.page_revisions.list_for_page(page.id, before, limit)
+    next_cursor = encode_cursor(rows[-1].version) if len(rows) == limit else None
+    return rows, next_cursor
+
+async def get_revision(uow: SqlAlchemyUoW, page_id: uuid.UUID, version: int, user_id: uuid.UUID) -> schemas.PageContentRead:
+    page = await get_page(uow, page_id, user_id)
+    doc = await reconstruct(uow, page.id, version)
+    if doc is None:
+        raise NotFoundError("Revision not found")
+    return schemas.PageContentRead(page_id=page.id, version=version, content=doc)
+
+async def restore_revision(uow: SqlAlchemyUoW, page_id: uuid.UUID, version: int, user_id: uuid.UUID, if_match: str | None = None) -> int:
+    """Writes the revision's document as a new content version (history is never rewritten)."""
+    await _settle_autosave(page_id)
+    revision = await get_revision(uow, page_id, version, user_id)
+    patch = schemas.PageContentPatch(content=revision.content, expected_version=await _content_version(uow, page_id))
+    return await patch_page_content(uow, page_id, user_id, patch, if_match)
+
+async def archive_page(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID) -> int:
+    """Archives the page and its whole subtree in one UPDATE. Returns how many pages were archived."""
+    await _settle_autosave(page_id)
+    page = await uow.pages.get(page_id)
+    if not page:
+        raise NotFoundError("Page not found")
+    await ensure_workspace_member(page.workspace_id, user_id, uow)
+    if page.is_archived:
+        return 0
+    rows = await uow.pages.archive_subtree(page.workspace_id, page.id, user_id, datetime.now(timezone.utc))
     await uow.commit()
+    await page_cache.invalidate_pages(page.workspace_id, [row.id for row in rows])
+    version = next((row.version for row in rows if row.id == page.id), None)
+    await publish_page_event("page.archived", page.workspace_id, page.id, version=version, count=len(rows))
+    return len(rows)
 
-async def archive_page(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID) -> None:
+async def restore_page(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID) -> int:
+    """Restores the page and the descendants archived together with it. A page whose parent is
+    still archived (or gone) comes back at the workspace top level. Returns how many pages were restored."""
     page = await uow.pages.get(page_id)
     if not page:
         raise NotFoundError("Page not found")
     await ensure_workspace_member(page.workspace_id, user_id, uow)
-    page.is_archived = True
-    page.updated_by = user_id
+    if not page.is_archived:
+        return 0
+    parent = await uow.pages.get(page.parent_page_id) if page.parent_page_id else None
+    detach = page.parent_page_id is not None and (parent is None or parent.is_archived)
+    position = ordering.key_between(await uow.pages.last_position(page.workspace_id, None), None) if detach else None
+    rows = await uow.pages.restore_subtree(page.workspace_id, page.id, user_id, page.archived_at, position)
     await uow.commit()
+    await page_cache.invalidate_pages(page.workspace_id, [row.id for row in rows])
+    version = next((row.version for row in rows if row.id == page.id), None)
+    parent_page_id = None if detach else page.parent_page_id
+    await publish_page_event("page.restored", page.workspace_id, page.id, version=version, parent_page_id=parent_page_id, count=len(rows))
+    return len(rows)
+
+async def _check_parent(uow: SqlAlchemyUoW, page: Page, parent_id: uuid.UUID | None) -> None:
+    """A new parent must be a live page of the same workspace outside the page's own subtree."""
+    if parent_id is None or parent_id == page.parent_page_id:
+        return
+    parent = await uow.pages.get(parent_id)
+    if parent is None or parent.is_archived or parent.workspace_id != page.workspace_id:
+        raise ValidationError("Unknown parent page")
+    ancestors = await uow.pages.ancestors(parent.id, settings.PAGE_TREE_MAX_DEPTH)
+    if parent.id == page.id or any(row.id == page.id for row in ancestors):
+        raise ValidationError("Cannot move a page into its own subtree")
+
+async def _sibling_position(uow: SqlAlchemyUoW, page: Page, parent_page_id: uuid.UUID | None, sibling_id: uuid.UUID | None) -> str | None:
+    if sibling_id is None:
+        return None
+    sibling = await uow.pages.get(sibling_id)
+    if sibling is None or sibling.id == page.id or sibling.workspace_id != page.workspace_id or sibling.parent_page_id != parent_page_id:
+        raise ValidationError(f"Page {sibling_id} is not a sibling under the target parent")
+    return sibling.position
+
+async def move_page(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID, data: schemas.PageMoveIn, if_match: str | None = None) -> Page:
+    """Moves/reorders a page: only its own row is written (parent and a new position key
+    between the requested neighbours; appended when none is given)."""
+    page = await uow.pages.get(page_id)
+    if not page or page.is_archived:
+        raise NotFoundError("Page not found")
+    await ensure_workspace_member(page.workspace_id, user_id, uow)
+    check_version(page.version, data.expected_version, page_etag(page), if_match)
+    parent_id = data.parent_page_id
+    await _check_parent(uow, page, parent_id)
+    after = await _sibling_position(uow, page, parent_id, data.after_id)
+    before = await _sibling_position(uow, page, parent_id, data.before_id)
+    if data.after_id is not None and data.before_id is None:
+        before = await uow.pages.neighbor_position(page.workspace_id, parent_id, after, True, page.id)
+    elif data.before_id is not None and data.after_id is None:
+        after = await uow.pages.neighbor_position(page.workspace_id, parent_id, before, False, page.id)
+    elif data.after_id is None:
+        after = await uow.pages.last_position(page.workspace_id, parent_id)
+    try:
+        position = ordering.key_between(after, before)
+    except ValueError:
+        raise ValidationError("after_id must come before before_id")
+    async with versioned_write(uow, lambda: uow.pages.get_version(page_id)):
+        page.parent_page_id = parent_id
+        page.position = position
+        page.updated_by = user_id
+        await uow.commit()
+    await page_cache.invalidate(page.workspace_id, page.id)
+    await publish_page_event("page.moved", page.workspace_id, page.id, parent_page_id=parent_id, position=position, version=page.version)
+    return page
+
+async def list_trash(
+    uow: SqlAlchemyUoW, workspace_id: uuid.UUID, user_id: uuid.UUID, cursor: str | None = None, limit: int | None = None,
+) -> tuple[list, str | None]:
+    """Archived subtree roots, most recently archived first. Returns (rows, next_cursor)."""
+    await ensure_workspace_member(workspace_id, user_id, uow)
+    limit = min(limit or settings.PAGE_LIST_DEFAULT_LIMIT, settings.PAGE_LIST_MAX_LIMIT)
+    after = decode_cursor(cursor, datetime.fromisoformat, uuid.UUID) if cursor else None
+    rows = await uow.pages.list_trash(workspace_id, limit, after)
+    next_cursor = encode_cursor(rows[-1].archived_at, rows[-1].id) if len(rows) == limit else None
+    return rows, next_cursor
+
+async def get_subtree(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID, depth: int) -> schemas.PageTreeNode:
+    page = await get_page(uow, page_id, user_id)
+    rows = await uow.pages.subtree(page.workspace_id, page.id, min(depth, settings.PAGE_TREE_MAX_DEPTH))
+    nodes = {row.id: schemas.PageTreeNode.model_validate(row) for row in rows}
+    for node in nodes.values():
+        parent = nodes.get(node.parent_page_id) if node.depth > 0 else None
+        if parent is not None:
+            parent.children.append(node)
+    return nodes[page.id]
+
+async def get_ancestors(uow: SqlAlchemyUoW, page_id: uuid.UUID, user_id: uuid.UUID) -> list:
+    page = await get_page(uow, page_id, user_id)
+    return await uow.pages.ancestors(page.id, settings.PAGE_TREE_MAX_DEPTH)
+
+async def get_children(uow: SqlAlchemyUoW, workspace_id: uuid.UUID, parent_page_id: uuid.UUID | None, user_id: uuid.UUID) -> list:
+    await ensure_workspace_member(workspace_id, user_id, uow)
+    return await uow.pages.children(workspace_id, parent_page_id)
+
+def _order_import(items: list[schemas.PageImportItem]) -> list[schemas.PageImportItem]:
+    """Validate temp id references and return the items parents-first."""
+    by_temp = {}
+    for item in items:
+        if item.temp_id in by_temp:
+            raise ValidationError(f"Duplicate temp_id {item.temp_id!r}")
+        if item.parent_temp_id is not None and item.parent_page_id is not None:
+            raise ValidationError(f"Page {item.temp_id!r} sets both parent_temp_id and parent_page_id")
+        by_temp[item.temp_id] = item
+    children: dict[str | None, list[schemas.PageImportItem]] = {}
+    for item in items:
+        if item.parent_temp_id is not None and item.parent_temp_id not in by_temp:
+            raise ValidationError(f"Page {item.temp_id!r} references unknown parent_temp_id {item.parent_temp_id!r}")
+        children.setdefault(item.parent_temp_id, []).append(item)
+    ordered, frontier = [], children.get(None, [])
+    while frontier:
+        ordered.extend(frontier)
+        frontier = [child for item in frontier for child in children.get(item.temp_id, [])]
+    if len(ordered) != len(items):
+        raise ValidationError("parent_temp_id references form a cycle")
+    return ordered
+
+async def import_pages(uow: SqlAlchemyUoW, workspace_id: uuid.UUID, user_id: uuid.UUID, items: list[schemas.PageImportItem]) -> schemas.PageImportResult:
+    started = time.perf_counter()
+    if len(items) > settings.PAGE_IMPORT_MAX_PAGES:
+        raise ValidationError(f"At most {settings.PAGE_IMPORT_MAX_PAGES} pages per import")
+    ordered = _order_import(items)
+    await ensure_workspace_member(workspace_id, user_id, uow)
+    external = {i.parent_page_id for i in items if i.parent_page_id is not None}
+    missing = external - await uow.pages.existing_ids(workspace_id, external)
+    if missing:
+        raise ValidationError(f"Unknown parent_page_id(s): {', '.join(sorted(map(str, missing)))}")
+
+    id_map = {item.temp_id: uuid.uuid4() for item in ordered}
+    page_rows, content_rows = [], []
+    for item in ordered:
+        page_id = id_map[item.temp_id]
+        parent = id_map[item.parent_temp_id] if item.parent_temp_id is not None else item.parent_page_id
+        page_rows.append({
+            "id": page_id, "workspace_id": workspace_id, "parent_page_id": parent, "title": item.title,
+            "type": item.type, "icon": item.icon, "created_by": user_id, "updated_by": user_id,
+        })
+        if item.content is not None:
+            content, blob_ref = await content_store.store(item.content)
+            content_rows.append({"id": uuid.uuid4(), "page_id": page_id, "content": content, "blob_ref": blob_ref, "meta": {}, "updated_by": user_id})
+    # Imported siblings keep their input order, after any existing siblings.
+    groups: dict[uuid.UUID | None, list[dict]] = {}
+    for row in page_rows:
+        groups.setdefault(row["parent_page_id"], []).append(row)
+    new_ids = set(id_map.values())
+    last = await uow.pages.last_positions(workspace_id, {parent for parent in groups if parent not in new_ids})
+    for parent, rows in groups.items():
+        for row, key in zip(rows, ordering.keys_between(last.get(parent), None, len(rows))):
+            row["position"] = key
+    await uow.pages.bulk_insert(page_rows, settings.PAGE_IMPORT_BATCH_SIZE)
+    await uow.page_contents.bulk_insert(content_rows, settings.PAGE_IMPORT_BATCH_SIZE)
+    await uow.commit()
+    await page_cache.invalidate(workspace_id)
+    await publish_workspace_event("pages.imported", workspace_id, created=len(page_rows))
+    elapsed = time.perf_counter() - started
+    return schemas.PageImportResult(
+        created=len(page_rows),
+        id_map=id_map,
+        elapsed_ms=round(elapsed * 1000, 2),
+        pages_per_second=round(len(page_rows) / elapsed, 1) if elapsed else 0.0,
+    )
+
+async def _export_batches(workspace_id: uuid.UUID):
+    # The export outlives the request's unit of work, so it streams from its own read-only one.
+    async with SqlAlchemyUoW(read_only=True) as uow:
+        async for batch in uow.pages.stream_export(workspace_id, settings.PAGE_EXPORT_BATCH_SIZE):
+            records = [export.record(row) for row in batch]
+            for record in records:
+                blob_ref = record.pop("blob_ref")
+                if blob_ref:
+                    record["content"] = await content_store.load(None, blob_ref)
+            yield records
+
+async def export_workspace(uow: SqlAlchemyUoW, workspace_id: uuid.UUID, user_id: uuid.UUID, fmt: str):
+    await ensure_workspace_member(workspace_id, user_id, uow)
+    encoder = export.zip_chunks if fmt == "zip" else export.ndjson_chunks
+    return encoder(_export_batches(workspace_id))
@@ -0,0 +1,43 @@
+import json
+import logging
+import uuid
+from app.core.config import settings
+from app.infrastructure.pubsub.backends import build_backend
+from app.infrastructure.pubsub.broker import Broker
+
+# Page events for WebSocket subscribers. page.* events go to the workspace channel and
+# the page channel; content.* events (which may carry deltas) only to the page channel.
+
+logger = logging.getLogger(__name__)
+
+broker = Broker(build_backend(settings.REALTIME_BACKEND), queue_size=settings.REALTIME_QUEUE_SIZE)
+
+
+def workspace_channel(workspace_id: uuid.UUID) -> str:
+    return f"ws:{workspace_id}"
+
+
+def page_channel(page_id: uuid.UUID) -> str:
+    return f"page:{page_id}"
+
+
+async def _publish(channels: list[str], payload: dict) -> None:
+    message = json.dumps(payload, default=str, separators=(",", ":"))
+    for channel in channels:
+        try:
+            await broker.publish(channel, message)
+        except Exception:
+            # Notifications are best effort; the write has already been committed.
+            logger.warning("Failed to publish %s on %s", payload["event"], channel, exc_info=True)
+
+
+async def publish_page_event(event: str, workspace_id: uuid.UUID, page_id: uuid.UUID, **data) -> None:
+    payload = {"event": event, "workspace_id": workspace_id, "page_id": page_id, **data}
+    channels = [page_channel(page_id)]
+    if not event.startswith("content."):
+        channels.insert(0, workspace_channel(workspace_id))
+    await _publish(channels, payload)
+
+
+async def publish_workspace_event(event: str, workspace_id: uuid.UUID, **data) -> None:
+    await _publish([workspace_channel(workspace_id)], {"event": event, "workspace_id": workspace_id, **data})
@@ -0,0 +1,57 @@
+import asyncio
+import uuid
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from app.core.deps import ensure_workspace_member, get_current_user_id
+from app.core.errors import DomainError
+from app.infrastructure.db.uow import SqlAlchemyUoW
+from app.pages import services as page_services
+from .events import broker, page_channel, workspace_channel
+
+router = APIRouter(prefix="/ws", tags=["realtime"])
+
+async def _authenticate(websocket: WebSocket) -> uuid.UUID:
+    # Browsers cannot set headers on WebSocket requests, so the token may come as ?token=.
+    token = websocket.query_params.get("token")
+    return await get_current_user_id(f"Bearer {token}" if token else websocket.headers.get("authorization"))
+
+async def _stream(websocket: WebSocket, channel: str) -> None:
+    await websocket.accept()
+    async with broker.subscribe(channel) as sub:
+        async def pump():
+            async for message in sub:
+                await websocket.send_text(message)
+            # Only reached when the subscriber fell too far behind and was dropped.
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="slow consumer")
+
+        sender = asyncio.create_task(pump())
+        try:
+            while True:
+                await websocket.receive_text()  # client pings; also detects disconnects
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+
+@router.websocket("/workspaces/{workspace_id}")
+async def workspace_events(websocket: WebSocket, workspace_id: uuid.UUID):
+    """page.created / page.updated / page.archived / pages.imported for a workspace."""
+    try:
+        user_id = await _authenticate(websocket)
+        async with SqlAlchemyUoW(read_only=True) as uow:
+            await ensure_workspace_member(workspace_id, user_id, uow)
+    except DomainError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await _stream(websocket, workspace_channel(workspace_id))
+
+@router.websocket("/pages/{page_id}")
+async def page_events(websocket: WebSocket, page_id: uuid.UUID):
+    """page.* events plus content.delta / content.updated for one page."""
+    try:
+        user_id = await _authenticate(websocket)
+        async with SqlAlchemyUoW(read_only=True) as uow:
+            await page_services.get_page(uow, page_id, user_id)
+    except DomainError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await _stream(websocket, page_channel(page_id))
@@ -1,6 +1,6 @@
 import uuid
 from app.infrastructure.db.models import User
-from app.infrastructure.security.auth import hash_password, verify_password, create_access_token
+from app.infrastructure.security.auth import hash_password_async, verify_and_update_password, create_access_token
 from . import schemas
 from app.infrastructure.db.uow import SqlAlchemyUoW
 from fastapi import HTTPException, status
@@ -9,13 +9,19 @@ async def register_user(uow: SqlAlchemyUoW, data: schemas.UserRegisterIn) -> Use
     existing = await uow.users.get_by_email(data.email)
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
-    user = User(id=uuid.uuid4(), email=data.email.lower(), password_hash=hash_password(data.password), full_name=data.full_name)
+    user = User(id=uuid.uuid4(), email=data.email.lower(), password_hash=await hash_password_async(data.password), full_name=data.full_name)
     await uow.users.add(user)
     await uow.commit()
     return user
 
 async def login_user(uow: SqlAlchemyUoW, username: str, password: str) -> str:
     user = await uow.users.get_by_email(username.lower())
-    if not user or not verify_password(password, user.password_hash):
+    if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    valid, new_hash = await verify_and_update_password(password, user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if new_hash:
+        user.password_hash = new_hash
+        await uow.commit()
     return create_access_token(str(user.id))
@@ -1,5 +1,6 @@
 import uuid
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.infrastructure.db.models import Workspace, WorkspaceMember
 
@@ -15,6 +16,24 @@ class WorkspaceRepository:
         res = await self.session.execute(select(Workspace).where(Workspace.id == ws_id))
         return res.scalar_one_or_none()
 
+    async def list_for_user(self, user_id: uuid.UUID, after: tuple[str, uuid.UUID] | None = None, limit: int | None = None) -> list[Row]:
+        """Workspaces the user belongs to plus their role, as (id, name, slug, role) rows.
+
+        Ordered by (name, id) so ``after`` can be the last row's key (keyset pagination).
+        """
+        stmt = (
+            select(Workspace.id, Workspace.name, Workspace.slug, WorkspaceMember.role)
+            .join(WorkspaceMember, WorkspaceMember.workspace_id == Workspace.id)
+            .where(WorkspaceMember.user_id == user_id)
+            .order_by(Workspace.name, Workspace.id)
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(Workspace.name, Workspace.id) > tuple_(*after))
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        res = await self.session.execute(stmt)
+        return list(res.all())
+
 
 class WorkspaceMemberRepository:
     def __init__(self, session: AsyncSession):
@@ -27,3 +46,16 @@ class WorkspaceMemberRepository:
         from app.infrastructure.db.models import WorkspaceMember as WM
         res = await self.session.execute(select(WM).where(WM.user_id == user_id))
         return list(res.scalars().all())
+
+    async def get_by_workspace_user(self, workspace_id: uuid.UUID, user_id: uuid.UUID) -> WorkspaceMember | None:
+        res = await self.session.execute(
+            select(WorkspaceMember).where(WorkspaceMember.workspace_id == workspace_id, WorkspaceMember.user_id == user_id)
+        )
+        return res.scalar_one_or_none()
+
+    async def get_role(self, workspace_id: uuid.UUID, user_id: uuid.UUID) -> str | None:
+        # Point lookup served by the uq_workspace_user (workspace_id, user_id) index.
+        res = await self.session.execute(
+            select(WorkspaceMember.role).where(WorkspaceMember.workspace_id == workspace_id, WorkspaceMember.user_id == user_id)
+        )
+        return res.scalar_one_or_none()
@@ -1,6 +1,9 @@
 import uuid
-from fastapi import APIRouter, Depends
-from app.core.deps import get_uow, get_current_user_id
+from fastapi import APIRouter, Depends, Header, Query, Response
+from app.core.config import settings
+from app.core.deps import get_read_uow, get_uow, get_current_user_id
+from app.core.fastjson import json_list_response, rows_to_items
+from app.core.etag import etag_matches, make_etag, not_modified
 from app.infrastructure.db.uow import SqlAlchemyUoW
 from . import schemas, services
 
@@ -10,9 +13,19 @@ router = APIRouter(prefix="/workspaces", tags=["workspaces_v2"])
 async def create(dto: schemas.WorkspaceCreateIn, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
     return await services.create_workspace(uow, user_id, dto)
 
-@router.get("/", response_model=list[schemas.WorkspaceRead])
-async def list_my_workspaces(user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
-    return await services.list_workspaces(uow, user_id)
+@router.get("/", response_model=list[schemas.WorkspaceWithRole])
+async def list_my_workspaces(response: Response, cursor: str | None = None, limit: int | None = Query(default=None, ge=1, le=500), if_none_match: str | None = Header(default=None), user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_read_uow)):
+    rows, next_cursor = await services.list_workspaces(uow, user_id, cursor, limit)
+    # The listing is one indexed query, so the ETag is derived from its rows; a match saves the body.
+    etag = make_etag("workspaces", *(tuple(r) for r in rows), next_cursor, weak=True)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if settings.FAST_JSON_LISTS:
+        return json_list_response(rows_to_items(rows, schemas.WORKSPACE_LIST_FIELDS), headers=dict(response.headers))
+    return rows
 
 @router.delete("/{workspace_id}")
 async def delete_workspace(workspace_id: uuid.UUID, user_id: uuid.UUID = Depends(get_current_user_id), uow: SqlAlchemyUoW = Depends(get_uow)):
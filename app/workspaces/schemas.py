@@ -11,3 +11,9 @@ class WorkspaceRead(BaseModel):
     slug: str
     class Config:
         from_attributes = True
+
+class WorkspaceWithRole(WorkspaceRead):
+    role: str
+
+# Column order of WorkspaceRepository.list_for_user rows.
+WORKSPACE_LIST_FIELDS = ("id", "name", "slug", "role")
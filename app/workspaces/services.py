@@ -1,9 +1,12 @@
 import uuid
 from slugify import slugify
 from fastapi import HTTPException
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
 from app.infrastructure.db.models import Workspace, WorkspaceMember, RoleName
 from app.infrastructure.db.uow import SqlAlchemyUoW
+from app.core.authz import invalidate_membership
+from app.core.pagination import decode_cursor, encode_cursor
 from . import schemas
 
 async def create_workspace(uow: SqlAlchemyUoW, user_id: uuid.UUID, data: schemas.WorkspaceCreateIn) -> Workspace:
@@ -17,16 +20,17 @@ async def create_workspace(uow: SqlAlchemyUoW, user_id: uuid.UUID, data: schemas
     except IntegrityError as e:
         await uow.rollback()
         raise HTTPException(status_code=400, detail="Slug already exists") from e
+    invalidate_membership(ws.id, user_id)
     return ws
 
-async def list_workspaces(uow: SqlAlchemyUoW, user_id: uuid.UUID) -> list[Workspace]:
-    memberships = await uow.workspace_members.list_for_user(user_id)
-    workspaces: list[Workspace] = []
-    for m in memberships:
-        ws = await uow.workspaces.get(m.workspace_id)
-        if ws:
-            workspaces.append(ws)
-    return workspaces
+async def list_workspaces(uow: SqlAlchemyUoW, user_id: uuid.UUID, cursor: str | None = None, limit: int | None = None) -> tuple[list[Row], str | None]:
+    after = decode_cursor(cursor, str, uuid.UUID) if cursor else None
+    rows = await uow.workspaces.list_for_user(user_id, after=after, limit=limit)
+    next_cursor = None
+    if limit is not None and len(rows) == limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.name, last.id)
+    return rows, next_cursor
 
 async def delete_workspace(uow: SqlAlchemyUoW, user_id: uuid.UUID, workspace_id: uuid.UUID) -> None:
     ws = await uow.workspaces.get(workspace_id)
@@ -38,3 +42,4 @@ async def delete_workspace(uow: SqlAlchemyUoW, user_id: uuid.UUID, workspace_id:
         raise HTTPException(status_code=403, detail="Not allowed")
     await uow.session.delete(ws)
     await uow.commit()
+    invalidate_membership(workspace_id)
@@ -0,0 +1,56 @@
+"""CPU cost of serializing a large page listing (default 10k rows).
+
+    python -m benchmarks.bench_json [rows] [repeats]
+
+Compares the response_model path (per-item pydantic validation, then the stdlib
+json encoder FastAPI's JSONResponse uses) with app.core.fastjson: dicts built
+straight from row tuples and encoded with orjson (or json when it is missing).
+"""
+import json
+import sys
+import time
+import uuid
+
+from pydantic import TypeAdapter
+
+from app.core import fastjson
+from app.pages.schemas import PAGE_LIST_FIELDS, PageListItem
+
+
+def make_rows(n: int) -> list[tuple]:
+    root = uuid.uuid4()
+    return [(uuid.uuid4(), f"Page {i:05d}", root if i % 10 else None, "page") for i in range(n)]
+
+
+def validated(rows: list[tuple]) -> bytes:
+    adapter = TypeAdapter(list[PageListItem])
+    items = adapter.validate_python([dict(zip(PAGE_LIST_FIELDS, r)) for r in rows])
+    content = adapter.dump_python(items, mode="json", exclude_unset=True)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def fast(rows: list[tuple]) -> bytes:
+    return fastjson.dumps(fastjson.rows_to_items(rows, PAGE_LIST_FIELDS))
+
+
+def cpu_ms(fn, rows: list[tuple], repeats: int) -> float:
+    fn(rows)  # warm up
+    started = time.process_time()
+    for _ in range(repeats):
+        fn(rows)
+    return (time.process_time() - started) / repeats * 1000
+
+
+def main(rows: int, repeats: int) -> None:
+    data = make_rows(rows)
+    assert json.loads(validated(data)) == json.loads(fast(data))
+    encoder = "orjson" if fastjson.orjson is not None else "json (orjson not installed)"
+    print(f"{rows} rows, {repeats} repeats, fast encoder: {encoder}")
+    base = cpu_ms(validated, data, repeats)
+    for name, fn in (("response_model + json", validated), ("row tuples + fast encoder", fast)):
+        ms = cpu_ms(fn, data, repeats) if fn is not validated else base
+        print(f"  {name:28} {ms:8.2f} ms CPU/response  ({base / ms:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000, int(sys.argv[2]) if len(sys.argv) > 2 else 20)
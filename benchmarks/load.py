@@ -0,0 +1,278 @@
+"""Load benchmark for the HTTP API with latency percentiles.
+
+    python -m benchmarks.load                                  # in-process (httpx.ASGITransport)
+    python -m benchmarks.load --target http://localhost:8000   # a running uvicorn
+    python -m benchmarks.load --scenarios sidebar,autosave --pages 10000 --output results/main.json
+    python -m benchmarks.load --compare results/main.json      # print the change against a previous run
+
+Scenarios seed their own data through the public API (fresh users and workspaces
+every run), so they work against any database the target points at. Each
+scenario reports p50/p95/p99 latency and requests/second per endpoint; results
+are written as JSON for comparing commits.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+
+PASSWORD = "Bench123!"
+
+
+@dataclass
+class Scale:
+    users: int = 20
+    pages: int = 10_000
+    workspaces: int = 50
+    requests: int = 500
+    concurrency: int = 16
+
+
+@dataclass
+class Recorder:
+    samples: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    statuses: dict[str, dict[int, int]] = field(default_factory=lambda: defaultdict(lambda: defaultdict(int)))
+    elapsed: float = 0.0
+
+    async def call(self, label: str, send: Awaitable[httpx.Response]) -> httpx.Response:
+        started = time.perf_counter()
+        response = await send
+        self.samples[label].append(time.perf_counter() - started)
+        self.statuses[label][response.status_code] += 1
+        return response
+
+    def report(self) -> dict:
+        out = {}
+        for label, samples in self.samples.items():
+            ordered = sorted(samples)
+            out[label] = {
+                "count": len(ordered),
+                "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2),
+                "rps": round(len(ordered) / self.elapsed, 1) if self.elapsed else None,
+                "statuses": dict(self.statuses[label]),
+            }
+        return out
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+async def run_load(recorder: Recorder, total: int, concurrency: int, one: Callable[[int], Awaitable[None]]) -> None:
+    """Run ``one(i)`` for i in range(total) with ``concurrency`` workers; wall time goes to the recorder."""
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            await one(i)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    recorder.elapsed += time.perf_counter() - started
+
+
+# -- seeding -----------------------------------------------------------------
+
+async def register(client: httpx.AsyncClient) -> tuple[str, dict]:
+    email = f"bench_{uuid.uuid4().hex[:10]}@example.com"
+    r = await client.post("/users/register", json={"email": email, "password": PASSWORD, "full_name": "Bench"})
+    r.raise_for_status()
+    r = await client.post("/users/login", data={"username": email, "password": PASSWORD})
+    r.raise_for_status()
+    return email, {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def create_workspace(client: httpx.AsyncClient, headers: dict, name: str = "Bench") -> str:
+    r = await client.post("/workspaces/", json={"name": name, "slug": f"bench-{uuid.uuid4().hex[:10]}"}, headers=headers)
+    r.raise_for_status()
+    return r.json()["id"]
+
+
+async def seed_pages(client: httpx.AsyncClient, headers: dict, workspace_id: str, count: int, fanout: int = 20) -> list[str]:
+    """Import ``count`` pages as a tree (``fanout`` children per page); returns the root page ids."""
+    items = []
+    for i in range(count):
+        parent = str((i - 1) // fanout) if i >= fanout else None
+        items.append({"temp_id": str(i), "parent_temp_id": parent, "title": f"Page {i:05d}", "content": {"b": {"id": "b", "text": f"page {i}"}}})
+    r = await client.post(f"/pages/workspace/{workspace_id}/import", json={"pages": items}, headers=headers, timeout=300)
+    r.raise_for_status()
+    id_map = r.json()["id_map"]
+    return [id_map[str(i)] for i in range(min(fanout, count))]
+
+
+# -- scenarios ---------------------------------------------------------------
+
+async def login_storm(client: httpx.AsyncClient, scale: Scale) -> Recorder:
+    emails = [(await register(client))[0] for _ in range(scale.users)]
+    rec = Recorder()
+
+    async def one(i):
+        form = {"username": emails[i % len(emails)], "password": PASSWORD}
+        await rec.call("POST /users/login", client.post("/users/login", data=form))
+
+    await run_load(rec, scale.requests, scale.concurrency, one)
+    return rec
+
+
+async def sidebar(client: httpx.AsyncClient, scale: Scale) -> Recorder:
+    _, headers = await register(client)
+    ws_id = await create_workspace(client, headers, "Sidebar")
+    roots = await seed_pages(client, headers, ws_id, scale.pages)
+    rec = Recorder()
+
+    async def one(i):
+        kind = i % 3
+        if kind == 0:
+            await rec.call("GET /pages/workspace/{id}/children", client.get(f"/pages/workspace/{ws_id}/children", headers=headers))
+        elif kind == 1:
+            await rec.call("GET /pages/workspace/{id}", client.get(f"/pages/workspace/{ws_id}", params={"limit": 100}, headers=headers))
+        else:
+            await rec.call("GET /pages/{id}/tree", client.get(f"/pages/{random.choice(roots)}/tree", params={"depth": 2}, headers=headers))
+
+    await run_load(rec, scale.requests, scale.concurrency, one)
+    return rec
+
+
+async def autosave(client: httpx.AsyncClient, scale: Scale) -> Recorder:
+    _, headers = await register(client)
+    ws_id = await create_workspace(client, headers, "Autosave")
+    r = await client.post("/pages/", json={"workspace_id": ws_id, "title": "Hot page", "content": {}}, headers=headers)
+    page_id = r.json()["id"]
+    rec = Recorder()
+
+    async def one(i):
+        # Each "tab" keeps editing its own few blocks.
+        body = {"blocks": {f"tab{i % scale.concurrency}-{i % 5}": {"text": f"edit {i}"}}}
+        await rec.call("PATCH /pages/{id}/content", client.patch(f"/pages/{page_id}/content", json=body, headers=headers))
+
+    await run_load(rec, scale.requests, scale.concurrency, one)
+    return rec
+
+
+async def many_workspaces(client: httpx.AsyncClient, scale: Scale) -> Recorder:
+    _, headers = await register(client)
+    workspaces = [await create_workspace(client, headers, f"WS {i:03d}") for i in range(scale.workspaces)]
+    for ws_id in workspaces:
+        await seed_pages(client, headers, ws_id, 20)
+    rec = Recorder()
+
+    async def one(i):
+        if i % 4 == 0:
+            await rec.call("GET /workspaces/", client.get("/workspaces/", headers=headers))
+        else:
+            ws_id = random.choice(workspaces)
+            await rec.call("GET /pages/workspace/{id}", client.get(f"/pages/workspace/{ws_id}", headers=headers))
+
+    await run_load(rec, scale.requests, scale.concurrency, one)
+    return rec
+
+
+SCENARIOS: dict[str, Callable[[httpx.AsyncClient, Scale], Awaitable[Recorder]]] = {
+    "login": login_storm,
+    "sidebar": sidebar,
+    "autosave": autosave,
+    "workspaces": many_workspaces,
+}
+
+
+# -- driver ------------------------------------------------------------------
+
+def make_client(target: str) -> httpx.AsyncClient:
+    limits = httpx.Limits(max_connections=256, max_keepalive_connections=256)
+    if target == "inprocess":
+        from app.main import app
+
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+    return httpx.AsyncClient(base_url=target, timeout=60, limits=limits)
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(target: str, names: list[str], scale: Scale) -> dict:
+    results = {}
+    async with make_client(target) as client:
+        for name in names:
+            started = time.perf_counter()
+            recorder = await SCENARIOS[name](client, scale)
+            results[name] = {"wall_seconds": round(time.perf_counter() - started, 2), "endpoints": recorder.report()}
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "target": target,
+            "python": platform.python_version(),
+            "scale": vars(scale),
+        },
+        "scenarios": results,
+    }
+
+
+def print_report(result: dict, baseline: dict | None = None) -> None:
+    for name, scenario in result["scenarios"].items():
+        print(f"\n== {name} ({scenario['wall_seconds']}s)")
+        print(f"{'endpoint':40} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'rps':>8}  statuses")
+        for label, s in scenario["endpoints"].items():
+            line = f"{label:40} {s['count']:>6} {s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8} {s['rps']:>8}  {s['statuses']}"
+            old = (baseline or {}).get("scenarios", {}).get(name, {}).get("endpoints", {}).get(label)
+            if old:
+                line += f"  p95 {_change(old['p95_ms'], s['p95_ms'])}, rps {_change(old['rps'], s['rps'])}"
+            print(line)
+
+
+def _change(old: float | None, new: float | None) -> str:
+    if not old or new is None:
+        return "n/a"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def main(argv: list[str] | None = None) -> dict:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--target", default="inprocess", help='"inprocess" or a base URL such as http://localhost:8000')
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma separated subset of {','.join(SCENARIOS)}")
+    for name, default in vars(Scale()).items():
+        parser.add_argument(f"--{name}", type=int, default=default)
+    parser.add_argument("--output", help="write the JSON results here")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    scale = Scale(**{name: getattr(args, name) for name in vars(Scale())})
+    result = asyncio.run(run(args.target, names, scale))
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_report(result, baseline)
+    if args.output:
+        path = Path(args.output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(result, indent=2))
+        print(f"\nresults written to {path}", file=sys.stderr)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""index memberships by user
+
+Revision ID: 0002_member_user_index
+Revises: 0001_initial
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0002_member_user_index'
+down_revision = '0001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # uq_workspace_user leads with workspace_id; listing a user's workspaces needs user_id first.
+    op.create_index('ix_workspace_members_user_workspace', 'workspace_members', ['user_id', 'workspace_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_workspace_members_user_workspace', table_name='workspace_members')
@@ -0,0 +1,21 @@
+"""keyset index for page listings
+
+Revision ID: 0003_pages_updated_index
+Revises: 0002_member_user_index
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0003_pages_updated_index'
+down_revision = '0002_member_user_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_pages_workspace_updated', 'pages', ['workspace_id', 'updated_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pages_workspace_updated', table_name='pages')
@@ -0,0 +1,22 @@
+"""page content version counter
+
+Revision ID: 0004_page_content_version
+Revises: 0003_pages_updated_index
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004_page_content_version'
+down_revision = '0003_pages_updated_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('page_content', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    op.drop_column('page_content', 'version')
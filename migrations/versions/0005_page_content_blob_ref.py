@@ -0,0 +1,22 @@
+"""external blob reference for large page content
+
+Revision ID: 0005_page_content_blob_ref
+Revises: 0004_page_content_version
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005_page_content_blob_ref'
+down_revision = '0004_page_content_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('page_content', sa.Column('blob_ref', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('page_content', 'blob_ref')
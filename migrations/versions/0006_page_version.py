@@ -0,0 +1,22 @@
+"""page version counter for optimistic concurrency
+
+Revision ID: 0006_page_version
+Revises: 0005_page_content_blob_ref
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006_page_version'
+down_revision = '0005_page_content_blob_ref'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('pages', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    op.drop_column('pages', 'version')
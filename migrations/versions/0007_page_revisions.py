@@ -0,0 +1,34 @@
+"""page revision history
+
+Revision ID: 0007_page_revisions
+Revises: 0006_page_version
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0007_page_revisions'
+down_revision = '0006_page_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('page_revisions',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('page_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('pages.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=8), nullable=False),
+        sa.Column('depth', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('data', postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('blob_ref', sa.String(length=64)),
+        sa.Column('created_by', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.UniqueConstraint('page_id', 'version', name='uq_page_revisions_page_version'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('page_revisions')
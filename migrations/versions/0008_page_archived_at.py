@@ -0,0 +1,26 @@
+"""page archived_at for subtree trash and purge
+
+Revision ID: 0008_page_archived_at
+Revises: 0007_page_revisions
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008_page_archived_at'
+down_revision = '0007_page_revisions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('pages', sa.Column('archived_at', sa.DateTime(timezone=True), nullable=True))
+    # Pages archived before this migration: their last update is the best archive time we have.
+    op.execute("UPDATE pages SET archived_at = updated_at WHERE is_archived")
+    op.create_index('ix_pages_archived_at', 'pages', ['archived_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pages_archived_at', table_name='pages')
+    op.drop_column('pages', 'archived_at')
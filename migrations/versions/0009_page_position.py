@@ -0,0 +1,44 @@
+"""page position keys for sibling order
+
+Revision ID: 0009_page_position
+Revises: 0008_page_archived_at
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.pages.ordering import keys_between
+
+# revision identifiers, used by Alembic.
+revision = '0009_page_position'
+down_revision = '0008_page_archived_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('pages', sa.Column('position', sa.String(collation='C'), nullable=True))
+    # Existing siblings keep the order they were shown in (title, id).
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT id, workspace_id, parent_page_id FROM pages ORDER BY workspace_id, parent_page_id, title, id"
+    )).all()
+    groups: dict[tuple, list] = {}
+    for row in rows:
+        groups.setdefault((row.workspace_id, row.parent_page_id), []).append(row.id)
+    updates = [
+        {"id": page_id, "position": key}
+        for ids in groups.values()
+        for page_id, key in zip(ids, keys_between(None, None, len(ids)))
+    ]
+    if updates:
+        conn.execute(sa.text("UPDATE pages SET position = :position WHERE id = :id"), updates)
+    op.alter_column('pages', 'position', nullable=False)
+    op.create_index('ix_pages_workspace_parent_position', 'pages', ['workspace_id', 'parent_page_id', 'position'])
+    op.drop_index('ix_pages_workspace_parent', table_name='pages')
+
+
+def downgrade() -> None:
+    op.create_index('ix_pages_workspace_parent', 'pages', ['workspace_id', 'parent_page_id'])
+    op.drop_index('ix_pages_workspace_parent_position', table_name='pages')
+    op.drop_column('pages', 'position')
@@ -1,9 +1,12 @@
 import asyncio
 import os
+import uuid
 import pytest
 import pytest_asyncio
 import httpx
+from app.core.config import settings
 from app.main import app as fastapi_app
+from test_auth_flow import register_and_login
 
 # Ensure selector loop policy on Windows for psycopg async compatibility
 if os.name == "nt" and hasattr(asyncio, "WindowsSelectorEventLoopPolicy"):
@@ -27,3 +30,30 @@ async def client():
     transport = httpx.ASGITransport(app=fastapi_app)
     async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+
+
+@pytest.fixture
+def internal_headers(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_ENDPOINTS_ENABLED", True)
+    monkeypatch.setattr(settings, "INTERNAL_TOKEN", "test-internal-token")
+    return {"X-Internal-Token": "test-internal-token"}
+
+
+@pytest_asyncio.fixture
+async def workspace(client):
+    """A fresh user with one workspace: ``(headers, workspace_id)``."""
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Test", "slug": f"test-{uuid.uuid4().hex[:8]}"}, headers=headers)
+    assert r.status_code == 200, r.text
+    return headers, r.json()["id"]
+
+
+@pytest.fixture
+def create_page(client):
+    """``await create_page(headers, ws_id, title, parent=None, content=None)`` -> the new page id."""
+    async def create(headers, ws_id, title, parent=None, content=None):
+        r = await client.post("/pages/", json={"workspace_id": ws_id, "title": title, "parent_page_id": parent, "content": content}, headers=headers)
+        assert r.status_code == 200, r.text
+        return r.json()["id"]
+    return create
@@ -0,0 +1,49 @@
+import uuid
+import pytest
+from app.core import authz
+from app.core.errors import PermissionDenied
+from app.infrastructure.cache.memory import TTLCache
+
+
+class FakeMembers:
+    def __init__(self, roles):
+        self.roles = roles
+        self.calls = 0
+
+    async def get_role(self, workspace_id, user_id):
+        self.calls += 1
+        return self.roles.get((workspace_id, user_id))
+
+
+class FakeUoW:
+    def __init__(self, roles):
+        self.workspace_members = FakeMembers(roles)
+
+
+def test_ttl_cache_expiry_and_lru_eviction():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    now[0] = 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_membership_lookup_is_cached_and_invalidated():
+    authz.membership_cache.clear()
+    ws, user = uuid.uuid4(), uuid.uuid4()
+    uow = FakeUoW({(ws, user): "owner"})
+    assert await authz.require_workspace_role(uow, ws, user) == "owner"
+    assert await authz.require_workspace_role(uow, ws, user) == "owner"
+    assert uow.workspace_members.calls == 1
+    authz.invalidate_membership(ws)
+    uow.workspace_members.roles.clear()
+    with pytest.raises(PermissionDenied):
+        await authz.require_workspace_role(uow, ws, user)
+    assert uow.workspace_members.calls == 2
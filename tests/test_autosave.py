@@ -0,0 +1,144 @@
+import asyncio
+import uuid
+import pytest
+from app.core.errors import ValidationError
+from app.pages import delta, schemas, services
+from app.pages.autosave import AutosaveBuffer, merge_step
+from test_auth_flow import register_and_login
+
+
+def test_merged_block_deltas_match_sequential_application():
+    patches = [
+        schemas.PageContentPatch(blocks={"a": 1, "b": 1}),
+        schemas.PageContentPatch(blocks={"c": 1}, deleted_blocks=["a"]),
+        schemas.PageContentPatch(blocks={"a": 2}, deleted_blocks=["b"]),
+    ]
+    base = {"x": 0, "b": 0}
+    expected = base
+    steps = []
+    for p in patches:
+        expected = delta.apply_delta(expected, None, p.blocks, p.deleted_blocks)
+        merge_step(steps, p)
+    assert len(steps) == 1
+    assert delta.apply_delta(base, None, steps[0].blocks, steps[0].deleted_blocks) == expected
+
+    merge_step(steps, schemas.PageContentPatch(content={"full": True}))
+    merge_step(steps, schemas.PageContentPatch(blocks={"k": 1}))
+    assert [s.content for s in steps] == [{"full": True, "k": 1}]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_page_by_page():
+    calls = []
+
+    async def writer(batch):
+        calls.append(set(batch))
+        if len(batch) > 1 or "bad" in batch:
+            raise RuntimeError("boom")
+
+    buffer = AutosaveBuffer(writer, enabled=True, interval=60)
+    for key in ("good", "bad"):
+        await buffer.submit(uuid.uuid4(), key, uuid.uuid4(), schemas.PageContentPatch(content={}))
+    assert await buffer.flush() == 1
+    assert calls == [{"good", "bad"}, {"good"}, {"bad"}]
+    # The failed page keeps its acknowledged edits queued, ahead of later ones.
+    assert buffer.is_pending("bad") and not buffer.is_pending("good")
+    await buffer._lock.acquire()
+    flush = asyncio.ensure_future(buffer._write({"bad": buffer._pending.pop("bad")}))
+    await buffer.submit(uuid.uuid4(), "bad", uuid.uuid4(), schemas.PageContentPatch(blocks={"k": 1}))
+    await flush
+    buffer._lock.release()
+    entry = buffer._pending["bad"]
+    assert entry.attempts == 2 and entry.submitted == 2
+    assert [s.content for s in entry.steps] == [{"k": 1}]
+    assert buffer.stats()["failures"] == 2 and buffer.stats()["retrying_pages"] == 1
+    buffer._pending.clear()
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_submit_rejects_ops_that_do_not_apply():
+    async def writer(batch):
+        pass
+
+    async def stored():
+        return {"items": [1]}
+
+    buffer = AutosaveBuffer(writer, enabled=True, interval=60)
+    page = uuid.uuid4()
+    bad = schemas.PageContentPatch(ops=[{"op": "replace", "path": "/items/5", "value": 0}])
+    with pytest.raises(ValidationError):
+        await buffer.submit(uuid.uuid4(), page, uuid.uuid4(), bad, stored)
+    assert not buffer.is_pending(page)
+
+    # Ops are checked against the stored document plus what is already queued.
+    await buffer.submit(uuid.uuid4(), page, uuid.uuid4(), schemas.PageContentPatch(blocks={"n": {}}), stored)
+    await buffer.submit(uuid.uuid4(), page, uuid.uuid4(), schemas.PageContentPatch(ops=[{"op": "add", "path": "/n/x", "value": 1}]), stored)
+    with pytest.raises(ValidationError):
+        await buffer.submit(uuid.uuid4(), page, uuid.uuid4(), schemas.PageContentPatch(ops=[{"op": "add", "path": "/n/x/y", "value": 2}]), stored)
+    assert buffer._pending[page].submitted == 2
+    assert buffer._pending[page].preview == {"items": [1], "n": {"x": 1}}
+    await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_buffered_patches_coalesce_into_one_write(client, monkeypatch):
+    monkeypatch.setattr(services.autosave_buffer, "enabled", True)
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Auto", "slug": f"auto-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    r = await client.post("/pages/", json={"workspace_id": ws_id, "title": "Draft", "content": {}}, headers=headers)
+    page_id = r.json()["id"]
+
+    before = services.autosave_buffer.stats()
+    for i in range(5):
+        r = await client.patch(f"/pages/{page_id}/content", json={"blocks": {f"b{i}": {"n": i}}}, headers=headers)
+        assert r.status_code == 202 and r.json()["status"] == "queued"
+    r = await client.patch(f"/pages/{page_id}/content", json={"title": "Final"}, headers=headers)
+    assert services.autosave_buffer.is_pending(uuid.UUID(page_id))
+
+    # Reading a pending page flushes it first; the five deltas land as one content write.
+    r = await client.get(f"/pages/{page_id}/content", headers=headers)
+    assert r.json()["content"] == {f"b{i}": {"n": i} for i in range(5)}
+    assert r.json()["version"] == 2
+    assert (await client.get(f"/pages/{page_id}", headers=headers)).json()["title"] == "Final"
+    after = services.autosave_buffer.stats()
+    assert after["pages_written"] - before["pages_written"] == 1
+    assert after["submitted"] - before["submitted"] == 6
+
+    # Conditional writes bypass the buffer.
+    r = await client.patch(f"/pages/{page_id}/content", json={"blocks": {"z": 1}, "expected_version": 2}, headers=headers)
+    assert r.status_code == 200 and r.json()["version"] == 3
+
+
+@pytest.mark.asyncio
+async def test_put_after_buffered_patch_is_not_overwritten(client, workspace, create_page, monkeypatch):
+    monkeypatch.setattr(services.autosave_buffer, "enabled", True)
+    headers, ws_id = workspace
+    page_id = await create_page(headers, ws_id, "Doc", content={})
+    r = await client.patch(f"/pages/{page_id}/content", json={"content": {"old": "buffered"}}, headers=headers)
+    assert r.status_code == 202
+    r = await client.put(f"/pages/{page_id}", json={"workspace_id": ws_id, "title": "Doc", "content": {"new": "from PUT"}}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert not services.autosave_buffer.is_pending(uuid.UUID(page_id))
+    r = await client.get(f"/pages/{page_id}/content", headers=headers)
+    assert r.json()["content"] == {"new": "from PUT"} and r.json()["version"] == 3
+
+
+@pytest.mark.asyncio
+async def test_archiving_keeps_acknowledged_autosaves(client, workspace, create_page, monkeypatch):
+    monkeypatch.setattr(services.autosave_buffer, "enabled", True)
+    headers, ws_id = workspace
+    root = await create_page(headers, ws_id, "Root", content={})
+    child = await create_page(headers, ws_id, "Child", root, content={})
+    for page_id in (root, child):
+        r = await client.patch(f"/pages/{page_id}/content", json={"blocks": {"b": page_id}}, headers=headers)
+        assert r.status_code == 202
+    r = await client.delete(f"/pages/{root}", headers=headers)
+    assert r.json()["archived"] == 2
+    await services.autosave_buffer.flush()
+    await client.post(f"/pages/{root}/restore", headers=headers)
+    for page_id in (root, child):
+        r = await client.get(f"/pages/{page_id}/content", headers=headers)
+        assert r.json()["content"] == {"b": page_id}
@@ -0,0 +1,34 @@
+import uuid
+import pytest
+from test_auth_flow import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_etags_and_not_modified(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Etag", "slug": f"etag-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    r = await client.post("/pages/", json={"workspace_id": ws_id, "title": "Doc", "content": {"b1": {"id": "b1"}}}, headers=headers)
+    page_id = r.json()["id"]
+
+    r = await client.get(f"/pages/{page_id}/content", headers=headers)
+    assert r.status_code == 200 and r.json()["content"] == {"b1": {"id": "b1"}}
+    etag = r.headers["ETag"]
+    r = await client.get(f"/pages/{page_id}/content", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304 and r.content == b""
+    await client.patch(f"/pages/{page_id}/content", json={"content": {"b2": {"id": "b2"}}}, headers=headers)
+    r = await client.get(f"/pages/{page_id}/content", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200 and r.headers["ETag"] != etag
+
+    r = await client.get(f"/pages/{page_id}", headers=headers)
+    r2 = await client.get(f"/pages/{page_id}", headers={**headers, "If-None-Match": r.headers["ETag"]})
+    assert r2.status_code == 304
+
+    r = await client.get(f"/pages/workspace/{ws_id}", headers=headers)
+    listing_etag = r.headers["ETag"]
+    r = await client.get(f"/pages/workspace/{ws_id}", headers={**headers, "If-None-Match": listing_etag})
+    assert r.status_code == 304
+    await client.post("/pages/", json={"workspace_id": ws_id, "title": "Other"}, headers=headers)
+    r = await client.get(f"/pages/workspace/{ws_id}", headers={**headers, "If-None-Match": listing_etag})
+    assert r.status_code == 200 and len(r.json()) == 2
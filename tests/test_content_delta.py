@@ -0,0 +1,94 @@
+import uuid
+import pytest
+from app.core.errors import ValidationError
+from app.pages import delta
+from test_auth_flow import register_and_login
+
+
+def test_block_delta_upserts_and_deletes():
+    doc = {"a": {"id": "a", "value": [1]}, "b": {"id": "b"}}
+    out = delta.apply_block_delta(doc, {"a": {"id": "a", "value": [2]}, "c": {"id": "c"}}, ["b"])
+    assert out == {"a": {"id": "a", "value": [2]}, "c": {"id": "c"}}
+    assert "b" in doc  # input is not mutated
+
+
+def test_json_patch_subset():
+    doc = {"a": {"value": [1, 2]}, "b/c": {"x": 1}}
+    out = delta.apply_json_patch(doc, [
+        {"op": "add", "path": "/a/value/-", "value": 3},
+        {"op": "add", "path": "/a/value/0", "value": 0},
+        {"op": "replace", "path": "/b~1c/x", "value": 2},
+        {"op": "replace", "path": "/missing", "value": 1},
+        {"op": "remove", "path": "/a/value/1"},
+    ])
+    assert out == {"a": {"value": [0, 2, 3]}, "b/c": {"x": 2}}
+    with pytest.raises(ValidationError):
+        delta.apply_json_patch(doc, [{"op": "add", "path": "/nope/x", "value": 1}])
+
+
+
+@pytest.mark.parametrize("op", [
+    {"op": "add", "path": "/items/abc", "value": 1},
+    {"op": "add", "path": "/items/3", "value": 1},
+    {"op": "replace", "path": "/items/9", "value": 1},
+    {"op": "replace", "path": "/items/-", "value": 1},
+    {"op": "remove", "path": "/items/x"},
+    {"op": "remove", "path": "/items/01"},
+    {"op": "add", "path": "/items/abc/x", "value": 1},
+    {"op": "add", "path": "/title/x", "value": 1},
+    {"op": "remove", "path": ""},
+])
+def test_json_patch_rejects_bad_paths(op):
+    with pytest.raises(ValidationError):
+        delta.apply_json_patch({"items": [1, 2], "title": "t"}, [op])
+
+
+def test_json_patch_numeric_object_keys_and_targets():
+    out = delta.apply_json_patch({"m": {"0": "a"}, "items": [1]}, [
+        {"op": "add", "path": "/m/0", "value": "b"},
+        {"op": "add", "path": "/items/1", "value": 2},
+    ])
+    assert out == {"m": {"0": "b"}, "items": [1, 2]}
+    assert delta.check_target("add", "/m/0", "object", None) is None
+    assert delta.check_target("add", "/items/-", "array", 2) == 2
+    with pytest.raises(ValidationError):
+        delta.check_target("replace", "/items/2", "array", 2)
+    with pytest.raises(ValidationError):
+        delta.check_target("add", "/s/x", "string", None)
+    # Ops on a container changed earlier in the same patch cannot be checked up front.
+    assert delta.ops_interdependent([{"op": "add", "path": "/a/0"}, {"op": "remove", "path": "/a/1"}])
+    assert delta.ops_interdependent([{"op": "add", "path": "/a", "value": []}, {"op": "add", "path": "/a/0"}])
+    assert delta.ops_interdependent([{"op": "add", "path": "/a/x"}], upserts={"a": {}})
+    assert not delta.ops_interdependent([{"op": "add", "path": "/a/x"}, {"op": "add", "path": "/b/0"}])
+
+
+@pytest.mark.asyncio
+async def test_patch_content_bad_array_paths_are_422(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Delta", "slug": f"delta-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    r = await client.post("/pages/", json={"workspace_id": r.json()["id"], "title": "Doc", "content": {"items": [1, 2]}}, headers=headers)
+    page_id = r.json()["id"]
+    for op in ({"op": "add", "path": "/items/abc", "value": 1}, {"op": "replace", "path": "/items/9", "value": 1}, {"op": "remove", "path": "/items/x"}):
+        r = await client.patch(f"/pages/{page_id}/content", json={"ops": [op]}, headers=headers)
+        assert r.status_code == 422, r.text
+    r = await client.get(f"/pages/{page_id}/content", headers=headers)
+    assert r.json()["content"] == {"items": [1, 2]} and r.json()["version"] == 1
+
+
+@pytest.mark.asyncio
+async def test_patch_content_rejects_mixed_modes(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Delta", "slug": f"delta-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    r = await client.post("/pages/", json={"workspace_id": r.json()["id"], "title": "Doc"}, headers=headers)
+    page_id = r.json()["id"]
+    r = await client.patch(f"/pages/{page_id}/content", json={"blocks": {"b1": {"id": "b1"}}}, headers=headers)
+    assert r.status_code == 200, r.text
+    r = await client.patch(f"/pages/{page_id}/content", json={"ops": [{"op": "add", "path": "/b2", "value": {"id": "b2"}}]}, headers=headers)
+    assert r.status_code == 200, r.text
+    r = await client.patch(f"/pages/{page_id}/content", json={"content": {}, "deleted_blocks": ["b1"]}, headers=headers)
+    assert r.status_code == 422
+    r = await client.get(f"/pages/{page_id}/content", headers=headers)
+    assert r.json()["content"] == {"b1": {"id": "b1"}, "b2": {"id": "b2"}}
+    assert r.json()["version"] == 2
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.infrastructure.db.pool import InstrumentedQueuePool, pool_snapshot
+
+
+@pytest.mark.asyncio
+async def test_pool_records_overflow_and_timeouts(tmp_path):
+    pytest.importorskip("aiosqlite")
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=1, pool_timeout=0.1,
+    )
+    first, second = await engine.connect(), await engine.connect()
+    await first.execute(text("select 1"))
+    with pytest.raises(exc.TimeoutError):
+        await engine.connect()
+    stats = pool_snapshot(engine)
+    assert stats["checked_out"] == 2
+    assert stats["overflow_events"] == 1 and stats["timeouts"] == 1
+    assert stats["wait_seconds"]["count"] == 3
+    await first.close()
+    await second.close()
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_internal_pool_endpoint(client, internal_headers):
+    r = await client.get("/internal/db/pool")
+    assert r.status_code == 401
+    r = await client.get("/internal/db/pool", headers=internal_headers)
+    assert r.status_code == 200
+    assert "checked_out" in r.json()["primary"]
+
+
+@pytest.mark.asyncio
+async def test_internal_endpoints_are_off_by_default(client):
+    for path in ("/internal/db/pool", "/internal/autosave", "/internal/profiles"):
+        assert (await client.get(path)).status_code == 404
@@ -0,0 +1,36 @@
+import uuid
+import pytest
+from app.core import fastjson
+from app.core.config import settings
+from test_auth_flow import register_and_login
+
+
+def test_dumps_matches_with_and_without_orjson(monkeypatch):
+    payload = [{"id": uuid.UUID(int=1), "title": "Ünïcode", "parent_page_id": None}]
+    fast = fastjson.dumps(payload)
+    monkeypatch.setattr(fastjson, "orjson", None)
+    assert fastjson.dumps(payload) == fast
+    assert fast == b'[{"id":"00000000-0000-0000-0000-000000000001","title":"\xc3\x9cn\xc3\xafcode","parent_page_id":null}]'
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_match_validated_path(client, monkeypatch):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Fast", "slug": f"fast-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    items = [{"temp_id": str(i), "title": f"P{i}"} for i in range(7)]
+    await client.post(f"/pages/workspace/{ws_id}/import", json={"pages": items}, headers=headers)
+
+    urls = [(f"/pages/workspace/{ws_id}", {"limit": 5}), (f"/pages/workspace/{ws_id}", {"fields": "title,type"}), ("/workspaces/", {})]
+    fast = [await client.get(url, params=params, headers=headers) for url, params in urls]
+    monkeypatch.setattr(settings, "FAST_JSON_LISTS", False)
+    slow = [await client.get(url, params=params, headers=headers) for url, params in urls]
+
+    for f, s in zip(fast, slow):
+        assert f.status_code == s.status_code == 200
+        assert f.json() == s.json()
+        assert f.headers["ETag"] == s.headers["ETag"]
+        assert f.headers.get("X-Next-Cursor") == s.headers.get("X-Next-Cursor")
+        assert f.headers["content-type"] == "application/json"
+    assert len(fast[0].json()) == 5 and fast[0].headers["X-Next-Cursor"]
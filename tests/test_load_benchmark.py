@@ -0,0 +1,20 @@
+import pytest
+from benchmarks.load import Recorder, Scale, many_workspaces, percentile
+
+
+def test_percentile_is_nearest_rank():
+    ordered = [i / 1000 for i in range(1, 101)]
+    assert percentile(ordered, 50) == 0.05
+    assert percentile(ordered, 99) == 0.099
+    assert percentile([0.3], 95) == 0.3
+    assert percentile([], 50) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_scenario_runs_in_process(client):
+    rec = await many_workspaces(client, Scale(workspaces=2, requests=8, concurrency=2))
+    report = rec.report()
+    assert sum(s["count"] for s in report.values()) == 8
+    for stats in report.values():
+        assert set(stats["statuses"]) == {200}
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
@@ -0,0 +1,64 @@
+import uuid
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from app.core.instrumentation import LATENCY, REQUEST_QUERIES, REQUESTS
+from app.core.metrics import Histogram, Registry
+from app.infrastructure.db.base import engine
+from test_auth_flow import register_and_login
+
+
+def test_registry_renders_prometheus_text():
+    reg = Registry()
+    reg.counter("jobs_total", "Jobs.", ("kind",)).inc('say "hi"')
+    reg.histogram("job_seconds", "Job time.", buckets=(0.1, 1.0)).observe(0.5)
+    reg.stats_collector("worker", "worker").add("a", lambda: {"busy": 2, "name": "a", "wait": Histogram((1.0,)).snapshot()})
+    assert reg.stats_collector("worker", "worker") is reg.stats_collector("worker", "worker")
+    text = reg.render()
+    assert '# TYPE worker_busy gauge\nworker_busy{worker="a"} 2.0' in text and "worker_name" not in text
+    assert 'worker_wait_bucket{worker="a",le="1.0"} 0' in text
+    assert '# TYPE jobs_total counter\njobs_total{kind="say \\"hi\\""} 1' in text
+    assert 'job_seconds_bucket{le="0.1"} 0' in text and 'job_seconds_bucket{le="+Inf"} 1' in text
+    assert "job_seconds_count 1" in text
+
+
+@pytest.mark.asyncio
+async def test_requests_are_labelled_by_route_template(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Metrics", "slug": f"metrics-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    route = "/pages/workspace/{workspace_id}"
+    before = REQUESTS.value("GET", route, "200")
+    queries_before = REQUEST_QUERIES.labels(route).snapshot()["sum"]
+    await client.get(f"/pages/workspace/{ws_id}", headers=headers)
+    await client.get(f"/pages/workspace/{uuid.uuid4()}", headers=headers)
+    assert REQUESTS.value("GET", route, "200") == before + 1
+    assert REQUESTS.value("GET", route, "403") >= 1
+    assert REQUEST_QUERIES.labels(route).snapshot()["sum"] > queries_before
+
+    r = await client.get("/metrics")
+    assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain")
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/pages/workspace/{workspace_id}",le="+Inf"}' in r.text
+    assert "http_requests_in_flight 1" in r.text
+    assert 'db_queries_total{engine="primary"}' in r.text
+    assert "db_pool_checked_out" in r.text or "db_pool_wait_seconds" in r.text
+    assert LATENCY.labels("GET", route).count >= 2
+    assert 'cache_hits{cache="membership"}' in r.text and 'cache_hit_rate{cache="tokens"}' in r.text
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_are_exposed(client, internal_headers):
+    r = await client.get("/internal/caches", headers=internal_headers)
+    assert r.status_code == 200
+    assert set(r.json()) == {"pages", "membership", "tokens"} and "hit_rate" in r.json()["tokens"]
+
+
+@pytest.mark.asyncio
+async def test_failed_statements_do_not_leak_query_timings():
+    async with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(DBAPIError):
+                await conn.execute(text("select * from no_such_table"))
+            await conn.rollback()
+        assert not conn.sync_connection.info.get("query_start")
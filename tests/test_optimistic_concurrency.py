@@ -0,0 +1,66 @@
+import uuid
+import pytest
+from app.core.errors import ConflictError
+from app.infrastructure.db.uow import SqlAlchemyUoW
+from app.infrastructure.security.auth import decode_access_token
+from app.pages import schemas, services
+from test_auth_flow import register_and_login
+
+
+async def _page(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "OCC", "slug": f"occ-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    r = await client.post("/pages/", json={"workspace_id": ws_id, "title": "Doc", "content": {"a": 1}}, headers=headers)
+    return headers, ws_id, r.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_content_if_match_and_expected_version(client):
+    headers, _, page_id = await _page(client)
+    etag = (await client.get(f"/pages/{page_id}/content", headers=headers)).headers["ETag"]
+
+    r = await client.patch(f"/pages/{page_id}/content", json={"blocks": {"b": 2}}, headers={**headers, "If-Match": etag})
+    assert r.status_code == 200 and r.json()["version"] == 2
+    assert r.headers["ETag"] != etag
+
+    # A second tab still holding the old ETag is rejected instead of overwriting.
+    r = await client.patch(f"/pages/{page_id}/content", json={"content": {"lost": True}}, headers={**headers, "If-Match": etag})
+    assert r.status_code == 409 and r.json()["current_version"] == 2
+    r = await client.patch(f"/pages/{page_id}/content", json={"blocks": {"c": 3}, "expected_version": 1}, headers=headers)
+    assert r.status_code == 409 and r.json()["current_version"] == 2
+
+    r = await client.patch(f"/pages/{page_id}/content", json={"content": {"ok": True}, "expected_version": 2}, headers=headers)
+    assert r.status_code == 200 and r.json()["version"] == 3
+    assert (await client.get(f"/pages/{page_id}/content", headers=headers)).json()["content"] == {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_page_update_conflicts(client):
+    headers, ws_id, page_id = await _page(client)
+    r = await client.get(f"/pages/{page_id}", headers=headers)
+    etag, version = r.headers["ETag"], r.json()["version"]
+
+    body = {"workspace_id": ws_id, "title": "Renamed"}
+    r = await client.put(f"/pages/{page_id}", json=body, headers={**headers, "If-Match": etag})
+    assert r.status_code == 200 and r.json()["version"] == version + 1
+    r = await client.put(f"/pages/{page_id}", json={**body, "expected_version": version}, headers=headers)
+    assert r.status_code == 409 and r.json()["current_version"] == version + 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writer_loses_at_flush(client):
+    headers, ws_id, page_id = await _page(client)
+    user_id = uuid.UUID(decode_access_token(headers["Authorization"].split()[1]))
+    async with SqlAlchemyUoW() as slow:
+        pid = uuid.UUID(page_id)
+        page = await slow.pages.get(pid)
+        async with SqlAlchemyUoW() as fast:
+            dto = schemas.PageUpdateIn(workspace_id=ws_id, title="Fast")
+            await services.update_page(fast, pid, user_id, dto)
+        page.title = "Slow"
+        with pytest.raises(ConflictError) as exc:
+            async with services.versioned_write(slow, lambda: slow.pages.get_version(pid)):
+                await slow.commit()
+        assert exc.value.current_version == 2
@@ -0,0 +1,85 @@
+import uuid
+import pytest
+from app.infrastructure.cache.backends import CacheBackend
+from app.infrastructure.db.uow import SqlAlchemyUoW
+from app.pages.cache import PageCache, page_cache
+from test_auth_flow import register_and_login
+
+
+class DictBackend:
+    """Stand-in for a shared (multi-worker) backend."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl=None):
+        assert isinstance(value, bytes)
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def stats(self):
+        return {"size": len(self.data)}
+
+
+@pytest.mark.asyncio
+async def test_generation_invalidation_with_pluggable_backend():
+    backend = DictBackend()
+    assert isinstance(backend, CacheBackend)
+    cache = PageCache(backend)
+    ws, page = uuid.uuid4(), uuid.uuid4()
+    list_key = await cache.listing_key(ws, "q")
+    row_key = await cache.row_key(page)
+    await cache.set(list_key, ["etag", [], None])
+    await cache.set(row_key, {"id": str(page)})
+    assert await cache.get(list_key) == ["etag", [], None]
+
+    await cache.invalidate(ws)  # listing only
+    assert await cache.listing_key(ws, "q") != list_key
+    assert await cache.row_key(page) == row_key
+    await cache.invalidate(ws, page)
+    assert await cache.row_key(page) != row_key
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_page_reads_are_cached_and_invalidated_by_writes(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Cache", "slug": f"cache-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    r = await client.post("/pages/", json={"workspace_id": ws_id, "title": "Before"}, headers=headers)
+    page_id = r.json()["id"]
+
+    hits = page_cache.hits
+    await client.get(f"/pages/{page_id}", headers=headers)
+    r = await client.get(f"/pages/{page_id}", headers=headers)
+    assert page_cache.hits == hits + 1 and r.json()["title"] == "Before"
+    await client.get(f"/pages/workspace/{ws_id}", headers=headers)
+
+    await client.put(f"/pages/{page_id}", json={"workspace_id": ws_id, "title": "After"}, headers=headers)
+    assert (await client.get(f"/pages/{page_id}", headers=headers)).json()["title"] == "After"
+    assert [p["title"] for p in (await client.get(f"/pages/workspace/{ws_id}", headers=headers)).json()] == ["After"]
+
+
+@pytest.mark.asyncio
+async def test_replica_reads_do_not_fill_the_cache(client, monkeypatch):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Lag", "slug": f"lag-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    r = await client.post("/pages/", json={"workspace_id": ws_id, "title": "Row"}, headers=headers)
+    page_id = r.json()["id"]
+
+    # A lagging replica could return the row as it was before the last invalidation.
+    monkeypatch.setattr(SqlAlchemyUoW, "on_replica", property(lambda uow: uow.read_only))
+    hits = page_cache.hits
+    for _ in range(2):
+        assert (await client.get(f"/pages/{page_id}", headers=headers)).status_code == 200
+        assert (await client.get(f"/pages/workspace/{ws_id}", headers=headers)).status_code == 200
+    assert page_cache.hits == hits
@@ -0,0 +1,29 @@
+import io
+import json
+import uuid
+import zipfile
+import pytest
+from test_auth_flow import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_and_zip(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Export", "slug": f"export-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    pages = [{"temp_id": str(i), "title": f"P{i}", "content": {"b": {"id": "b", "n": i}}} for i in range(7)]
+    r = await client.post(f"/pages/workspace/{ws_id}/import", json={"pages": pages}, headers=headers)
+    ids = r.json()["id_map"]
+
+    r = await client.get(f"/pages/workspace/{ws_id}/export", headers=headers)
+    assert r.status_code == 200 and r.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in r.text.splitlines()]
+    assert {rec["id"] for rec in records} == set(ids.values())
+    assert all(rec["content"]["b"]["id"] == "b" for rec in records)
+
+    r = await client.get(f"/pages/workspace/{ws_id}/export", params={"format": "zip"}, headers=headers)
+    assert r.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(r.content))
+    assert json.loads(archive.read("manifest.json"))["pages"] == 7
+    assert json.loads(archive.read(f"pages/{ids['3']}.json"))["content"]["b"]["n"] == 3
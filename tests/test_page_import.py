@@ -0,0 +1,54 @@
+import json
+import uuid
+import pytest
+from test_auth_flow import register_and_login
+
+
+async def _workspace(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Import", "slug": f"import-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    return headers, r.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_json_and_ndjson(client):
+    headers, ws_id = await _workspace(client)
+    # children listed before their parent on purpose
+    pages = [
+        {"temp_id": "c", "parent_temp_id": "b", "title": "C", "content": {"b1": {"id": "b1"}}},
+        {"temp_id": "b", "parent_temp_id": "a", "title": "B"},
+        {"temp_id": "a", "title": "A"},
+    ]
+    r = await client.post(f"/pages/workspace/{ws_id}/import", json={"pages": pages}, headers=headers)
+    assert r.status_code == 200, r.text
+    result = r.json()
+    assert result["created"] == 3 and result["pages_per_second"] > 0
+    ids = result["id_map"]
+    r = await client.get(f"/pages/{ids['c']}/ancestors", headers=headers)
+    assert [p["id"] for p in r.json()] == [ids["a"], ids["b"]]
+    r = await client.get(f"/pages/{ids['c']}/content", headers=headers)
+    assert r.json()["content"] == {"b1": {"id": "b1"}}
+
+    body = "\n".join(json.dumps(p) for p in [
+        {"temp_id": "x", "parent_page_id": ids["a"], "title": "X"},
+        {"temp_id": "y", "parent_temp_id": "x", "title": "Y"},
+    ])
+    r = await client.post(f"/pages/workspace/{ws_id}/import", content=body, headers={**headers, "Content-Type": "application/x-ndjson"})
+    assert r.status_code == 200, r.text
+    assert r.json()["created"] == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_rejects_cycles_and_bad_lines(client):
+    headers, ws_id = await _workspace(client)
+    cyclic = [{"temp_id": "a", "parent_temp_id": "b", "title": "A"}, {"temp_id": "b", "parent_temp_id": "a", "title": "B"}]
+    r = await client.post(f"/pages/workspace/{ws_id}/import", json={"pages": cyclic}, headers=headers)
+    assert r.status_code == 422 and "cycle" in r.json()["message"]
+    r = await client.post(f"/pages/workspace/{ws_id}/import", content='{"temp_id": "a", "title": "A"}\n{"temp_id": "b"}\n', headers={**headers, "Content-Type": "application/x-ndjson"})
+    assert r.status_code == 422 and "line 2" in r.json()["message"]
+
+    # Outsiders are turned away before the body is parsed.
+    outsider = {"Authorization": f"Bearer {await register_and_login(client)}"}
+    r = await client.post(f"/pages/workspace/{ws_id}/import", content="not json", headers={**outsider, "Content-Type": "application/x-ndjson"})
+    assert r.status_code == 403
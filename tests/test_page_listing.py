@@ -0,0 +1,34 @@
+import uuid
+import pytest
+from test_auth_flow import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_list_pages_cursor_filters_and_fields(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "List", "slug": f"list-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    ids = set()
+    for i in range(5):
+        r = await client.post("/pages/", json={"workspace_id": ws_id, "title": f"P{i}", "type": "folder" if i == 0 else "page"}, headers=headers)
+        ids.add(r.json()["id"])
+
+    seen, cursor = [], None
+    for _ in range(5):
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        r = await client.get(f"/pages/workspace/{ws_id}", params=params, headers={**headers, "Origin": "http://localhost:3000"})
+        assert r.status_code == 200, r.text
+        # Cross-origin clients must be able to read the paging and caching headers.
+        assert {"etag", "x-next-cursor"} <= set(r.headers["access-control-expose-headers"].lower().split(", "))
+        seen += [p["id"] for p in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == 5 and set(seen) == ids
+
+    r = await client.get(f"/pages/workspace/{ws_id}", params={"type": "folder", "fields": "title"}, headers=headers)
+    assert r.json() == [{"id": r.json()[0]["id"], "title": "P0"}]
+
+    r = await client.get(f"/pages/workspace/{ws_id}", params={"fields": "content"}, headers=headers)
+    assert r.status_code == 422
@@ -0,0 +1,87 @@
+import random
+import uuid
+from datetime import datetime
+import pytest
+from sqlalchemy import select, update
+from app.infrastructure.db.models import Page
+from app.infrastructure.db.uow import SqlAlchemyUoW
+from app.pages import ordering
+from app.pages.jobs import rebalance_positions
+
+
+def test_key_between_orders_and_stays_short():
+    keys = []
+    for _ in range(2000):
+        i = random.randrange(len(keys) + 1)
+        a, b = (keys[i - 1] if i else None), (keys[i] if i < len(keys) else None)
+        key = ordering.key_between(a, b)
+        assert (a is None or a < key) and (b is None or key < b) and not key.endswith("0")
+        keys.insert(i, key)
+    bulk = ordering.keys_between(None, None, 10_000)
+    assert bulk == sorted(set(bulk)) and max(map(len, bulk)) <= 3
+    with pytest.raises(ValueError):
+        ordering.key_between("b", "a")
+    with pytest.raises(ValueError):
+        ordering.key_between("a0", None)
+
+
+async def _children(client, headers, ws_id, parent):
+    r = await client.get(f"/pages/workspace/{ws_id}/children", params={"parent_page_id": parent}, headers=headers)
+    return [p["title"] for p in r.json()]
+
+
+async def _backdate(parent_id):
+    async with SqlAlchemyUoW() as uow:
+        stmt = update(Page.__table__).where(Page.parent_page_id == uuid.UUID(parent_id)).values(updated_at=datetime(2020, 1, 1))
+        await uow.session.execute(stmt)
+    return await _updated_at(parent_id)
+
+
+async def _updated_at(parent_id):
+    async with SqlAlchemyUoW(read_only=True) as uow:
+        res = await uow.session.execute(select(Page.id, Page.updated_at).where(Page.parent_page_id == uuid.UUID(parent_id)))
+        return dict(res.all())
+
+
+@pytest.mark.asyncio
+async def test_move_writes_one_row_and_rebalance_keeps_order(client, workspace, create_page):
+    headers, ws_id = workspace
+    root = await create_page(headers, ws_id, "Root")
+    ids = {t: await create_page(headers, ws_id, t, root) for t in ("c", "a", "b")}
+    assert await _children(client, headers, ws_id, root) == ["c", "a", "b"]
+
+    r = await client.post(f"/pages/{ids['c']}/move", json={"parent_page_id": root, "after_id": ids["b"]}, headers=headers)
+    assert r.status_code == 200, r.text
+    assert r.json()["version"] == 2 and r.headers["ETag"]
+    assert await _children(client, headers, ws_id, root) == ["a", "b", "c"]
+    assert [(await client.get(f"/pages/{ids[t]}", headers=headers)).json()["version"] for t in "ab"] == [1, 1]
+
+    # Repeatedly squeeze "c" in front of "b" to grow its key.
+    for _ in range(30):
+        before = "b" if _ % 2 == 0 else "c"
+        mover = "c" if before == "b" else "b"
+        r = await client.post(f"/pages/{ids[mover]}/move", json={"parent_page_id": root, "after_id": ids["a"], "before_id": ids[before]}, headers=headers)
+        assert r.status_code == 200, r.text
+    order = await _children(client, headers, ws_id, root)
+    r = await client.get(f"/pages/workspace/{ws_id}/children", params={"parent_page_id": root}, headers=headers)
+    assert max(len(p["position"]) for p in r.json()) > 3
+    stamps = await _backdate(root)
+    assert await rebalance_positions(max_length=3) >= 1
+    r = await client.get(f"/pages/workspace/{ws_id}/children", params={"parent_page_id": root}, headers=headers)
+    assert [p["title"] for p in r.json()] == order and max(len(p["position"]) for p in r.json()) <= 3
+    # Respacing is not an edit.
+    assert await _updated_at(root) == stamps
+
+    # Reparent (appended), tree order, and the guards.
+    r = await client.post(f"/pages/{ids['a']}/move", json={"parent_page_id": ids["b"]}, headers=headers)
+    assert r.status_code == 200
+    r = await client.get(f"/pages/{root}/tree", params={"depth": 2}, headers=headers)
+    tree = r.json()
+    assert [c["title"] for c in tree["children"]] == [t for t in order if t != "a"]
+    assert [c["title"] for c in next(c for c in tree["children"] if c["title"] == "b")["children"]] == ["a"]
+    r = await client.post(f"/pages/{root}/move", json={"parent_page_id": ids["a"]}, headers=headers)
+    assert r.status_code == 422
+    r = await client.post(f"/pages/{ids['c']}/move", json={"parent_page_id": root, "after_id": ids["a"]}, headers=headers)
+    assert r.status_code == 422
+    r = await client.post(f"/pages/{ids['c']}/move", json={"parent_page_id": None, "expected_version": 1}, headers=headers)
+    assert r.status_code == 409
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+import pytest
+from passlib.context import CryptContext
+from app.core.errors import ServiceUnavailableError
+from app.infrastructure.security import auth
+from app.infrastructure.security.hashing_pool import PasswordHashPool
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_when_saturated_and_records_wait():
+    pool = PasswordHashPool(workers=1, max_queue=1)
+    release = threading.Event()
+    blocked = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+    await asyncio.sleep(0.05)
+    with pytest.raises(ServiceUnavailableError):
+        await pool.run(lambda: None)
+    release.set()
+    await asyncio.gather(*blocked)
+    stats = pool.stats()
+    assert stats["rejected"] == 1 and stats["completed"] == 2 and stats["in_flight"] == 0
+    assert stats["queue_wait_max_seconds"] > 0
+    assert stats["queue_wait_seconds"]["count"] == stats["latency_seconds"]["count"] == 2
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_are_exposed(client, internal_headers):
+    r = await client.get("/internal/password-pool", headers=internal_headers)
+    assert r.status_code == 200 and "queue_wait_seconds" in r.json()
+    r = await client.get("/metrics")
+    assert 'password_hash_pool_in_flight{pool="password"}' in r.text
+    assert 'password_hash_pool_queue_wait_seconds_bucket{pool="password",le="+Inf"}' in r.text
+
+
+@pytest.mark.asyncio
+async def test_outdated_cost_is_rehashed_on_verify():
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=4).hash("Secret123!")
+    valid, new_hash = await auth.verify_and_update_password("Secret123!", old_hash)
+    assert valid and new_hash is not None
+    assert auth.pwd_context.verify("Secret123!", new_hash)
+    valid, again = await auth.verify_and_update_password("Secret123!", new_hash)
+    assert valid and again is None
+    assert (await auth.verify_and_update_password("wrong", new_hash)) == (False, None)
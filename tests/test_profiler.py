@@ -0,0 +1,62 @@
+import uuid
+import pytest
+from app.core.config import settings
+from app.core.profiler import assert_max_queries, capture_queries, statement_shape
+from app.infrastructure.db.uow import SqlAlchemyUoW
+from test_auth_flow import register_and_login
+
+
+async def _workspace_with_pages(client, n: int = 3):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Prof", "slug": f"prof-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    ids = [(await client.post("/pages/", json={"workspace_id": ws_id, "title": f"P{i}"}, headers=headers)).json()["id"] for i in range(n)]
+    return headers, ws_id, ids
+
+
+def test_statement_shape_collapses_in_lists():
+    assert statement_shape("SELECT a\n  FROM t WHERE id IN (?, ?, ?)") == statement_shape("SELECT a FROM t WHERE id IN (?)")
+
+
+@pytest.mark.asyncio
+async def test_repeated_shapes_are_flagged_with_call_site(client):
+    _, _, ids = await _workspace_with_pages(client, 6)
+    with capture_queries() as profile:
+        async with SqlAlchemyUoW(read_only=True) as uow:
+            for page_id in ids:
+                await uow.pages.get(uuid.UUID(page_id))
+    [flagged] = profile.repeated(threshold=5)
+    assert flagged["count"] == 6
+    assert any(site.startswith("app/pages/repository.py") for site in flagged["call_sites"])
+
+
+@pytest.mark.asyncio
+async def test_header_opt_in_reports_and_debug_endpoint(client, monkeypatch, internal_headers):
+    headers, ws_id, ids = await _workspace_with_pages(client)
+    r = await client.get(f"/pages/{ids[0]}", headers={**headers, "X-Profile": "1"})
+    assert "X-Query-Count" not in r.headers
+
+    monkeypatch.setattr(settings, "PROFILER_HEADER_ENABLED", True)
+    r = await client.get(f"/pages/workspace/{ws_id}", headers={**headers, "X-Profile": "cpu"})
+    assert int(r.headers["X-Query-Count"]) >= 1 and r.headers["X-N-Plus-One"] == "0"
+    report = (await client.get(f"/internal/profiles/{r.headers['X-Profile-Id']}", headers=internal_headers)).json()
+    assert report["path"] == f"/pages/workspace/{ws_id}"
+    assert report["query_count"] == len(report["queries"])
+    assert any("app/pages/" in q["call_site"] for q in report["queries"])
+    assert isinstance(report["cpu"], list) and report["cpu"]
+
+
+@pytest.mark.asyncio
+async def test_endpoint_query_budgets(client):
+    headers, ws_id, ids = await _workspace_with_pages(client)
+    # Membership is cached after the first request, so each read is a single statement.
+    with assert_max_queries(1):
+        await client.get(f"/pages/workspace/{ws_id}/children", headers=headers)
+    with assert_max_queries(1):
+        await client.get(f"/pages/{ids[0]}/content", headers=headers)
+    with assert_max_queries(1):
+        await client.get("/workspaces/", headers=headers)
+    await client.get(f"/pages/{ids[1]}", headers=headers)
+    with assert_max_queries(0):  # row and membership both cached
+        await client.get(f"/pages/{ids[1]}", headers=headers)
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import uuid
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+from app.infrastructure.pubsub.backends import MemoryPubSubBackend
+from app.infrastructure.pubsub.broker import Broker
+from app.main import app
+from app.realtime.events import broker, page_channel, workspace_channel
+from test_auth_flow import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_fans_out_across_brokers():
+    bus = MemoryPubSubBackend()
+    worker_a, worker_b = Broker(bus), Broker(bus)
+    async with worker_b.subscribe("ws:1") as sub:
+        await worker_a.publish("ws:1", "hello")
+        await worker_a.publish("ws:2", "other")
+        assert await asyncio.wait_for(sub.__anext__(), 1) == "hello"
+        assert sub.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_dropped():
+    local = Broker(MemoryPubSubBackend(), queue_size=2)
+    async with local.subscribe("c") as slow, local.subscribe("c") as fast:
+        for i in range(2):
+            await local.publish("c", str(i))
+            assert await fast.__anext__() == str(i)
+        await local.publish("c", "2")
+        assert slow.dropped and not fast.dropped
+        assert [m async for m in slow] == []
+        assert await fast.__anext__() == "2"
+    assert local.stats()["dropped_subscribers"] == 1 and local.stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+async def test_page_writes_publish_events(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Live", "slug": f"live-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    async with broker.subscribe(workspace_channel(ws_id)) as ws_sub:
+        r = await client.post("/pages/", json={"workspace_id": ws_id, "title": "Live doc"}, headers=headers)
+        page_id = r.json()["id"]
+        async with broker.subscribe(page_channel(page_id)) as page_sub:
+            await client.patch(f"/pages/{page_id}/content", json={"blocks": {"b": {"t": "hi"}}}, headers=headers)
+            await client.delete(f"/pages/{page_id}", headers=headers)
+            page_events = [json.loads(await page_sub.__anext__()) for _ in range(2)]
+        ws_events = [json.loads(await ws_sub.__anext__()) for _ in range(2)]
+    assert [e["event"] for e in ws_events] == ["page.created", "page.archived"]
+    assert ws_events[0]["title"] == "Live doc" and ws_events[0]["page_id"] == page_id
+    assert page_events[0]["event"] == "content.delta" and page_events[0]["blocks"] == {"b": {"t": "hi"}}
+    assert page_events[1]["event"] == "page.archived"
+
+
+def test_websocket_requires_membership_and_streams_events():
+    c = TestClient(app)
+    email = f"ws_{uuid.uuid4().hex[:8]}@example.com"
+    c.post("/users/register", json={"email": email, "password": "Secret123!", "full_name": "WS"})
+    token = c.post("/users/login", data={"username": email, "password": "Secret123!"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    ws_id = c.post("/workspaces/", json={"name": "WS", "slug": f"ws-{uuid.uuid4().hex[:6]}"}, headers=headers).json()["id"]
+
+    with pytest.raises(WebSocketDisconnect):
+        with c.websocket_connect(f"/ws/workspaces/{ws_id}?token=invalid") as ws:
+            ws.receive_text()
+    with c.websocket_connect(f"/ws/workspaces/{ws_id}?token={token}") as ws:
+        page_id = c.post("/pages/", json={"workspace_id": ws_id, "title": "Pushed"}, headers=headers).json()["id"]
+        event = ws.receive_json()
+    assert event["event"] == "page.created" and event["page_id"] == page_id
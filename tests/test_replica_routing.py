@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.infrastructure.db.routing import ReplicaRouter
+from app.infrastructure.db.uow import SqlAlchemyUoW
+
+pytest.importorskip("aiosqlite")
+
+
+async def _sqlite(path, label):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.execute(text("create table node (name text)"))
+        await conn.execute(text("insert into node values (:n)"), {"n": label})
+    return engine
+
+
+async def _read(router, client_key=None):
+    async with SqlAlchemyUoW(read_only=True, router=router, client_key=client_key) as uow:
+        return (await uow.session.execute(text("select name from node order by rowid limit 1"))).scalar_one()
+
+
+@pytest.mark.asyncio
+async def test_reads_round_robin_replicas_with_sticky_writers_and_ejection(tmp_path):
+    primary = await _sqlite(tmp_path / "primary.db", "primary")
+    replica_a = await _sqlite(tmp_path / "a.db", "a")
+    replica_b = await _sqlite(tmp_path / "b.db", "b")
+    now = [0.0]
+    router = ReplicaRouter(
+        async_sessionmaker(primary, class_=AsyncSession), [replica_a, replica_b],
+        eject_seconds=10, sticky_seconds=5, clock=lambda: now[0],
+    )
+    assert {await _read(router), await _read(router)} == {"a", "b"}
+
+    async with SqlAlchemyUoW(router=router, client_key="writer") as uow:
+        await uow.session.execute(text("insert into node values ('primary-2')"))
+    assert await _read(router, "writer") == "primary"
+    now[0] = 6
+    assert await _read(router, "writer") in {"a", "b"}
+
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'x.db'}")
+    router = ReplicaRouter(async_sessionmaker(primary, class_=AsyncSession), [broken], eject_seconds=10, clock=lambda: now[0])
+    with pytest.raises(exc.OperationalError):
+        await _read(router)
+    assert router.stats()["replicas"][0]["healthy"] is False
+    assert await _read(router) == "primary"
+    now[0] += 11
+    assert router.stats()["replicas"][0]["healthy"] is True
+
+    for engine in (primary, replica_a, replica_b, broken):
+        await engine.dispose()
@@ -0,0 +1,72 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import update
+from app.infrastructure.db.models import PageRevision
+from app.infrastructure.db.uow import SqlAlchemyUoW
+from app.pages.revisions import compact_revisions, diff_documents, revision_recorder
+from test_auth_flow import register_and_login
+
+
+def test_diff_falls_back_to_snapshot_when_not_smaller():
+    old = {f"b{i}": {"text": "x" * 20} for i in range(10)}
+    assert diff_documents(old, {**old, "b0": {"text": "y"}}) == {"blocks": {"b0": {"text": "y"}}, "deleted_blocks": []}
+    assert diff_documents(old, {"new": 1}) is None
+    assert diff_documents(old, ["not", "blocks"]) is None
+
+
+async def _page_with_history(client, saves: int):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = await client.post("/workspaces/", json={"name": "Hist", "slug": f"hist-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    ws_id = r.json()["id"]
+    base = {f"b{i}": {"text": "lorem ipsum " * 4} for i in range(8)}
+    r = await client.post("/pages/", json={"workspace_id": ws_id, "title": "History", "content": base}, headers=headers)
+    page_id = r.json()["id"]
+    await revision_recorder.drain()
+    for i in range(saves):
+        await client.patch(f"/pages/{page_id}/content", json={"blocks": {"b0": {"text": f"edit {i}"}}}, headers=headers)
+        await revision_recorder.drain()
+    return headers, page_id
+
+
+@pytest.mark.asyncio
+async def test_snapshots_bound_the_delta_chain_and_restore(client, monkeypatch):
+    monkeypatch.setattr(revision_recorder, "snapshot_interval", 4)
+    headers, page_id = await _page_with_history(client, 9)
+
+    r = await client.get(f"/pages/{page_id}/revisions", params={"limit": 6}, headers=headers)
+    assert r.headers.get("X-Next-Cursor")
+    rest = await client.get(f"/pages/{page_id}/revisions", params={"cursor": r.headers["X-Next-Cursor"]}, headers=headers)
+    revisions = r.json() + rest.json()
+    assert [rev["version"] for rev in revisions] == list(range(10, 0, -1))
+    kinds = {rev["version"]: rev["kind"] for rev in revisions}
+    assert [v for v, k in sorted(kinds.items()) if k == "snapshot"] == [1, 5, 9]
+
+    r = await client.get(f"/pages/{page_id}/revisions/7", headers=headers)
+    assert r.json()["content"]["b0"] == {"text": "edit 5"} and r.json()["content"]["b7"]["text"].startswith("lorem")
+    assert (await client.get(f"/pages/{page_id}/revisions/99", headers=headers)).status_code == 404
+
+    r = await client.post(f"/pages/{page_id}/revisions/3/restore", headers=headers)
+    assert r.status_code == 200 and r.json()["version"] == 11
+    r = await client.get(f"/pages/{page_id}/content", headers=headers)
+    assert r.json()["content"]["b0"] == {"text": "edit 1"}
+
+
+@pytest.mark.asyncio
+async def test_compaction_keeps_a_rebuildable_window(client, monkeypatch):
+    monkeypatch.setattr(revision_recorder, "snapshot_interval", 4)
+    headers, page_id = await _page_with_history(client, 5)
+    old = datetime.now(timezone.utc) - timedelta(days=120)
+    async with SqlAlchemyUoW() as uow:
+        await uow.session.execute(
+            update(PageRevision).where(PageRevision.page_id == uuid.UUID(page_id), PageRevision.version <= 3).values(created_at=old)
+        )
+
+    assert await compact_revisions(retention_days=90) >= 3
+    r = await client.get(f"/pages/{page_id}/revisions", headers=headers)
+    revisions = sorted(r.json(), key=lambda rev: rev["version"])
+    assert [rev["version"] for rev in revisions] == [4, 5, 6]
+    assert revisions[0]["kind"] == "snapshot"
+    r = await client.get(f"/pages/{page_id}/revisions/6", headers=headers)
+    assert r.json()["content"]["b0"] == {"text": "edit 4"}
@@ -0,0 +1,22 @@
+import uuid
+from datetime import timedelta
+from app.infrastructure.security import auth
+
+
+def test_verified_tokens_are_cached_by_digest():
+    auth._token_cache.clear()
+    sub = str(uuid.uuid4())
+    token = auth.create_access_token(sub)
+    assert auth.decode_access_token(token) == sub
+    assert auth.decode_access_token(token) == sub
+    stats = auth.token_cache_stats()
+    assert stats["hits"] >= 1 and stats["size"] == 1
+    assert token.encode() not in {k for k in auth._token_cache._data}
+
+
+def test_expired_and_invalid_tokens_are_rejected_and_not_cached():
+    auth._token_cache.clear()
+    expired = auth.create_access_token(str(uuid.uuid4()), expires_delta=timedelta(seconds=-1))
+    assert auth.decode_access_token(expired) is None
+    assert auth.decode_access_token("not-a-jwt") is None
+    assert len(auth._token_cache) == 0
@@ -0,0 +1,83 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import func, select, update
+from app.infrastructure.db.models import Page, PageContent
+from app.infrastructure.db.uow import SqlAlchemyUoW
+from app.pages.jobs import purge_trash
+
+
+async def _backdate(page_ids, days):
+    # Archive times are compared for equality, so separate archives must not share a timestamp.
+    async with SqlAlchemyUoW() as uow:
+        when = datetime.now(timezone.utc) - timedelta(days=days)
+        await uow.session.execute(update(Page).where(Page.id.in_([uuid.UUID(p) for p in page_ids])).values(archived_at=when))
+
+
+async def _children(client, headers, ws_id, parent=None):
+    params = {"parent_page_id": parent} if parent else {}
+    r = await client.get(f"/pages/workspace/{ws_id}/children", params=params, headers=headers)
+    return [p["title"] for p in r.json()]
+
+
+@pytest.mark.asyncio
+async def test_archive_restore_subtree_and_purge(client, workspace, create_page):
+    headers, ws_id = workspace
+    root = await create_page(headers, ws_id, "Root", content={"t": "Root"})
+    a = await create_page(headers, ws_id, "A", root, content={"t": "A"})
+    a1 = await create_page(headers, ws_id, "A1", a, content={"t": "A1"})
+    b = await create_page(headers, ws_id, "B", root, content={"t": "B"})
+
+    r = await client.delete(f"/pages/{b}", headers=headers)
+    assert r.json() == {"status": "archived", "archived": 1}
+    await _backdate([b], 1)
+    r = await client.delete(f"/pages/{root}", headers=headers)
+    assert r.json() == {"status": "archived", "archived": 3}
+    assert await _children(client, headers, ws_id) == []
+    assert (await client.get(f"/pages/{a1}", headers=headers)).status_code == 404
+
+    r = await client.get(f"/pages/workspace/{ws_id}/trash", headers=headers)
+    assert [p["id"] for p in r.json()] == [root, b]
+
+    # A page archived with its parent comes back at the top level while the parent stays in the trash.
+    r = await client.post(f"/pages/{a}/restore", headers=headers)
+    assert r.json() == {"status": "restored", "restored": 2}
+    assert await _children(client, headers, ws_id) == ["A"]
+    assert await _children(client, headers, ws_id, a) == ["A1"]
+    r = await client.get(f"/pages/{a1}", headers=headers)
+    assert r.status_code == 200 and r.json()["version"] == 3
+
+    # Restoring Root does not bring back B, which was archived separately.
+    r = await client.post(f"/pages/{root}/restore", headers=headers)
+    assert r.json()["restored"] == 1
+    r = await client.get(f"/pages/workspace/{ws_id}/trash", headers=headers)
+    assert [p["id"] for p in r.json()] == [b]
+
+    r = await client.delete(f"/pages/{root}", headers=headers)
+    assert r.json()["archived"] == 1
+    await _backdate([root, b], 60)
+    assert await purge_trash(batch_size=1) >= 2
+    assert (await client.get(f"/pages/workspace/{ws_id}/trash", headers=headers)).json() == []
+    assert await _children(client, headers, ws_id) == ["A"]
+    async with SqlAlchemyUoW(read_only=True) as uow:
+        ids = [uuid.UUID(p) for p in (root, b)]
+        assert await uow.session.scalar(select(func.count()).select_from(Page).where(Page.id.in_(ids))) == 0
+        assert await uow.session.scalar(select(func.count()).select_from(PageContent).where(PageContent.page_id.in_(ids))) == 0
+
+
+@pytest.mark.asyncio
+async def test_purge_goes_leaf_first(client, workspace, create_page):
+    headers, ws_id = workspace
+    root = await create_page(headers, ws_id, "Root", content={"t": "Root"})
+    mid = await create_page(headers, ws_id, "Mid", root, content={"t": "Mid"})
+    leaf = await create_page(headers, ws_id, "Leaf", mid, content={"t": "Leaf"})
+    await client.delete(f"/pages/{root}", headers=headers)
+    await _backdate([root, mid, leaf], 60)
+
+    # One batch never deletes a parent before its children, so nothing surfaces as a trash root.
+    async with SqlAlchemyUoW() as uow:
+        assert await uow.pages.purge_archived(datetime.now(timezone.utc) - timedelta(days=30), 10) == 1
+    r = await client.get(f"/pages/workspace/{ws_id}/trash", headers=headers)
+    assert [p["id"] for p in r.json()] == [root]
+    assert await purge_trash(batch_size=10) >= 2
+    assert (await client.get(f"/pages/workspace/{ws_id}/trash", headers=headers)).json() == []
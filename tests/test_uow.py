@@ -0,0 +1,40 @@
+import pytest
+from app.infrastructure.db.uow import SqlAlchemyUoW
+
+
+class FakeSession:
+    def __init__(self, log):
+        self.log = log
+
+    async def commit(self):
+        self.log.append("commit")
+
+    async def rollback(self):
+        self.log.append("rollback")
+
+    async def close(self):
+        self.log.append("close")
+
+
+@pytest.mark.asyncio
+async def test_unused_uow_never_opens_a_session():
+    created = []
+    async with SqlAlchemyUoW(session_factory=lambda: created.append(1)) as uow:
+        pass
+    assert created == [] and uow._session is None
+
+
+@pytest.mark.asyncio
+async def test_read_only_uow_skips_commit_and_builds_repositories_lazily():
+    log = []
+    async with SqlAlchemyUoW(session_factory=lambda: FakeSession(log), read_only=True) as uow:
+        assert "pages" not in vars(uow)
+        assert uow.pages is uow.pages
+        with pytest.raises(RuntimeError):
+            await uow.commit()
+    assert log == ["rollback", "close"]
+
+    log.clear()
+    async with SqlAlchemyUoW(session_factory=lambda: FakeSession(log)) as uow:
+        uow.session
+    assert log == ["commit", "close"]
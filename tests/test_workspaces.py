@@ -0,0 +1,31 @@
+import uuid
+import pytest
+from test_auth_flow import register_and_login
+
+
+@pytest.mark.asyncio
+async def test_list_workspaces_returns_role_and_paginates(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(3):
+        r = await client.post("/workspaces/", json={"name": f"WS {i}", "slug": f"ws-{i}-{uuid.uuid4().hex[:6]}"}, headers=headers)
+        assert r.status_code == 200, r.text
+    r = await client.get("/workspaces/", params={"limit": 2}, headers=headers)
+    assert r.status_code == 200, r.text
+    first = r.json()
+    assert [w["name"] for w in first] == ["WS 0", "WS 1"]
+    assert all(w["role"] == "owner" for w in first)
+    cursor = r.headers["X-Next-Cursor"]
+    r2 = await client.get("/workspaces/", params={"limit": 2, "cursor": cursor}, headers=headers)
+    assert [w["name"] for w in r2.json()] == ["WS 2"]
+    assert "X-Next-Cursor" not in r2.headers
+
+
+@pytest.mark.asyncio
+async def test_list_workspaces_conditional_get(client):
+    token = await register_and_login(client)
+    headers = {"Authorization": f"Bearer {token}"}
+    await client.post("/workspaces/", json={"name": "Cond", "slug": f"cond-{uuid.uuid4().hex[:6]}"}, headers=headers)
+    r = await client.get("/workspaces/", headers=headers)
+    r2 = await client.get("/workspaces/", headers={**headers, "If-None-Match": r.headers["ETag"]})
+    assert r2.status_code == 304